@@ -0,0 +1,101 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from app.core import logger
+from app.core.enums import CircuitStateEnum
+from app.core.exceptions.exceptions import CircuitBreakerOpenException
+from app.core.metrics import (
+    CIRCUIT_BREAKER_STATE,
+    CIRCUIT_BREAKER_STATE_GAUGE,
+    CIRCUIT_CALL_DURATION,
+)
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for calls to an external service.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls fail fast
+    with `CircuitBreakerOpenException`. Once `recovery_timeout` seconds have passed a single
+    trial call is let through (HALF_OPEN): success closes the circuit, failure reopens it.
+    Cancelling a call (`asyncio.CancelledError`) is not a failure of the service: it is
+    re-raised without being counted, and a cancelled trial call leaves the circuit OPEN
+    so that the next call becomes the trial.
+    State and call durations are exported through the `CIRCUIT_*` Prometheus metrics.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 60.0,
+    ):
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitStateEnum.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = asyncio.Lock()
+        CIRCUIT_BREAKER_STATE_GAUGE.labels(service=service).set(self.state.value)
+
+    def _transition(self, state: CircuitStateEnum) -> None:
+        if state == self.state:
+            return
+        logger.warning(f"Circuit breaker {self.service}: {self.state.name} -> {state.name}")
+        self.state = state
+        CIRCUIT_BREAKER_STATE_GAUGE.labels(service=self.service).set(state.value)
+        CIRCUIT_BREAKER_STATE.labels(service=self.service, state=state.name).inc()
+
+    async def _before_call(self) -> None:
+        async with self._lock:
+            if self.state == CircuitStateEnum.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    raise CircuitBreakerOpenException(self.service)
+                self._transition(CircuitStateEnum.HALF_OPEN)
+            elif self.state == CircuitStateEnum.HALF_OPEN:
+                # пробный вызов уже выполняется
+                raise CircuitBreakerOpenException(self.service)
+
+    async def _on_success(self) -> None:
+        async with self._lock:
+            self.failures = 0
+            self._transition(CircuitStateEnum.CLOSED)
+
+    async def _on_failure(self) -> None:
+        async with self._lock:
+            self.failures += 1
+            if (
+                self.state == CircuitStateEnum.HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                self.opened_at = time.monotonic()
+                self._transition(CircuitStateEnum.OPEN)
+
+    async def _on_cancel(self) -> None:
+        async with self._lock:
+            if self.state == CircuitStateEnum.HALF_OPEN:
+                # opened_at не меняется: следующий вызов сразу станет пробным
+                self._transition(CircuitStateEnum.OPEN)
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        await self._before_call()
+        start = time.perf_counter()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            await self._on_cancel()
+            raise
+        except BaseException:
+            await self._on_failure()
+            raise
+        finally:
+            CIRCUIT_CALL_DURATION.labels(service=self.service).observe(
+                time.perf_counter() - start
+            )
+        await self._on_success()
+        return result
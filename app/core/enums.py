@@ -14,6 +14,18 @@ class StatusSearchEnum(str, Enum):
     NO_DATA = "NO_DATA"
 
 
+class FingerprintStatusEnum(str, Enum):
+    FITTED = "FITTED"
+    SKIPPED = "SKIPPED"
+    FAILED = "FAILED"
+
+
+class CircuitStateEnum(int, Enum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
 class CurrencyEnum(str, Enum):
     USD = "USD"
     EUR = "EUR"
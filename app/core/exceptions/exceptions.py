@@ -45,7 +45,23 @@ class ObjectAlreadyExistException(ApplicationBaseException):
         super().__init__(msg, object_id)
 
 
+class SoftDeleteNotSupportedException(ApplicationBaseException):
+    """Raised when soft delete is requested for a model without an `is_deleted` column."""
+
+    def __init__(self, model_name: str):
+        msg = _("{model_name} does not support soft delete").format(model_name=model_name)
+        super().__init__(msg)
+
+
 class HttpConnectionException(ApplicationBaseException):
     def __init__(self, url):
         msg = _("Error connecting to remote server: {url}").format(url=url)
         super().__init__(msg)
+
+
+class CircuitBreakerOpenException(HttpConnectionException):
+    """Raised when calls to a remote service are blocked by an open circuit breaker."""
+
+    def __init__(self, service: str):
+        msg = _("Circuit breaker for {service} is open").format(service=service)
+        ApplicationBaseException.__init__(self, msg)
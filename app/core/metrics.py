@@ -40,6 +40,69 @@ CIRCUIT_CALL_DURATION = Histogram(
     buckets=(0.25, 0.5, 1, 2, 5, 7.5, 10, 15, 20, 25, 30, 35, 40, 45),
 )
 
+KRISHA_SEGMENTS_SKIPPED = Counter(
+    "krisha_segments_skipped_total",
+    "Krisha segments skipped: payload not changed, client error or empty body",
+    ["reason"],
+)
+
+KRISHA_INGEST_SKIPPED = Counter(
+    "krisha_ingest_skipped_total",
+    "Krisha ingest runs in which no segment changed",
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+DB_POOL_CONNECT = Histogram(
+    "db_pool_connect_seconds",
+    "Time spent opening a new connection for the SQLAlchemy pool",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Pool checkouts that gave up after DB_POOL_TIMEOUT",
+    ["engine"],
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Connections of the SQLAlchemy pool by state (checked_out, idle, overflow)",
+    ["engine", "state"],
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured pool capacity (pool_size + max_overflow)",
+    ["engine"],
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of SQL statements by normalized statement",
+    ["engine", "statement"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+DB_QUERY_ROWS = Histogram(
+    "db_query_rows",
+    "Rows returned or affected by SQL statements by normalized statement",
+    ["engine", "statement"],
+    buckets=(0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000),
+)
+
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL statements slower than DB_SLOW_QUERY_MS",
+    ["engine", "statement"],
+)
+
 TRANSFORM_DURATION = Histogram(
     name="data_transform_duration_ms",
     documentation="Duration of data transformation methods in milliseconds",
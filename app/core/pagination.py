@@ -1,3 +1,12 @@
+import base64
+import json
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import HTTPException
+from starlette.datastructures import URL
+from starlette.status import HTTP_400_BAD_REQUEST
+
 from app.core.schemas import PaginationMeta, PaginationLinks, PaginationResponse
 from app.core.sla_transform_decorator import track_duration
 
@@ -41,3 +50,63 @@ async def get_pagination(
         links=link,
         meta=meta,
     )
+
+
+def encode_cursor(key: dict[str, Any], page: int) -> str:
+    """Кодирует ключ последней строки страницы в непрозрачный курсор."""
+    payload = json.dumps({"k": key, "p": page}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(
+    cursor: str | None, **fields: Callable[[Any], Any]
+) -> tuple[dict[str, Any] | None, int]:
+    """
+    Возвращает ключ последней строки предыдущей страницы и номер текущей страницы.
+
+    :param fields: поля ключа и функции приведения их значений, например
+        `last_updated=date.fromisoformat, id=int`.
+    :raises HTTPException: 400, если курсор повреждён или подделан.
+    """
+    if not cursor:
+        return None, 1
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        key = payload["k"]
+        page = int(payload["p"]) + 1
+        if page < 2:
+            raise ValueError("page")
+        return {name: cast(key[name]) for name, cast in fields.items()}, page
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+@track_duration(sla_ms=50, label="get_keyset_pagination")
+async def get_keyset_pagination(
+    url: str,
+    total: int,
+    page: int,
+    per_page: int,
+    next_key: dict[str, Any] | None,
+) -> PaginationResponse:
+    """
+    Пагинация по ключу: ссылка `next` содержит курсор с ключом последней строки,
+    поэтому следующая страница читается range scan'ом без OFFSET.
+    """
+    self_url = URL(url)
+    first_url = self_url.remove_query_params("cursor")
+    next_link = (
+        str(self_url.include_query_params(cursor=encode_cursor(next_key, page)))
+        if next_key is not None
+        else None
+    )
+    return await get_pagination(
+        link=await get_pagination_links(
+            self_link=str(self_url),
+            first_link=str(first_url),
+            next_link=next_link,
+        ),
+        meta=await get_pagination_meta(
+            total=total, current_page=page, per_page=per_page
+        ),
+    )
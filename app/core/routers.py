@@ -5,6 +5,8 @@ from fastapi import (
 from prometheus_client import generate_latest
 from starlette.responses import Response
 
+from app.presentation.api.analise import analise_router
+from app.presentation.api.forecast import forecast_router
 from app.presentation.api.parser import parser_router
 
 misc_router = APIRouter(prefix="", tags=["misc"])
@@ -29,6 +31,8 @@ def bind_routers(app: FastAPI):
     """Binds and registers API routers to the FastAPI application with a common prefix."""
     router = APIRouter(prefix="/api/v1")
     router.include_router(router=parser_router)
+    router.include_router(router=forecast_router)
+    router.include_router(router=analise_router)
 
     app.include_router(router=router)
     app.include_router(router=misc_router)
@@ -24,10 +24,67 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
+    POSTGRES_REPLICA_HOST: str | None = None
+    POSTGRES_REPLICA_PORT: int | None = None
+
+    SCHEDULER_ENABLED: bool = False
+
+    DB_YIELD_PER: int = 1000
+    # пул на процесс: uvicorn --workers N держит до N * (size + overflow) соединений
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int | None = None
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER: bool = False
+    DB_QUERY_METRICS: bool = True
+    DB_SLOW_QUERY_MS: float = 500.0
+    # после commit с записью чтения процесса идут в primary, пока реплика догоняет
+    DB_REPLICA_PIN_SECONDS: float = 5.0
 
     LOCALE_DIR: str = "locales"
     DEFAULT_LOCALE: str = "en"
 
+    FORECAST_MAX_WORKERS: int | None = None
+    FORECAST_PERIODS: int = 60
+    FORECAST_WARM_START: bool = True
+    FORECAST_RUN_RETENTION: int = 5
+    FORECAST_MODEL_DIR: str = "var/models"
+    FORECAST_MODEL_STORE_MAX_ENTRIES: int = 500
+    FORECAST_MODEL_STORE_MAX_BYTES: int = 512 * 1024 * 1024
+    REFERENCE_CACHE_CHECK_SECONDS: float = 60.0
+
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+    REDIS_DB: int = 0
+    REDIS_MAX_CONNECTIONS: int = 32
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_CONNECT_TIMEOUT: float = 0.1
+    REDIS_RETRY_SECONDS: float = 10.0
+    REDIS_FAKE: bool = False
+    CACHE_TTL: int = 600
+
+    KRISHA_CONNECT_TIMEOUT: float = 5.0
+    KRISHA_READ_TIMEOUT: float = 20.0
+    KRISHA_MAX_CONNECTIONS: int = 10
+    KRISHA_MAX_RETRIES: int = 4
+    KRISHA_BACKOFF_BASE: float = 0.5
+    KRISHA_BACKOFF_MAX: float = 10.0
+    KRISHA_CONCURRENCY: int = 4
+    KRISHA_RATE_LIMIT: float = 2.0
+    KRISHA_REGION_IDS: list[int] = []
+    KRISHA_SEGMENT_ROOMS: list[str] = ["1", "2", "3", "4", "5"]
+    KRISHA_SEGMENT_BUILDING_TYPES: list[str] = ["1", "2", "3"]
+    KRISHA_ARCHIVE_DIR: str | None = "var/krisha"
+    KRISHA_ARCHIVE_LEVEL: int = 10
+    KRISHA_REPLAY_WORKERS: int | None = None
+    BUILDING_PARTITIONS_AHEAD: int = 3
+    BUILDING_PARTITIONS_RETENTION_MONTHS: int | None = None
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RECOVERY_TIMEOUT: float = 60.0
+
     @property
     def DB_URL(self) -> str:
         return (
@@ -39,6 +96,19 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_DB}"
         )
 
+    @property
+    def DB_REPLICA_URL(self) -> str | None:
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return (
+            f"postgresql+asyncpg://"
+            f"{self.POSTGRES_USER}:"
+            f"{self.POSTGRES_PASSWORD}@"
+            f"{self.POSTGRES_REPLICA_HOST}:"
+            f"{self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT}/"
+            f"{self.POSTGRES_DB}"
+        )
+
     class Config:
         env_file: str = ".env"
         extra: str = "ignore"
@@ -1,14 +1,12 @@
-from app.infrastructure.db.repositories.building_analisation import (
-    BuildingAnalisationModelRepository,
-)
-from app.infrastructure.db.sessions import async_session_maker
-from app.infrastructure.krisha_analitic import fetch_krisha_data
+from app.core.tasks.forecast_jobs import forecast_jobs
+from app.domain.parser.ingest import ingest_krisha
+from app.infrastructure.db.sessions import UnitOfWork
 
 
 async def fetch_krisha() -> None:
-    result: list[dict] = await fetch_krisha_data()
-    async with async_session_maker() as session:
-        build_analise_repo: BuildingAnalisationModelRepository = (
-            BuildingAnalisationModelRepository(session)
-        )
-        await build_analise_repo.upsert_many(result)
+    async with UnitOfWork() as uow:
+        stats = await ingest_krisha(uow)
+
+    # прогноз пересчитывается только если данные krisha изменились
+    if stats.written:
+        await forecast_jobs.submit()
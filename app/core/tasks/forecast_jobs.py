@@ -0,0 +1,77 @@
+import asyncio
+import zlib
+from uuid import UUID, uuid4
+
+from app.core import logger
+from app.core.tasks.predict_price import predict_price
+from app.domain.forecast.schemas import ForecastJobSchema
+from app.infrastructure.db.locks import advisory_lock
+from app.infrastructure.db.repositories.forecast_run import ForecastRunModelRepository
+from app.infrastructure.db.sessions import UnitOfWork
+
+# ключ advisory-блокировки прогноза, общий для всех воркеров
+FORECAST_LOCK_KEY = zlib.crc32(b"forecast_run")
+
+
+class ForecastJobManager:
+    """
+    Запускает прогнозы фоновыми задачами в event loop воркера.
+
+    Задача — это запуск из `forecast_run`: статус и результат читаются из БД,
+    поэтому доступны с любого воркера. Тяжёлые вычисления выполняются в пуле
+    процессов/потоков внутри `predict_price`, поэтому обработка остальных запросов
+    не блокируется. Одновременно выполняется не более одного прогноза на все
+    воркеры (advisory-блокировка PostgreSQL), остальные ждут в статусе PENDING.
+    """
+
+    def __init__(self):
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    async def submit(self, force: bool = False) -> ForecastJobSchema:
+        run_id = uuid4()
+        async with UnitOfWork() as uow:
+            run = await ForecastRunModelRepository(uow.session).create_pending(
+                run_id, params={"force": force}
+            )
+
+        task = asyncio.create_task(self._run(run_id, force))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        return ForecastJobSchema(
+            job_id=run.id, status=run.status, created_at=run.created_at
+        )
+
+    async def fail_orphaned(self) -> int:
+        """
+        Помечает ERROR запуски, оставшиеся в PENDING/STARTED после остановки воркера.
+
+        Вызывается при старте приложения. Если блокировку прогноза держит другой
+        воркер, его запуски живы и ничего не меняется.
+
+        :return: количество помеченных запусков.
+        """
+        async with advisory_lock(FORECAST_LOCK_KEY, wait=False) as acquired:
+            if not acquired:
+                return 0
+            async with UnitOfWork() as uow:
+                failed = await ForecastRunModelRepository(uow.session).fail_active(
+                    error="Interrupted: the worker stopped before the run finished"
+                )
+        if failed:
+            logger.warning(f"Marked {failed} interrupted forecast runs as ERROR")
+        return failed
+
+    async def _run(self, run_id: UUID, force: bool) -> None:
+        # локальная блокировка: ожидающие задачи воркера не занимают соединения
+        async with self._lock:
+            try:
+                async with advisory_lock(FORECAST_LOCK_KEY):
+                    await predict_price(force=force, run_id=run_id)
+            except Exception as e:
+                # статус ERROR уже записан в ForecastService
+                logger.exception(f"Forecast job {run_id} failed: {e}")
+
+
+forecast_jobs = ForecastJobManager()
@@ -0,0 +1,31 @@
+from datetime import date
+
+from app.core import logger, settings
+from app.infrastructure.db.repositories.building_analisation import (
+    BuildingAnalisationModelRepository,
+    add_months,
+    month_start,
+)
+from app.infrastructure.db.sessions import UnitOfWork
+
+
+async def maintain_partitions() -> None:
+    """
+    Создаёт секции building_analisation на ближайшие месяцы и отсоединяет старые.
+
+    Отсоединённые секции остаются отдельными таблицами для архивации.
+    """
+    async with UnitOfWork() as uow:
+        repo = BuildingAnalisationModelRepository(uow.session)
+        created = await repo.ensure_future_partitions(settings.BUILDING_PARTITIONS_AHEAD)
+        await uow.commit()
+        if created:
+            logger.info(f"Created building_analisation partitions: {created}")
+
+        if settings.BUILDING_PARTITIONS_RETENTION_MONTHS is not None:
+            before = add_months(
+                month_start(date.today()), -settings.BUILDING_PARTITIONS_RETENTION_MONTHS
+            )
+            detached = await repo.detach_partitions(before)
+            if detached:
+                logger.info(f"Detached building_analisation partitions: {detached}")
@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from app.core import logger, settings
+from app.domain.analise.cache import invalidate_analytics_cache
+from app.domain.parser.validation import validate_rows
+from app.infrastructure.db.repositories.building_analisation import (
+    BuildingAnalisationModelRepository,
+)
+from app.infrastructure.db.repositories.krisha_quarantine import (
+    KrishaQuarantineModelRepository,
+)
+from app.infrastructure.db.sessions import UnitOfWork
+from app.infrastructure.krisha_crawler import KrishaSegment, segment_rows
+from app.infrastructure.payload_archive import PayloadArchive, get_payload_archive
+
+REPLAY_WINDOW = 2
+
+
+def load_payload_rows(root: str, entry: dict) -> tuple[list[dict], list[dict]]:
+    """
+    Распаковывает, разбирает и валидирует один архивный ответ (в дочернем процессе).
+
+    :return: валидные и отклонённые строки, как `validate_rows`.
+    """
+    payload = json.loads(PayloadArchive(root).load(entry["hash"]))
+    return validate_rows(
+        segment_rows(KrishaSegment.from_params(entry["params"]), payload)
+    )
+
+
+def replay_rejection(entry: dict, error: Exception) -> dict:
+    """Запись карантина для архивного ответа, который не удалось загрузить целиком."""
+    return {
+        "payload": {"archive": entry},
+        "reasons": [
+            {"field": "", "type": "replay_error", "message": f"{type(error).__name__}: {error}"}
+        ],
+    }
+
+
+def deduplicate(entries: list[dict]) -> list[dict]:
+    """Убирает повторы: тот же ответ по тому же срезу подряд даёт тот же upsert."""
+    last_hash: dict[str, str] = {}
+    unique = []
+    for entry in entries:
+        if last_hash.get(entry["segment"]) == entry["hash"]:
+            continue
+        last_hash[entry["segment"]] = entry["hash"]
+        unique.append(entry)
+    return unique
+
+
+async def replay_krisha(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    archive: PayloadArchive | None = None,
+    max_workers: int | None = None,
+) -> int:
+    """
+    Повторно загружает архивные ответы krisha за период без обращения к сети.
+
+    Ответы распаковываются и разбираются параллельно в пуле процессов, а сохраняются
+    через тот же `upsert_many` строго в порядке получения: более поздний ответ
+    перезаписывает более ранний, как и при обычной загрузке. Вперёд разбирается
+    не больше `REPLAY_WINDOW` ответов на процесс, поэтому память не растёт с периодом.
+    Ответ, который не удалось разобрать или сохранить, попадает в карантин
+    (`krisha_quarantine`, тип `replay_error`) и не прерывает загрузку остальных.
+
+    :return: количество вставленных или изменённых строк.
+    """
+    archive = archive or get_payload_archive()
+    if archive is None:
+        raise RuntimeError("KRISHA_ARCHIVE_DIR is not configured")
+
+    entries = deduplicate(await asyncio.to_thread(archive.entries, date_from, date_to))
+    logger.info(f"Krisha replay: {len(entries)} archived payloads")
+    if not entries:
+        return 0
+
+    loop = asyncio.get_running_loop()
+    workers = min(
+        max_workers or settings.KRISHA_REPLAY_WORKERS or os.cpu_count(),
+        len(entries),
+    )
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    # в памяти не больше REPLAY_WINDOW разобранных ответов на процесс
+    window = workers * REPLAY_WINDOW
+    pending: deque[tuple[dict, asyncio.Future]] = deque()
+    rows_total = 0
+    try:
+        async with UnitOfWork() as uow:
+            repo = BuildingAnalisationModelRepository(uow.session)
+            quarantine_repo = KrishaQuarantineModelRepository(uow.session)
+
+            async def save(entry: dict, future: asyncio.Future) -> int:
+                try:
+                    valid, rejected = await future
+                    await quarantine_repo.add_many(entry["segment"], rejected)
+                    counts = await repo.upsert_many(valid)
+                    await uow.commit()
+                except Exception as e:
+                    # сбойный ответ уходит в карантин, остальные загружаются дальше
+                    await uow.rollback()
+                    repo.forget_partitions()
+                    logger.exception(f"Krisha replay: payload {entry['hash']} failed: {e}")
+                    await quarantine_repo.add_many(
+                        entry["segment"], [replay_rejection(entry, e)]
+                    )
+                    await uow.commit()
+                    return 0
+                return counts["inserted"] + counts["updated"]
+
+            for entry in entries:
+                pending.append(
+                    (
+                        entry,
+                        loop.run_in_executor(
+                            pool, load_payload_rows, str(archive.root), entry
+                        ),
+                    )
+                )
+                if len(pending) >= window:
+                    rows_total += await save(*pending.popleft())
+            while pending:
+                rows_total += await save(*pending.popleft())
+
+            if rows_total:
+                await repo.refresh_monthly()
+    finally:
+        # ожидание процессов пула не блокирует event loop
+        await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+    await invalidate_analytics_cache()
+    logger.info(f"Krisha replay: {rows_total} rows inserted or updated")
+    return rows_total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay archived krisha payloads into building_analisation"
+    )
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    parser.add_argument("--archive", help="archive directory (KRISHA_ARCHIVE_DIR)")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    archive = PayloadArchive(args.archive) if args.archive else None
+    asyncio.run(
+        replay_krisha(args.date_from, args.date_to, archive, max_workers=args.workers)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from app.core import logger
 from app.core.scheduler import scheduler
 from app.core.tasks.fetch_data_from_krisha import fetch_krisha
+from app.core.tasks.maintain_partitions import maintain_partitions
 
 
 async def start_scheduler():
@@ -24,6 +25,17 @@ async def start_scheduler():
             replace_existing=True,
             next_run_time=datetime.now() + timedelta(minutes=2),
         )
+        scheduler.add_job(
+            func=maintain_partitions,
+            trigger=IntervalTrigger(days=1),
+            id="maintain_partitions",
+            name="Building-Analisation-Partitions",
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=60,
+            replace_existing=True,
+            next_run_time=datetime.now(),
+        )
         scheduler.start()
         logger.info("Scheduler успешно запущен.")
     except Exception as e:
@@ -0,0 +1,67 @@
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractContextManager, nullcontext
+import hashlib
+import time
+
+from app.core import settings
+from app.core.schemas import BaseResponseSchema
+from app.infrastructure.adapters.redis import redis_adapter
+from app.infrastructure.db.sessions import primary_reads
+
+ANALYTICS_CACHE = "analytics"
+
+# последняя версия кэша и когда этот процесс впервые её увидел
+_seen_version: tuple[int, float] | None = None
+
+
+async def versioned_key(key: str) -> str | None:
+    """
+    Ключ кэша с текущей версией пространства имён.
+
+    После `invalidate_analytics_cache` старые ключи больше не читаются и истекают по TTL.
+    Возвращает None, если Redis недоступен.
+    """
+    global _seen_version
+    version = await redis_adapter.get_int(f"cache:version:{ANALYTICS_CACHE}")
+    if version is None:
+        return None
+    if _seen_version is None or _seen_version[0] != version:
+        _seen_version = (version, time.monotonic())
+    return f"{ANALYTICS_CACHE}:v{version}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def fresh_reads() -> AbstractContextManager[None]:
+    """
+    Где читать данные, которые кладутся в кэш.
+
+    Версию меняют сразу после commit, а реплика может ещё отставать. Пока версия
+    моложе `DB_REPLICA_PIN_SECONDS`, данные под неё читаются с primary, иначе
+    устаревший ответ реплики пролежал бы в кэше под новой версией весь `CACHE_TTL`.
+    """
+    if (
+        _seen_version is not None
+        and time.monotonic() - _seen_version[1] < settings.DB_REPLICA_PIN_SECONDS
+    ):
+        return primary_reads()
+    return nullcontext()
+
+
+async def cached_response(
+    key: str, loader: Callable[[], Awaitable[BaseResponseSchema]]
+) -> dict:
+    """Отдаёт ответ из Redis или строит его через `loader` и кладёт в кэш."""
+    cache_key = await versioned_key(key)
+    if cache_key is None:
+        return (await loader()).model_dump(mode="json")
+
+    response = await redis_adapter.get(cache_key)
+    if response is None:
+        with fresh_reads():
+            response = (await loader()).model_dump(mode="json")
+        await redis_adapter.set(cache_key, response, ttl=settings.CACHE_TTL)
+    return response
+
+
+async def invalidate_analytics_cache() -> None:
+    """Вызывается после фиксации новых данных krisha или нового запуска прогноза."""
+    await redis_adapter.incr(f"cache:version:{ANALYTICS_CACHE}")
@@ -0,0 +1,43 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import Field
+
+from app.core.schemas import BaseSchema
+
+
+class BuildingHistorySchema(BaseSchema):
+    geo: int
+    geo_title: str | None = None
+    last_updated: date
+    average: int | None = Field(default=None, description="Средняя цена за м² в USD")
+    average_kzt: int | None = Field(default=None, description="Средняя цена за м² в тенге")
+    total: int | None = Field(default=None, description="Количество объектов")
+    rooms: str | None = None
+    building: str | None = None
+
+
+class BuildingMonthlySchema(BaseSchema):
+    geo: int
+    geo_title: str | None = None
+    month: date = Field(..., description="Первый день месяца")
+    average: float | None = Field(default=None, description="Средняя цена за м² в USD")
+    median_average: float | None = Field(default=None, description="Медиана цены за м² в USD")
+    average_kzt: float | None = Field(default=None, description="Средняя цена за м² в тенге")
+    total: float | None = Field(default=None, description="Среднее количество объектов")
+    snapshots: int = Field(..., description="Количество срезов за месяц")
+    last_updated: date
+    usd_rate: float | None = Field(default=None, description="Курс USD/KZT за месяц")
+    inflation_rate: float | None = Field(default=None, description="Инфляция за год")
+    nds_factor: float | None = Field(default=None, description="Множитель НДС за год")
+
+
+class BuildingForecastSchema(BaseSchema):
+    run_id: UUID
+    geo: int
+    geo_title: str
+    forecast_date: date
+    forecast_kzt: Decimal
+    lower_bound_kzt: Decimal | None = None
+    upper_bound_kzt: Decimal | None = None
@@ -1,7 +1,17 @@
+from datetime import date
 from typing import Annotated
 
 from fastapi import Depends
 
+from app.core.pagination import decode_cursor, get_keyset_pagination
+from app.core.schemas import BaseResponseSchema
+from app.domain.analise.cache import cached_response
+from app.domain.analise.schemas import (
+    BuildingForecastSchema,
+    BuildingHistorySchema,
+    BuildingMonthlySchema,
+)
+from app.domain.forecast.reference import reference_cache
 from app.infrastructure.db.repositories.building_analisation import (
     BuildingAnalisationModelRepository,
 )
@@ -28,5 +38,151 @@ class AnaliseService:
         self.inflation_repo = inflation_repo
         self.nds_repo = nds_repo
 
-    async def get_analise(self):
-        pass
+    async def get_history(
+        self,
+        url: str,
+        geo: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        rooms: str | None = None,
+        building: str | None = None,
+    ) -> dict:
+        """
+        История цен города, страницы по ключу (last_updated, id).
+
+        Без `rooms`/`building` — общий срез по региону.
+        """
+        after, page = decode_cursor(cursor, last_updated=date.fromisoformat, id=int)
+
+        async def load() -> BaseResponseSchema:
+            rows = await self.build_analise_repo.get_history_page(
+                geo,
+                date_from,
+                date_to,
+                after=(after["last_updated"], after["id"]) if after else None,
+                limit=limit,
+                rooms=rooms,
+                building=building,
+            )
+            total = await self.build_analise_repo.count_history(
+                geo, date_from, date_to, rooms=rooms, building=building
+            )
+            next_key = (
+                {"last_updated": rows[-1].last_updated, "id": rows[-1].id}
+                if len(rows) == limit
+                else None
+            )
+            return BaseResponseSchema(
+                data=[BuildingHistorySchema.model_validate(row) for row in rows],
+                pagination=await get_keyset_pagination(
+                    url, total=total, page=page, per_page=limit, next_key=next_key
+                ),
+            )
+
+        return await cached_response(url, load)
+
+    async def get_monthly(
+        self,
+        url: str,
+        geo: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> dict:
+        """Помесячные агрегаты цен города, страницы по ключу month."""
+        after, page = decode_cursor(cursor, month=date.fromisoformat)
+
+        async def load() -> BaseResponseSchema:
+            rows = await self.build_analise_repo.get_monthly_page(
+                geo,
+                date_from,
+                date_to,
+                after=after["month"] if after else None,
+                limit=limit,
+            )
+            total = await self.build_analise_repo.count_monthly(
+                geo, date_from, date_to
+            )
+            reference = await reference_cache.get(
+                self.currency_rate_repo, self.inflation_repo, self.nds_repo
+            )
+            next_key = {"month": rows[-1]["month"]} if len(rows) == limit else None
+            return BaseResponseSchema(
+                data=[
+                    BuildingMonthlySchema.model_validate(
+                        {
+                            **row,
+                            "usd_rate": reference.usd_at(row["month"].year, row["month"].month),
+                            "inflation_rate": reference.inflation_at(row["month"].year),
+                            "nds_factor": reference.nds_at(row["month"].year),
+                        }
+                    )
+                    for row in rows
+                ],
+                pagination=await get_keyset_pagination(
+                    url, total=total, page=page, per_page=limit, next_key=next_key
+                ),
+            )
+
+        return await cached_response(url, load)
+
+    async def get_latest_snapshot(
+        self, url: str, limit: int = 100, cursor: str | None = None
+    ) -> dict:
+        """Последние данные по каждому городу, страницы по ключу geo."""
+        after, page = decode_cursor(cursor, geo=int)
+
+        async def load() -> BaseResponseSchema:
+            rows = await self.build_analise_repo.get_latest_snapshot_page(
+                after_geo=after["geo"] if after else None, limit=limit
+            )
+            total = await self.build_analise_repo.count_geos()
+            next_key = {"geo": rows[-1].geo} if len(rows) == limit else None
+            return BaseResponseSchema(
+                data=[BuildingHistorySchema.model_validate(row) for row in rows],
+                pagination=await get_keyset_pagination(
+                    url, total=total, page=page, per_page=limit, next_key=next_key
+                ),
+            )
+
+        return await cached_response(url, load)
+
+    async def get_forecast(
+        self,
+        url: str,
+        geo: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> dict:
+        """Актуальный прогноз города в диапазоне дат, страницы по ключу forecast_date."""
+        after, page = decode_cursor(cursor, forecast_date=date.fromisoformat)
+
+        async def load() -> BaseResponseSchema:
+            rows = await self.building_forecast_repo.get_latest_page(
+                geo,
+                date_from,
+                date_to,
+                after=after["forecast_date"] if after else None,
+                limit=limit,
+            )
+            total = await self.building_forecast_repo.count_latest(
+                geo, date_from, date_to
+            )
+            next_key = (
+                {"forecast_date": rows[-1].forecast_date}
+                if len(rows) == limit
+                else None
+            )
+            return BaseResponseSchema(
+                data=[BuildingForecastSchema.model_validate(row) for row in rows],
+                pagination=await get_keyset_pagination(
+                    url, total=total, page=page, per_page=limit, next_key=next_key
+                ),
+            )
+
+        return await cached_response(url, load)
@@ -0,0 +1,172 @@
+import asyncio
+import multiprocessing
+import os
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from prophet.serialize import model_from_json, model_to_json
+
+from app.core import settings
+from app.domain.forecast.regressors import REGRESSORS, RegressorBuilder
+from app.infrastructure.model_store import ProphetModelStore
+
+
+@dataclass(frozen=True)
+class CityForecastTask:
+    """
+    Входные данные для прогноза одного города (pickle-совместимые).
+
+    Без `history` задача только строит прогноз по сохранённой модели, без обучения.
+    `overrides` подменяет значения регрессоров на будущих датах (сценарии).
+    """
+
+    geo: int
+    geo_title: str
+    regressors: RegressorBuilder
+    history: pd.DataFrame | None = None
+    periods: int = 60
+    store: ProphetModelStore | None = None
+    warm_start: bool = True
+    overrides: dict[str, float] | None = None
+
+
+@dataclass(frozen=True)
+class CityForecastResult:
+    """Результат прогноза по одному городу."""
+
+    geo: int
+    geo_title: str
+    forecast: pd.DataFrame | None = None
+    error: str | None = None
+
+
+def new_model() -> Prophet:
+    model = Prophet(yearly_seasonality=True)
+    for regressor in REGRESSORS:
+        model.add_regressor(regressor)
+    return model
+
+
+def warm_start_params(model: Prophet) -> dict:
+    """Параметры обученной модели в формате init для Stan (см. документацию Prophet)."""
+    params = {}
+    for name in ("k", "m", "sigma_obs"):
+        if model.mcmc_samples == 0:
+            params[name] = model.params[name][0][0]
+        else:
+            params[name] = np.mean(model.params[name])
+    for name in ("delta", "beta"):
+        if model.mcmc_samples == 0:
+            params[name] = model.params[name][0]
+        else:
+            params[name] = np.mean(model.params[name], axis=0)
+    return params
+
+
+def fit_model(task: CityForecastTask) -> Prophet:
+    """Обучает модель, по возможности стартуя с параметров предыдущей."""
+    previous_json = task.store.load(task.geo) if task.store and task.warm_start else None
+
+    model = new_model()
+    if previous_json is not None:
+        try:
+            init = warm_start_params(model_from_json(previous_json))
+            return model.fit(task.history, init=init)
+        except Exception:
+            # размерности могли измениться (например, число changepoints) — учим с нуля
+            model = new_model()
+    return model.fit(task.history)
+
+
+def predict_model(model: Prophet, task: CityForecastTask) -> pd.DataFrame:
+    future = model.make_future_dataframe(periods=task.periods, freq="MS")
+    future = future.join(task.regressors.future(future["ds"]))
+
+    historical_last_date = model.history["ds"].max()
+    for column, value in (task.overrides or {}).items():
+        future.loc[future["ds"] > historical_last_date, column] = value
+
+    forecast = model.predict(future)
+    forecast = forecast[forecast["ds"] > historical_last_date]
+    return forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].reset_index(drop=True)
+
+
+def fit_city_forecast(task: CityForecastTask) -> CityForecastResult:
+    """
+    Обучает Prophet по одному городу и возвращает прогноз после последней исторической даты.
+
+    Функция выполняется в дочернем процессе, поэтому не обращается к БД и
+    не бросает исключения наружу — ошибка возвращается в результате.
+    Обученная модель сохраняется в хранилище для тёплого старта и прогнозов без обучения.
+    """
+    try:
+        model = fit_model(task)
+        if task.store is not None:
+            task.store.save(task.geo, model_to_json(model))
+
+        return CityForecastResult(
+            geo=task.geo, geo_title=task.geo_title, forecast=predict_model(model, task)
+        )
+    except Exception as e:
+        return CityForecastResult(
+            geo=task.geo, geo_title=task.geo_title, error=f"{type(e).__name__}: {e}"
+        )
+
+
+def predict_city_forecast(task: CityForecastTask) -> CityForecastResult:
+    """Строит прогноз по сохранённой модели города без переобучения."""
+    try:
+        model_json = task.store.load(task.geo) if task.store else None
+        if model_json is None:
+            return CityForecastResult(
+                geo=task.geo, geo_title=task.geo_title, error="No cached model"
+            )
+
+        return CityForecastResult(
+            geo=task.geo,
+            geo_title=task.geo_title,
+            forecast=predict_model(model_from_json(model_json), task),
+        )
+    except Exception as e:
+        return CityForecastResult(
+            geo=task.geo, geo_title=task.geo_title, error=f"{type(e).__name__}: {e}"
+        )
+
+
+class ForecastEngine:
+    """
+    Распределяет обучение моделей по городам в пул процессов.
+
+    Результаты отдаются по мере готовности, чтобы их можно было сразу сохранять.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers or settings.FORECAST_MAX_WORKERS or os.cpu_count()
+
+    async def run(
+        self,
+        tasks: list[CityForecastTask],
+        func: Callable[[CityForecastTask], CityForecastResult] = fit_city_forecast,
+    ) -> AsyncIterator[CityForecastResult]:
+        if not tasks:
+            return
+
+        loop = asyncio.get_running_loop()
+        # spawn: форк процесса с работающим event loop и пулом соединений небезопасен
+        pool = ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(tasks)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        try:
+            futures = [
+                loop.run_in_executor(pool, func, task) for task in tasks
+            ]
+            for future in asyncio.as_completed(futures):
+                yield await future
+        finally:
+            # ожидание завершения процессов не должно блокировать event loop
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
@@ -0,0 +1,152 @@
+import hashlib
+from dataclasses import dataclass
+
+import pandas as pd
+
+from app.core import logger
+from app.domain.forecast.engine import CityForecastTask
+from app.domain.forecast.regressors import (
+    FUTURE_CURRENCY,
+    FUTURE_INFLATION,
+    RegressorBuilder,
+)
+from app.infrastructure.model_store import ProphetModelStore
+
+MIN_HISTORY_POINTS = 6
+
+
+@dataclass
+class ForecastFrames:
+    """
+    Исходные DataFrame'ы для подготовки прогноза.
+
+    Загружаются репозиториями колонками (`get_monthly_frame` / `get_frame`):
+    `geo` int32, `geo_title` category, даты datetime64, цены и ставки float64.
+    История — помесячные средние из `building_analisation_monthly`.
+    `regressors` и `regressor_version` заполняются из кэша справочников
+    (`reference_cache`), без них считаются по DataFrame'ам.
+    """
+
+    building_df: pd.DataFrame | None  # None — только регрессоры (прогноз по сохранённым моделям)
+    currency_df: pd.DataFrame
+    inflation_df: pd.DataFrame
+    nds_df: pd.DataFrame
+    regressors: RegressorBuilder | None = None
+    regressor_version: str | None = None
+
+
+def regressor_version(frames: ForecastFrames) -> str:
+    """Версия таблиц регрессоров (курс, инфляция, НДС и прогноз правительства)."""
+    if frames.regressor_version is not None:
+        return frames.regressor_version
+    digest = hashlib.sha256()
+    for df in (frames.currency_df, frames.inflation_df, frames.nds_df):
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    digest.update(repr((FUTURE_INFLATION, FUTURE_CURRENCY)).encode())
+    return digest.hexdigest()
+
+
+def compute_fingerprints(frames: ForecastFrames) -> dict[int, dict]:
+    """
+    Считает отпечаток истории по каждому geo.
+
+    Если отпечаток совпадает с сохранённым, история города и регрессоры не менялись
+    и переобучать модель не нужно.
+    """
+    version = regressor_version(frames)
+    if frames.building_df.empty:
+        return {}
+
+    building_df = frames.building_df[
+        ["geo", "geo_title", "last_updated", "average"]
+    ].sort_values(["geo", "last_updated", "average"])
+
+    fingerprints = {}
+    for geo, group in building_df.groupby("geo", sort=False, observed=True):
+        values = group[["last_updated", "average"]]
+        fingerprints[int(geo)] = {
+            "geo": int(geo),
+            "geo_title": group["geo_title"].iloc[-1],
+            "row_count": int(group.shape[0]),
+            "max_last_updated": group["last_updated"].max().date(),
+            "values_hash": hashlib.sha256(
+                pd.util.hash_pandas_object(values, index=False).values.tobytes()
+            ).hexdigest(),
+            "regressor_version": version,
+        }
+    return fingerprints
+
+
+def build_regressor_builder(frames: ForecastFrames) -> RegressorBuilder:
+    if frames.regressors is not None:
+        return frames.regressors
+    return RegressorBuilder.from_frames(
+        frames.currency_df, frames.inflation_df, frames.nds_df
+    )
+
+
+def build_forecast_tasks(
+    frames: ForecastFrames,
+    periods: int = 60,
+    geos: set[int] | None = None,
+    store: ProphetModelStore | None = None,
+) -> list[CityForecastTask]:
+    """
+    Готовит исторические ряды и регрессоры и режет их на независимые задачи по городам.
+
+    Регрессоры считаются один раз для всей истории, затем ряд нарезается по городам.
+    Каждая задача содержит только сериализуемые данные и может быть обработана
+    в отдельном процессе. Если передан `geos`, готовятся только эти регионы.
+    """
+    building_df = frames.building_df
+
+    if geos is not None:
+        building_df = building_df[building_df["geo"].isin(geos)]
+
+    if building_df.empty:
+        return []
+
+    builder = build_regressor_builder(frames)
+
+    building_df = building_df.sort_values(["geo_title", "last_updated"]).reset_index(
+        drop=True
+    )
+    regressors = builder.history(building_df["last_updated"])
+
+    history_df = pd.DataFrame(
+        {
+            "ds": building_df["last_updated"],
+            "y": building_df["average"] * regressors["usd_rate"],  # цена в тенге
+            "inflation_rate": regressors["inflation_rate"],
+            "nds_factor": regressors["nds_factor"],
+            "usd_rate": regressors["usd_rate"],
+        }
+    )
+
+    # -----------------------------
+    # Разделение по городам
+    # -----------------------------
+    tasks: list[CityForecastTask] = []
+    grouped = history_df.groupby(
+        [building_df["geo"], building_df["geo_title"]], sort=False, observed=True
+    )
+    for (geo, geo_title), prophet_df in grouped:
+        # Защита: если мало точек — пропускаем
+        if prophet_df.shape[0] < MIN_HISTORY_POINTS:
+            logger.warning(
+                f"Skipping {geo_title}: not enough historical points ({prophet_df.shape[0]})"
+            )
+            continue
+
+        tasks.append(
+            CityForecastTask(
+                geo=int(geo),
+                geo_title=geo_title,
+                regressors=builder,
+                history=prophet_df.reset_index(drop=True),
+                periods=periods,
+                store=store,
+            )
+        )
+
+    return tasks
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+
+from app.core import logger, settings
+from app.domain.forecast.preparation import ForecastFrames, regressor_version
+from app.domain.forecast.regressors import RegressorBuilder
+from app.infrastructure.db.repositories.currency_rate import CurrencyRateModelRepository
+from app.infrastructure.db.repositories.inflation import InflationModelRepository
+from app.infrastructure.db.repositories.nds import NDSModelRepository
+from app.infrastructure.db.sessions import primary_reads
+
+
+@dataclass(frozen=True)
+class ReferenceTables:
+    """
+    Справочники регрессоров (курс, инфляция, НДС), готовые к использованию.
+
+    `version` — штампы таблиц (`version_stamp`), по ним кэш понимает, что данные
+    изменились. `regressor_version` — хэш содержимого для отпечатков прогноза.
+    """
+
+    version: tuple
+    currency_df: pd.DataFrame
+    inflation_df: pd.DataFrame
+    nds_df: pd.DataFrame
+    regressors: RegressorBuilder
+    regressor_version: str
+
+    @classmethod
+    def build(
+        cls,
+        version: tuple,
+        currency_df: pd.DataFrame,
+        inflation_df: pd.DataFrame,
+        nds_df: pd.DataFrame,
+    ) -> "ReferenceTables":
+        return cls(
+            version=version,
+            currency_df=currency_df,
+            inflation_df=inflation_df,
+            nds_df=nds_df,
+            regressors=RegressorBuilder.from_frames(currency_df, inflation_df, nds_df),
+            regressor_version=regressor_version(
+                ForecastFrames(
+                    building_df=None,
+                    currency_df=currency_df,
+                    inflation_df=inflation_df,
+                    nds_df=nds_df,
+                )
+            ),
+        )
+
+    def usd_at(self, year: int, month: int) -> float:
+        return self.regressors.usd_at(year, month)
+
+    def inflation_at(self, year: int) -> float:
+        return self.regressors.inflation_at(year)
+
+    def nds_at(self, year: int) -> float:
+        return self.regressors.nds_at(year)
+
+
+class ReferenceCache:
+    """
+    Кэш справочников регрессоров в памяти процесса.
+
+    Таблицы маленькие и меняются редко, поэтому держим их целиком. Не чаще раза
+    в `check_interval` секунд сверяем дешёвый штамп таблиц (count, max(id), max(xmin))
+    и перечитываем их только при его изменении. Штамп и таблицы читаются с primary:
+    иначе данные отстающей реплики остались бы в кэше под новым штампом.
+    """
+
+    def __init__(self, check_interval: float | None = None):
+        self.check_interval = (
+            settings.REFERENCE_CACHE_CHECK_SECONDS
+            if check_interval is None
+            else check_interval
+        )
+        self._tables: ReferenceTables | None = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return (
+            self._tables is not None
+            and time.monotonic() - self._checked_at < self.check_interval
+        )
+
+    async def get(
+        self,
+        currency_rate_repo: CurrencyRateModelRepository,
+        inflation_repo: InflationModelRepository,
+        nds_repo: NDSModelRepository,
+    ) -> ReferenceTables:
+        if self._fresh():
+            return self._tables
+
+        async with self._lock:
+            if self._fresh():
+                return self._tables
+
+            with primary_reads():
+                version = (
+                    await currency_rate_repo.version_stamp(),
+                    await inflation_repo.version_stamp(),
+                    await nds_repo.version_stamp(),
+                )
+                if self._tables is None or self._tables.version != version:
+                    self._tables = await asyncio.to_thread(
+                        ReferenceTables.build,
+                        version,
+                        await currency_rate_repo.get_frame(),
+                        await inflation_repo.get_frame(),
+                        await nds_repo.get_frame(),
+                    )
+                    logger.info(f"Reference tables reloaded, version {version}")
+            self._checked_at = time.monotonic()
+            return self._tables
+
+    def invalidate(self) -> None:
+        """Следующий `get` сверит штамп таблиц, не дожидаясь интервала."""
+        self._checked_at = float("-inf")
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+REGRESSORS = ("inflation_rate", "nds_factor", "usd_rate")
+
+# принудительный шаг: с 2026 НДС минимально 16%
+NDS_FLOOR_YEAR = 2026
+NDS_FLOOR_FACTOR = 1.16
+
+# -----------------------------
+# ПРОГНОЗ ПРАВИТЕЛЬСТВА
+# -----------------------------
+FUTURE_INFLATION = [
+    {"year": 2026, "inflation_rate": 0.10},  # среднее между 9–11%
+    {"year": 2027, "inflation_rate": 0.06},
+    {"year": 2028, "inflation_rate": 0.06},
+]
+
+FUTURE_CURRENCY = [
+    {"date": pd.Timestamp("2026-01-01"), "usd": 548.2},
+    {"date": pd.Timestamp("2027-01-01"), "usd": 565.0},
+]
+
+
+def month_key(dates: pd.Series) -> pd.Series:
+    """Ключ месяца вида YYYYMM для поиска по помесячным таблицам."""
+    return dates.dt.year * 100 + dates.dt.month
+
+
+@dataclass(frozen=True)
+class RegressorBuilder:
+    """
+    Векторизованное заполнение регрессоров (курс USD, инфляция, НДС).
+
+    Строится один раз на запуск из справочных таблиц и затем применяется
+    к датам любого города через `map`/`np.where` без построчных `apply`.
+    Содержит только небольшие Series, поэтому передаётся в дочерние процессы.
+    """
+
+    currency_month: pd.Series  # YYYYMM -> usd
+    currency_year: pd.Series  # год -> первый известный курс в году
+    inflation_year: pd.Series  # год -> инфляция
+    nds_year: pd.Series  # год -> множитель НДС
+    median_usd: float
+    median_inflation: float
+
+    @classmethod
+    def from_frames(
+        cls,
+        currency_df: pd.DataFrame,
+        inflation_df: pd.DataFrame,
+        nds_df: pd.DataFrame,
+    ) -> "RegressorBuilder":
+        """
+        :param currency_df: колонки `date`, `usd`.
+        :param inflation_df: колонки `year`, `inflation_rate`.
+        :param nds_df: колонки `year`, `nds_rate` (проценты).
+        """
+        currency_df = (
+            pd.concat(
+                [
+                    currency_df.astype({"date": "datetime64[ns]", "usd": "float64"}),
+                    pd.DataFrame(FUTURE_CURRENCY),
+                ]
+            )
+            .assign(key=lambda df: month_key(df["date"]))
+            .drop_duplicates("key")
+        )
+        inflation_df = pd.concat(
+            [
+                inflation_df.astype({"year": "int64", "inflation_rate": "float64"}),
+                pd.DataFrame(FUTURE_INFLATION),
+            ]
+        ).drop_duplicates("year")
+        nds_df = nds_df.astype({"year": "int64", "nds_rate": "float64"})
+
+        return cls(
+            currency_month=currency_df.set_index("key")["usd"],
+            currency_year=currency_df.groupby(currency_df["date"].dt.year)["usd"].first(),
+            inflation_year=inflation_df.set_index("year")["inflation_rate"],
+            nds_year=(
+                1.0 + nds_df.drop_duplicates("year").set_index("year")["nds_rate"] / 100.0
+            ),
+            median_usd=(
+                float(currency_df["usd"].median())
+                if not currency_df["usd"].isna().all()
+                else 1.0
+            ),
+            median_inflation=(
+                float(inflation_df["inflation_rate"].median())
+                if not inflation_df["inflation_rate"].isna().all()
+                else 0.0
+            ),
+        )
+
+    def usd_at(self, year: int, month: int) -> float:
+        """Курс на месяц: месячный, при его отсутствии — годовой, затем медиана."""
+        usd = self.currency_month.get(year * 100 + month)
+        if usd is None or pd.isna(usd):
+            usd = self.currency_year.get(year)
+        return self.median_usd if usd is None or pd.isna(usd) else float(usd)
+
+    def inflation_at(self, year: int) -> float:
+        inflation = self.inflation_year.get(year)
+        if inflation is None or pd.isna(inflation):
+            return self.median_inflation
+        return float(inflation)
+
+    def nds_at(self, year: int) -> float:
+        """Множитель НДС на год с учётом минимального уровня с `NDS_FLOOR_YEAR`."""
+        nds = self.nds_year.get(year)
+        nds = 1.0 if nds is None or pd.isna(nds) else float(nds)
+        return max(nds, NDS_FLOOR_FACTOR) if year >= NDS_FLOOR_YEAR else nds
+
+    def _inflation_and_nds(self, years: pd.Series) -> tuple[pd.Series, np.ndarray]:
+        inflation = years.map(self.inflation_year).fillna(self.median_inflation)
+        nds = years.map(self.nds_year).fillna(1.0)
+        nds = np.where(years >= NDS_FLOOR_YEAR, nds.clip(lower=NDS_FLOOR_FACTOR), nds)
+        return inflation, nds
+
+    def history(self, dates: pd.Series) -> pd.DataFrame:
+        """
+        Регрессоры для исторических дат.
+
+        Курс берётся годовой (первый в году), при его отсутствии — месячный, затем медиана.
+        """
+        years = dates.dt.year
+        usd = (
+            years.map(self.currency_year)
+            .fillna(month_key(dates).map(self.currency_month))
+            .fillna(self.median_usd)
+        )
+        inflation, nds = self._inflation_and_nds(years)
+        return pd.DataFrame(
+            {
+                "usd_rate": usd,
+                "inflation_rate": inflation,
+                "nds_factor": np.maximum(nds, 1.0),
+            },
+            index=dates.index,
+        )
+
+    def future(self, dates: pd.Series) -> pd.DataFrame:
+        """
+        Регрессоры для дат прогноза.
+
+        Курс берётся месячный, при его отсутствии — годовой, затем медиана.
+        """
+        years = dates.dt.year
+        usd = (
+            month_key(dates)
+            .map(self.currency_month)
+            .fillna(years.map(self.currency_year))
+            .fillna(self.median_usd)
+        )
+        inflation, nds = self._inflation_and_nds(years)
+        return pd.DataFrame(
+            {"usd_rate": usd, "inflation_rate": inflation, "nds_factor": nds},
+            index=dates.index,
+        )
@@ -0,0 +1,40 @@
+from datetime import date, datetime
+from uuid import UUID
+
+from pydantic import Field
+
+from app.core.enums import StatusSearchEnum
+from app.core.schemas import BaseSchema
+
+
+class ForecastJobSchema(BaseSchema):
+    job_id: UUID = Field(..., description="Идентификатор задачи прогноза")
+    status: StatusSearchEnum = Field(..., description="Статус задачи")
+    created_at: datetime = Field(..., description="Время постановки в очередь")
+    started_at: datetime | None = Field(default=None, description="Время старта")
+    finished_at: datetime | None = Field(default=None, description="Время завершения")
+    error: str | None = Field(default=None, description="Текст ошибки")
+
+
+class ForecastPointSchema(BaseSchema):
+    ds: date
+    yhat: float
+    yhat_lower: float
+    yhat_upper: float
+
+
+class CityForecastSchema(BaseSchema):
+    geo_title: str
+    forecast: list[ForecastPointSchema]
+
+
+class ForecastScenarioSchema(BaseSchema):
+    periods: int | None = Field(
+        default=None, ge=1, le=240, description="Горизонт прогноза в месяцах"
+    )
+    usd_rate: float | None = Field(default=None, gt=0, description="Курс USD/KZT")
+    inflation_rate: float | None = Field(default=None, description="Инфляция")
+    nds_factor: float | None = Field(default=None, gt=0, description="Множитель НДС")
+
+    def overrides(self) -> dict[str, float]:
+        return self.model_dump(exclude={"periods"}, exclude_none=True)
@@ -0,0 +1,348 @@
+import asyncio
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import replace
+from typing import Annotated
+from uuid import UUID, uuid4
+
+import pandas as pd
+from fastapi import Depends
+
+from app.core import logger, settings
+from app.core.enums import FingerprintStatusEnum, StatusSearchEnum
+from app.domain.analise.cache import (
+    fresh_reads,
+    invalidate_analytics_cache,
+    versioned_key,
+)
+from app.domain.forecast.engine import (
+    ForecastEngine,
+    CityForecastResult,
+    CityForecastTask,
+    predict_city_forecast,
+)
+from app.domain.forecast.reference import reference_cache
+from app.domain.forecast.regressors import REGRESSORS
+from app.domain.forecast.schemas import (
+    CityForecastSchema,
+    ForecastJobSchema,
+    ForecastPointSchema,
+)
+from app.domain.forecast.preparation import (
+    ForecastFrames,
+    build_forecast_tasks,
+    build_regressor_builder,
+    compute_fingerprints,
+)
+from app.infrastructure.db.repositories.building_analisation import (
+    BuildingAnalisationModelRepository,
+)
+from app.infrastructure.db.repositories.building_forecast import (
+    BuildingForecastModelRepository,
+)
+from app.infrastructure.db.repositories.currency_rate import CurrencyRateModelRepository
+from app.infrastructure.db.repositories.forecast_fingerprint import (
+    ForecastFingerprintModelRepository,
+)
+from app.infrastructure.db.repositories.forecast_run import ForecastRunModelRepository
+from app.infrastructure.db.repositories.inflation import InflationModelRepository
+from app.infrastructure.db.repositories.nds import NDSModelRepository
+from app.infrastructure.adapters.redis import redis_adapter
+from app.infrastructure.db.sessions import UnitOfWork, get_unit_of_work
+from app.infrastructure.model_store import get_model_store
+
+
+class ForecastService:
+    def __init__(
+        self,
+        build_analis_repo: Annotated[BuildingAnalisationModelRepository, Depends()],
+        currency_rate_repo: Annotated[CurrencyRateModelRepository, Depends()],
+        building_forecast_repo: Annotated[BuildingForecastModelRepository, Depends()],
+        inflation_repo: Annotated[InflationModelRepository, Depends()],
+        nds_repo: Annotated[NDSModelRepository, Depends()],
+        fingerprint_repo: Annotated[ForecastFingerprintModelRepository, Depends()],
+        run_repo: Annotated[ForecastRunModelRepository, Depends()],
+        uow: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+    ):
+        self.build_analis_repo = build_analis_repo
+        self.currency_rate_repo = currency_rate_repo
+        self.building_forecast_repo = building_forecast_repo
+        self.inflation_repo = inflation_repo
+        self.nds_repo = nds_repo
+        self.fingerprint_repo = fingerprint_repo
+        self.run_repo = run_repo
+        self.uow = uow
+
+    async def predict(
+        self,
+        force: bool = False,
+        run_id: UUID | None = None,
+        max_workers: int | None = None,
+    ) -> dict:
+        """
+        Переобучает модели городов, история которых изменилась с прошлого запуска.
+
+        Прогнозы всех городов запуска копируются во временную таблицу по мере готовности
+        и переносятся в `building_forecast` одной транзакцией в конце запуска.
+
+        :param force: переобучить все города, не сверяя отпечатки истории.
+        :param run_id: идентификатор запуска (по умолчанию генерируется).
+        :param max_workers: размер пула процессов (по умолчанию из настроек).
+        """
+        run_id = run_id or uuid4()
+        await self.run_repo.start(run_id, params=self._run_params(force))
+        await self.uow.commit()
+        try:
+            return await self._predict(run_id, force, max_workers)
+        except Exception as e:
+            await self.uow.rollback()
+            await self.run_repo.fail(run_id, error=f"{type(e).__name__}: {e}")
+            await self.uow.commit()
+            raise
+
+    async def _predict(
+        self, run_id: UUID, force: bool, max_workers: int | None
+    ) -> dict:
+        # 1. Получаем исторические данные сразу в DataFrame (колонками, без ORM, один снимок)
+        frames = await self._load_frames()
+
+        # 2. Отпечатки и задачи по городам (pandas — вне event loop)
+        fingerprints = await asyncio.to_thread(compute_fingerprints, frames)
+        data_fingerprint = self._data_fingerprint(fingerprints)
+
+        # 3. Отбираем города, у которых изменился отпечаток истории
+        stored = await self.fingerprint_repo.get_map()
+        changed = {
+            geo
+            for geo, fingerprint in fingerprints.items()
+            if force or not self._same_fingerprint(stored.get(geo), fingerprint)
+        }
+        logger.info(
+            f"Forecast: {len(changed)} of {len(fingerprints)} geos changed (force={force})"
+        )
+        if not changed:
+            await self.run_repo.finish(
+                run_id, StatusSearchEnum.NO_DATA, cities=0, data_fingerprint=data_fingerprint
+            )
+            await self.uow.commit()
+            return {}
+
+        store = get_model_store()
+        tasks = await asyncio.to_thread(
+            build_forecast_tasks, frames, settings.FORECAST_PERIODS, changed, store
+        )
+        if not settings.FORECAST_WARM_START:
+            tasks = [replace(task, warm_start=False) for task in tasks]
+
+        # города с короткой историей отмечаем, чтобы не готовить их заново на каждом запуске
+        for geo in changed - {task.geo for task in tasks}:
+            await self.fingerprint_repo.upsert(
+                {
+                    **fingerprints[geo],
+                    "status": FingerprintStatusEnum.SKIPPED.value,
+                    "error": "Not enough historical points",
+                }
+            )
+
+        # 4. Прогноз по городам в пуле процессов, копируем в staging по мере готовности
+        forecasts_result = {}
+        await self.building_forecast_repo.create_staging()
+        async for result in ForecastEngine(max_workers=max_workers).run(tasks):
+            if result.error:
+                logger.error(f"Forecast for {result.geo_title} failed: {result.error}")
+                # при тех же данных обучение упадёт снова, повтор — после их изменения или force
+                await self.fingerprint_repo.upsert(
+                    {
+                        **fingerprints[result.geo],
+                        "status": FingerprintStatusEnum.FAILED.value,
+                        "error": result.error,
+                    }
+                )
+                continue
+
+            await self.building_forecast_repo.copy_to_staging(
+                run_id, result.geo, result.geo_title, result.forecast
+            )
+            await self.fingerprint_repo.upsert(
+                {
+                    **fingerprints[result.geo],
+                    "run_id": run_id,
+                    "status": FingerprintStatusEnum.FITTED.value,
+                    "error": None,
+                }
+            )
+            forecasts_result[result.geo_title] = result.forecast.to_dict(
+                orient="records"
+            )
+
+        # 5. Одна транзакция на запуск: прогнозы + отпечатки + статус запуска
+        await self.run_repo.finish(
+            run_id,
+            StatusSearchEnum.COMPLETED if forecasts_result else StatusSearchEnum.NO_DATA,
+            cities=len(forecasts_result),
+            data_fingerprint=data_fingerprint,
+        )
+        saved = await self.building_forecast_repo.merge_staging(run_id)
+        await self.uow.commit()
+        logger.info(f"Forecast run {run_id}: saved {saved} rows")
+        await invalidate_analytics_cache()
+
+        pruned = await self.run_repo.prune(keep=settings.FORECAST_RUN_RETENTION)
+        await self.uow.commit()
+        if pruned:
+            logger.info(f"Pruned {pruned} old forecast runs")
+
+        await asyncio.to_thread(store.evict)
+        return forecasts_result
+
+    async def get_run(self, run_id: UUID) -> ForecastJobSchema:
+        run = await self.run_repo.get_by_id(run_id)
+        return ForecastJobSchema(
+            job_id=run.id,
+            status=run.status,
+            created_at=run.created_at,
+            started_at=run.started_at,
+            finished_at=run.finished_at,
+            error=run.error,
+        )
+
+    async def get_run_result(self, run_id: UUID) -> list[CityForecastSchema]:
+        forecasts = await self.building_forecast_repo.get_by_run(run_id)
+        by_city: dict[str, list[ForecastPointSchema]] = defaultdict(list)
+        for f in forecasts:
+            by_city[f.geo_title].append(
+                ForecastPointSchema(
+                    ds=f.forecast_date,
+                    yhat=f.forecast_kzt,
+                    yhat_lower=f.lower_bound_kzt,
+                    yhat_upper=f.upper_bound_kzt,
+                )
+            )
+        return [
+            CityForecastSchema(geo_title=geo_title, forecast=points)
+            for geo_title, points in by_city.items()
+        ]
+
+    async def predict_cached(
+        self,
+        periods: int | None = None,
+        overrides: dict[str, float] | None = None,
+        max_workers: int | None = None,
+    ) -> dict:
+        """
+        Строит прогноз по сохранённым моделям без переобучения.
+
+        :param periods: горизонт прогноза в месяцах (по умолчанию из настроек).
+        :param overrides: значения регрессоров на будущих датах для сценарного прогноза.
+        """
+        periods = periods or settings.FORECAST_PERIODS
+        # результат сценария не меняется до следующего запуска прогноза (версия кэша)
+        cache_key = await versioned_key(
+            "predict:" + json.dumps({"periods": periods, **(overrides or {})}, sort_keys=True)
+        )
+        cached = await redis_adapter.get_frame(cache_key) if cache_key else None
+        if cached is not None:
+            return {
+                geo_title: frame.drop(columns="geo_title").to_dict(orient="records")
+                for geo_title, frame in cached.groupby("geo_title", sort=False)
+            }
+
+        with fresh_reads():
+            frames = await self._load_frames(with_history=False)
+            fingerprints = await self.fingerprint_repo.get_map()
+
+        builder = await asyncio.to_thread(build_regressor_builder, frames)
+
+        store = get_model_store()
+        tasks = [
+            CityForecastTask(
+                geo=geo,
+                geo_title=fingerprint.geo_title,
+                regressors=builder,
+                periods=periods,
+                store=store,
+                overrides=overrides,
+            )
+            for geo, fingerprint in fingerprints.items()
+            if fingerprint.run_id is not None
+        ]
+
+        forecasts = {}
+        engine = ForecastEngine(max_workers=max_workers)
+        async for result in engine.run(tasks, func=predict_city_forecast):
+            if result.error:
+                logger.warning(
+                    f"Cached forecast for {result.geo_title} skipped: {result.error}"
+                )
+                continue
+            forecasts[result.geo_title] = result.forecast
+
+        if cache_key and forecasts:
+            await redis_adapter.set_frame(
+                cache_key,
+                pd.concat(
+                    [f.assign(geo_title=geo_title) for geo_title, f in forecasts.items()],
+                    ignore_index=True,
+                ),
+                ttl=settings.CACHE_TTL,
+            )
+        return {
+            geo_title: forecast.to_dict(orient="records")
+            for geo_title, forecast in forecasts.items()
+        }
+
+    async def _load_frames(self, with_history: bool = True) -> ForecastFrames:
+        """
+        Справочники из `reference_cache`, история одним снимком БД (REPEATABLE READ, READ ONLY).
+
+        Справочники читаются до снимка: кэш сверяет их версию с primary, и снимок
+        на реплике для них не открывается.
+        """
+        in_transaction = self.uow.session.in_transaction()
+        reference = await reference_cache.get(
+            self.currency_rate_repo, self.inflation_repo, self.nds_repo
+        )
+        if not in_transaction:
+            # завершаем чтения справочников, чтобы снимок открыл свою транзакцию
+            await self.uow.commit()
+        building_df = None
+        if with_history:
+            async with self.uow.snapshot():
+                building_df = await self.build_analis_repo.get_monthly_frame()
+        return ForecastFrames(
+            building_df=building_df,
+            currency_df=reference.currency_df,
+            inflation_df=reference.inflation_df,
+            nds_df=reference.nds_df,
+            regressors=reference.regressors,
+            regressor_version=reference.regressor_version,
+        )
+
+    @staticmethod
+    def _run_params(force: bool) -> dict:
+        return {
+            "force": force,
+            "periods": settings.FORECAST_PERIODS,
+            "warm_start": settings.FORECAST_WARM_START,
+            "yearly_seasonality": True,
+            "regressors": list(REGRESSORS),
+        }
+
+    @staticmethod
+    def _data_fingerprint(fingerprints: dict[int, dict]) -> str:
+        digest = hashlib.sha256()
+        for geo in sorted(fingerprints):
+            fingerprint = fingerprints[geo]
+            digest.update(
+                f"{geo}:{fingerprint['values_hash']}:{fingerprint['regressor_version']}".encode()
+            )
+        return digest.hexdigest()
+
+    @staticmethod
+    def _same_fingerprint(stored, fingerprint: dict) -> bool:
+        return stored is not None and all(
+            getattr(stored, key) == value
+            for key, value in fingerprint.items()
+            if key != "geo_title"
+        )
@@ -0,0 +1,78 @@
+from app.core import logger, settings
+from app.core.metrics import KRISHA_INGEST_SKIPPED
+from app.domain.analise.cache import invalidate_analytics_cache
+from app.domain.parser.validation import validate_rows
+from app.infrastructure.db.repositories.building_analisation import (
+    BuildingAnalisationModelRepository,
+)
+from app.infrastructure.db.repositories.krisha_fetch_state import (
+    KrishaFetchStateModelRepository,
+)
+from app.infrastructure.db.repositories.krisha_quarantine import (
+    KrishaQuarantineModelRepository,
+)
+from app.infrastructure.db.sessions import UnitOfWork
+from app.infrastructure.krisha_crawler import (
+    CrawlStats,
+    KrishaCrawler,
+    KrishaSegment,
+    build_segments,
+)
+from app.infrastructure.payload_archive import get_payload_archive
+
+
+async def ingest_krisha(uow: UnitOfWork) -> CrawlStats:
+    """
+    Загружает изменившиеся срезы krisha и сохраняет строки каждого среза по мере получения.
+
+    Регионы берутся из настроек, иначе — вся страна (id=0) и уже известные регионы.
+    Строки, не прошедшие валидацию `KrishaRow`, сохраняются в `krisha_quarantine`.
+    Каждый срез фиксируется отдельным commit, чтобы сбой не откатывал уже загруженные.
+    Ошибка записи среза откатывает только его: срез учитывается в `stats.failed`,
+    его состояние запроса не обновляется, и он будет загружен заново в следующий раз.
+    После записи обновляется представление помесячных агрегатов.
+    Если ни одна строка не изменилась, запуск учитывается в `KRISHA_INGEST_SKIPPED`.
+    """
+    build_analis_repo = BuildingAnalisationModelRepository(uow.session)
+    fetch_state_repo = KrishaFetchStateModelRepository(uow.session)
+    quarantine_repo = KrishaQuarantineModelRepository(uow.session)
+
+    geos = settings.KRISHA_REGION_IDS or [0, *await build_analis_repo.get_geos()]
+    states = await fetch_state_repo.get_map()
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0}
+
+    async def sink(segment: KrishaSegment, rows: list[dict]) -> None:
+        valid, rejected = validate_rows(rows)
+        try:
+            if rejected:
+                await quarantine_repo.add_many(segment.key, rejected)
+            written = await build_analis_repo.upsert_many(valid)
+            await uow.commit()
+        except Exception:
+            # иначе сессия останется в прерванной транзакции и упадут все следующие срезы
+            await uow.rollback()
+            build_analis_repo.forget_partitions()
+            raise  # KrishaCrawler учтёт срез как неудачный
+
+        if rejected:
+            logger.warning(f"Krisha segment {segment.key}: {len(rejected)} rows rejected")
+            counts["rejected"] += len(rejected)
+        for key, value in written.items():
+            counts[key] += value
+
+    crawler = KrishaCrawler(archive=get_payload_archive())
+    stats = await crawler.crawl(build_segments(geos), sink, states=states)
+    await fetch_state_repo.upsert_many(stats.states)
+    await uow.commit()
+    stats.written = counts["inserted"] + counts["updated"]
+    logger.info(f"Krisha ingest: {counts}")
+
+    if stats.written:
+        await build_analis_repo.refresh_monthly()
+        await uow.commit()
+        await invalidate_analytics_cache()
+    elif not stats.failed:
+        KRISHA_INGEST_SKIPPED.inc()
+        logger.info("Krisha ingest skipped: no segment changed")
+    return stats
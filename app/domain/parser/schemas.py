@@ -0,0 +1,42 @@
+from datetime import date
+from typing import Annotated, Any
+
+from pydantic import BeforeValidator
+from typing_extensions import NotRequired, TypedDict
+
+
+def _empty_to_none(value: Any) -> Any:
+    return None if value == "" else value
+
+
+def _str_or_none(value: Any) -> str | None:
+    return None if value is None or value == "" else str(value)
+
+
+OptionalInt = Annotated[int | None, BeforeValidator(_empty_to_none)]
+OptionalFloat = Annotated[float | None, BeforeValidator(_empty_to_none)]
+OptionalDate = Annotated[date | None, BeforeValidator(_empty_to_none)]
+OptionalStr = Annotated[str | None, BeforeValidator(_str_or_none)]
+
+
+class KrishaRow(TypedDict):
+    """
+    Строка аналитики krisha после валидации (поля как в `building_analisation`).
+
+    TypedDict, а не модель: pydantic-core отдаёт сразу dict, который уходит в COPY.
+    """
+
+    geo: int
+    geo_title: str
+    last_updated: date
+    created_at: NotRequired[OptionalDate]
+    average: NotRequired[OptionalInt]
+    average_kzt: NotRequired[OptionalInt]
+    rate_kzt: NotRequired[OptionalFloat]
+    calculated: NotRequired[OptionalInt]
+    total: NotRequired[OptionalInt]
+    rooms: NotRequired[OptionalStr]
+    building: NotRequired[OptionalStr]
+    min_average: NotRequired[OptionalFloat]
+    max_rate: NotRequired[OptionalFloat]
+    value_on_axis: NotRequired[OptionalFloat]
@@ -0,0 +1,39 @@
+from collections import defaultdict
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.domain.parser.schemas import KrishaRow
+
+# схема компилируется в pydantic-core один раз на процесс
+KRISHA_ROWS_ADAPTER = TypeAdapter(list[KrishaRow])
+
+
+def validate_rows(rows: list[Any]) -> tuple[list[KrishaRow], list[dict]]:
+    """
+    Валидирует и приводит типы целого ответа krisha за один вызов pydantic-core.
+
+    :return: валидные строки и отклонённые строки вида `{"payload", "reasons"}`.
+    """
+    try:
+        return KRISHA_ROWS_ADAPTER.validate_python(rows), []
+    except ValidationError as e:
+        reasons: dict[int, list[dict]] = defaultdict(list)
+        for error in e.errors(include_url=False, include_input=False):
+            index, *field = error["loc"]
+            reasons[index].append(
+                {
+                    "field": ".".join(map(str, field)),
+                    "type": error["type"],
+                    "message": error["msg"],
+                }
+            )
+
+    valid = KRISHA_ROWS_ADAPTER.validate_python(
+        [row for index, row in enumerate(rows) if index not in reasons]
+    )
+    rejected = [
+        {"payload": rows[index], "reasons": row_reasons}
+        for index, row_reasons in reasons.items()
+    ]
+    return valid, rejected
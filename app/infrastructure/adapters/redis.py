@@ -1,13 +1,220 @@
-from redis import Redis
+import time
+from decimal import Decimal
+from typing import Any
 
-from app.core import settings
+import orjson
+import pandas as pd
+from redis.asyncio import ConnectionPool, Redis, RedisError
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
+from app.core import logger, settings
 
-def redis():
-    return Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(
+        value,
+        default=_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def loads(value: bytes) -> Any:
+    return orjson.loads(value)
+
+
+def dump_frame(frame: pd.DataFrame) -> bytes:
+    """Сериализует DataFrame по колонкам с сохранением dtypes (числовые колонки — как numpy)."""
+    data = {}
+    for column in frame.columns:
+        series = frame[column]
+        if series.dtype.kind in "iufb":
+            data[column] = series.to_numpy()
+        elif series.dtype.kind == "M":
+            data[column] = series.dt.as_unit("ns").astype("int64").to_numpy()
+        else:
+            data[column] = series.tolist()
+    return dumps(
+        {
+            "columns": list(frame.columns),
+            "dtypes": {column: str(dtype) for column, dtype in frame.dtypes.items()},
+            "data": data,
+        }
     )
 
 
-r = redis()
+def load_frame(value: bytes) -> pd.DataFrame:
+    payload = loads(value)
+    dtypes = payload["dtypes"]
+    return pd.DataFrame(
+        {
+            column: (
+                pd.to_datetime(payload["data"][column], unit="ns")
+                if dtypes[column].startswith("datetime64")
+                else payload["data"][column]
+            )
+            for column in payload["columns"]
+        },
+        columns=payload["columns"],
+    ).astype(dtypes)
+
+
+class RedisAdapter:
+    """
+    Асинхронный клиент Redis на общем пуле соединений.
+
+    Пул создаётся лениво (при первом обращении или в lifespan приложения), поэтому
+    импорт модуля не открывает соединений. Кэш работает по принципу best-effort:
+    ошибки Redis пишутся в лог и считаются промахом кэша.
+
+    После ошибки соединения или таймаута кэш пропускается на `REDIS_RETRY_SECONDS`,
+    чтобы при недоступном Redis запросы не ждали таймаут сокета каждый раз.
+    `incr` (инвалидация кэша) выполняется всегда.
+    """
+
+    def __init__(self):
+        self._client: Redis | None = None
+        self._retry_at = 0.0
+
+    @property
+    def client(self) -> Redis:
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    @staticmethod
+    def _create_client() -> Redis:
+        if settings.REDIS_FAKE:
+            from fakeredis import FakeAsyncRedis
+
+            return FakeAsyncRedis()
+
+        pool = ConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            health_check_interval=30,
+        )
+        return Redis(connection_pool=pool)
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def _failed(self, operation: str, error: RedisError) -> None:
+        if isinstance(error, (RedisConnectionError, RedisTimeoutError)):
+            self._retry_at = time.monotonic() + settings.REDIS_RETRY_SECONDS
+            logger.warning(
+                f"Redis {operation} failed, cache skipped for "
+                f"{settings.REDIS_RETRY_SECONDS}s: {error}"
+            )
+        else:
+            logger.warning(f"Redis {operation} failed: {error}")
+
+    async def connect(self) -> None:
+        """Создаёт пул и проверяет доступность Redis (недоступность не фатальна)."""
+        try:
+            await self.client.ping()
+        except RedisError as e:
+            self._failed("ping on startup", e)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, key: str) -> Any | None:
+        if not self.available:
+            return None
+        try:
+            value = await self.client.get(key)
+        except RedisError as e:
+            self._failed(f"get {key}", e)
+            return None
+        return loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        if not self.available:
+            return
+        try:
+            await self.client.set(key, dumps(value), ex=ttl)
+        except RedisError as e:
+            self._failed(f"set {key}", e)
+
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        if not keys:
+            return []
+        if not self.available:
+            return [None] * len(keys)
+        try:
+            values = await self.client.mget(keys)
+        except RedisError as e:
+            self._failed("mget", e)
+            return [None] * len(keys)
+        return [loads(value) if value is not None else None for value in values]
+
+    async def set_many(self, values: dict[str, Any], ttl: int | None = None) -> None:
+        """Записывает несколько ключей за один запрос к Redis."""
+        if not values or not self.available:
+            return
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.set(key, dumps(value), ex=ttl)
+                await pipe.execute()
+        except RedisError as e:
+            self._failed("pipeline set", e)
+
+    async def get_frame(self, key: str) -> pd.DataFrame | None:
+        if not self.available:
+            return None
+        try:
+            value = await self.client.get(key)
+        except RedisError as e:
+            self._failed(f"get {key}", e)
+            return None
+        return load_frame(value) if value is not None else None
+
+    async def set_frame(
+        self, key: str, frame: pd.DataFrame, ttl: int | None = None
+    ) -> None:
+        if not self.available:
+            return
+        try:
+            await self.client.set(key, dump_frame(frame), ex=ttl)
+        except RedisError as e:
+            self._failed(f"set {key}", e)
+
+    async def get_int(self, key: str) -> int | None:
+        """Значение счётчика (0, если ключа нет), None — если Redis недоступен."""
+        if not self.available:
+            return None
+        try:
+            return int(await self.client.get(key) or 0)
+        except RedisError as e:
+            self._failed(f"get {key}", e)
+            return None
+
+    async def incr(self, key: str) -> int | None:
+        try:
+            value = await self.client.incr(key)
+            # Redis снова доступен, паузу можно не дожидаться
+            self._retry_at = 0.0
+            return value
+        except RedisError as e:
+            self._failed(f"incr {key}", e)
+            return None
+
+
+redis_adapter = RedisAdapter()
@@ -0,0 +1,124 @@
+import hashlib
+import re
+import time
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core import logger
+from app.core.metrics import DB_QUERY_DURATION, DB_QUERY_ROWS, DB_SLOW_QUERIES
+from app.core.settings import settings
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+# месячные партиции (`building_analisation_y2026m10`), иначе новая метка каждый месяц
+_PARTITION = re.compile(r"(?<=\w)_y\d{4}m\d{1,2}\b")
+_CAST = re.compile(r"::\s*\w+(?:\[\])?")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|(?<![:\w]):\w+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+_OPERATION = re.compile(r"\b(SELECT|INSERT|UPDATE|DELETE|CREATE|ALTER|DROP|REFRESH|TRUNCATE|COPY)\b", re.IGNORECASE)
+_TARGET = {
+    "INSERT": re.compile(r"\bINTO\s+([\w.\"]+)", re.IGNORECASE),
+    "UPDATE": re.compile(r"\bUPDATE\s+([\w.\"]+)", re.IGNORECASE),
+    "DELETE": re.compile(r"\bDELETE\s+FROM\s+([\w.\"]+)", re.IGNORECASE),
+}
+_SOURCE = re.compile(
+    r"\b(?:FROM|TABLE|VIEW)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?(?:CONCURRENTLY\s+)?([\w.\"?]+)",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """
+    SQL with literals and bind parameters replaced by `?`.
+
+    Parameter lists of any length (`IN (...)`, multi-row `VALUES`) collapse to one
+    `(...)`, so a bulk insert of 10 or 1000 rows is the same statement. Monthly
+    partition suffixes become `_y?m?`, so DDL on every new partition is one statement.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING.sub("?", normalized)
+    normalized = _CAST.sub("", normalized)
+    normalized = _PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _PARTITION.sub("_y?m?", normalized)
+    normalized = _IN_LIST.sub("(...)", normalized)
+    return _VALUES_LIST.sub(r"\1", normalized)
+
+
+@lru_cache(maxsize=2048)
+def statement_label(statement: str) -> str:
+    """
+    Short metric label of a statement: operation, main table and a hash of its
+    normalized text, e.g. `SELECT building_analisation #3f9c1a2b`.
+    """
+    normalized = normalize_statement(statement)
+    # WITH ... INSERT/UPDATE/DELETE помечается по изменяющему оператору
+    operations = [m.upper() for m in _OPERATION.findall(normalized)]
+    operation = next(
+        (op for op in operations if op in _TARGET), operations[0] if operations else None
+    )
+    table = (_TARGET.get(operation) or _SOURCE).search(normalized)
+    digest = hashlib.blake2b(normalized.encode(), digest_size=4).hexdigest()
+    return " ".join(
+        part
+        for part in (operation, table.group(1).strip('"') if table else None, f"#{digest}")
+        if part
+    )
+
+
+def parameters_shape(parameters: Any, executemany: bool = False) -> str:
+    """Types of bind parameters without their values, e.g. `3 x (int, str, date)`."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {parameters_shape(rows[0])}" if rows else "0 x ()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def instrument_queries(engine: AsyncEngine, name: str = "primary") -> None:
+    """
+    Record latency and row counts of every statement run through the engine.
+
+    Costs two `perf_counter` calls and a cached normalization per statement.
+    Statements slower than DB_SLOW_QUERY_MS are logged with the shape of their
+    parameters (types only, never values). COPY through the raw asyncpg
+    connection bypasses the engine and is not recorded.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        label = statement_label(statement)
+        DB_QUERY_DURATION.labels(name, label).observe(duration)
+
+        rows = getattr(cursor, "rowcount", -1)
+        if rows is not None and rows >= 0:
+            DB_QUERY_ROWS.labels(name, label).observe(rows)
+
+        if duration * 1000 > settings.DB_SLOW_QUERY_MS:
+            DB_SLOW_QUERIES.labels(name, label).inc()
+            logger.warning(
+                f"[SQL] slow query {duration * 1000:.1f}ms on {name}, rows={rows}, "
+                f"params={parameters_shape(parameters, executemany)}: "
+                f"{normalize_statement(statement)}"
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        starts = context.connection.info.get("query_start_time") if context.connection else None
+        if starts:
+            starts.pop()
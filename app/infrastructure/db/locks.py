@@ -0,0 +1,41 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+
+from app.infrastructure.db.sessions import engine
+
+
+@asynccontextmanager
+async def advisory_lock(key: int, wait: bool = True) -> AsyncIterator[bool]:
+    """
+    Hold a PostgreSQL session-level advisory lock on a dedicated primary connection.
+
+    The lock is shared by all processes using the database, so it serializes work
+    across workers. It is not tied to a transaction: the code inside may commit
+    as often as it needs. With `wait=False` the lock is only tried; the context
+    yields whether it was acquired.
+    """
+    async with engine.connect() as connection:
+        if wait:
+            await connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+            acquired = True
+        else:
+            acquired = await connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": key}
+            )
+        # блокировка сессионная, транзакцию не держим открытой
+        await connection.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    await connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": key}
+                    )
+                    await connection.commit()
+                except BaseException:
+                    # соединение с неснятой блокировкой не возвращается в пул
+                    await connection.invalidate()
+                    raise
@@ -0,0 +1,39 @@
+"""[ADD] added model forecast_fingerprint
+
+Revision ID: 4e1a7c2d9b10
+Revises: 35b30bca2347
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e1a7c2d9b10'
+down_revision: Union[str, Sequence[str], None] = '35b30bca2347'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('forecast_fingerprint',
+    sa.Column('geo', sa.Integer(), nullable=False),
+    sa.Column('geo_title', sa.String(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('max_last_updated', sa.Date(), nullable=True),
+    sa.Column('values_hash', sa.String(length=64), nullable=False),
+    sa.Column('regressor_version', sa.String(length=64), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('geo')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('forecast_fingerprint')
@@ -0,0 +1,36 @@
+"""[UPD] building_forecast run_id and created_at
+
+Revision ID: 7b3f0e5a1c42
+Revises: 4e1a7c2d9b10
+Create Date: 2026-10-18 11:02:17.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3f0e5a1c42'
+down_revision: Union[str, Sequence[str], None] = '4e1a7c2d9b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('building_forecast', sa.Column('run_id', sa.UUID(), nullable=True))
+    op.add_column('building_forecast', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.create_unique_constraint(
+        'uq_building_forecast_geo_forecast_date_run_id',
+        'building_forecast',
+        ['geo', 'forecast_date', 'run_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_building_forecast_geo_forecast_date_run_id', 'building_forecast', type_='unique')
+    op.drop_column('building_forecast', 'created_at')
+    op.drop_column('building_forecast', 'run_id')
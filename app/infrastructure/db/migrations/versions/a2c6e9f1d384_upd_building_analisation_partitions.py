@@ -0,0 +1,187 @@
+"""[UPD] building_analisation partitioned by last_updated month, BRIN indexes
+
+Revision ID: a2c6e9f1d384
+Revises: f7b3d5e90a26
+Create Date: 2026-10-18 18:05:33.214907
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c6e9f1d384'
+down_revision: Union[str, Sequence[str], None] = 'f7b3d5e90a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# секции на несколько месяцев вперёд, дальше их создаёт приложение
+MONTHS_AHEAD = 3
+# строки без даты: ключ секционирования входит в первичный ключ и не может быть NULL
+UNDATED_TABLE = "building_analisation_undated"
+
+COLUMNS = (
+    "id, geo, geo_title, average, average_kzt, rate_kzt, calculated, total, rooms, "
+    "building, last_updated, created_at, min_average, max_rate, value_on_axis"
+)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def rename_old_table() -> None:
+    op.execute("ALTER TABLE building_analisation RENAME TO building_analisation_old")
+    op.execute(
+        "ALTER TABLE building_analisation_old "
+        "RENAME CONSTRAINT building_analisation_pkey TO building_analisation_old_pkey"
+    )
+    op.execute(
+        "ALTER TABLE building_analisation_old "
+        "RENAME CONSTRAINT uq_building_analisation_segment TO uq_building_analisation_old_segment"
+    )
+    op.execute(
+        "ALTER INDEX ix_building_analisation_geo_last_updated_id "
+        "RENAME TO ix_building_analisation_old_geo_last_updated_id"
+    )
+    # последовательность id переходит к новой таблице
+    op.execute("ALTER SEQUENCE building_analisation_id_seq OWNED BY NONE")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rename_old_table()
+    op.execute(
+        """
+        CREATE TABLE building_analisation (
+            id integer NOT NULL DEFAULT nextval('building_analisation_id_seq'),
+            geo integer,
+            geo_title varchar,
+            average integer,
+            average_kzt integer,
+            rate_kzt double precision,
+            calculated integer,
+            total integer,
+            rooms varchar,
+            building varchar,
+            last_updated date NOT NULL,
+            created_at date,
+            min_average double precision,
+            max_rate double precision,
+            value_on_axis double precision,
+            CONSTRAINT building_analisation_pkey PRIMARY KEY (id, last_updated),
+            CONSTRAINT uq_building_analisation_segment
+                UNIQUE NULLS NOT DISTINCT (geo_title, last_updated, created_at, rooms, building)
+        ) PARTITION BY RANGE (last_updated)
+        """
+    )
+    op.execute("ALTER SEQUENCE building_analisation_id_seq OWNED BY building_analisation.id")
+
+    bind = op.get_bind()
+    first, last = bind.execute(
+        sa.text(
+            "SELECT min(last_updated), max(last_updated) FROM building_analisation_old"
+        )
+    ).one()
+    current = date.today().replace(day=1)
+    month = min(first or current, current).replace(day=1)
+    end = add_months(max(last or current, current).replace(day=1), MONTHS_AHEAD)
+    while month <= end:
+        op.execute(
+            f"""
+            CREATE TABLE building_analisation_y{month.year}m{month.month:02d}
+            PARTITION OF building_analisation
+            FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')
+            """
+        )
+        month = add_months(month, 1)
+
+    op.execute(
+        f"""
+        INSERT INTO building_analisation ({COLUMNS})
+        SELECT {COLUMNS} FROM building_analisation_old
+        WHERE last_updated IS NOT NULL
+        """
+    )
+    # строки без даты не попадали ни в историю, ни в прогноз; downgrade вернёт их
+    op.execute(
+        f"""
+        CREATE TABLE {UNDATED_TABLE} AS
+        SELECT {COLUMNS} FROM building_analisation_old
+        WHERE last_updated IS NULL
+        """
+    )
+    op.drop_table('building_analisation_old')
+
+    op.create_index(
+        'ix_building_analisation_geo_last_updated_id',
+        'building_analisation',
+        ['geo', 'last_updated', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_building_analisation_last_updated_brin',
+        'building_analisation',
+        ['last_updated'],
+        unique=False,
+        postgresql_using='brin',
+    )
+    op.create_index(
+        'ix_building_analisation_created_at_brin',
+        'building_analisation',
+        ['created_at'],
+        unique=False,
+        postgresql_using='brin',
+    )
+    op.execute("ANALYZE building_analisation")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    rename_old_table()
+    op.execute(
+        """
+        CREATE TABLE building_analisation (
+            id integer NOT NULL DEFAULT nextval('building_analisation_id_seq'),
+            geo integer,
+            geo_title varchar,
+            average integer,
+            average_kzt integer,
+            rate_kzt double precision,
+            calculated integer,
+            total integer,
+            rooms varchar,
+            building varchar,
+            last_updated date,
+            created_at date,
+            min_average double precision,
+            max_rate double precision,
+            value_on_axis double precision,
+            CONSTRAINT building_analisation_pkey PRIMARY KEY (id),
+            CONSTRAINT uq_building_analisation_segment
+                UNIQUE NULLS NOT DISTINCT (geo_title, last_updated, created_at, rooms, building)
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE building_analisation_id_seq OWNED BY building_analisation.id")
+    op.execute(
+        f"""
+        INSERT INTO building_analisation ({COLUMNS})
+        SELECT {COLUMNS} FROM building_analisation_old
+        UNION ALL
+        SELECT {COLUMNS} FROM {UNDATED_TABLE}
+        """
+    )
+    # удаляет и все секции
+    op.drop_table('building_analisation_old')
+    op.drop_table(UNDATED_TABLE)
+    op.create_index(
+        'ix_building_analisation_geo_last_updated_id',
+        'building_analisation',
+        ['geo', 'last_updated', 'id'],
+        unique=False,
+    )
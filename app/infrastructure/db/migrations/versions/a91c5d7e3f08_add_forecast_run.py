@@ -0,0 +1,109 @@
+"""[ADD] added model forecast_run
+
+Revision ID: a91c5d7e3f08
+Revises: 7b3f0e5a1c42
+Create Date: 2026-10-18 12:26:03.114452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91c5d7e3f08'
+down_revision: Union[str, Sequence[str], None] = '7b3f0e5a1c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('forecast_run',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('params', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('data_fingerprint', sa.String(length=64), nullable=True),
+    sa.Column('cities', sa.Integer(), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # старые запуски дописывали строки к прежним: в один "исторический" запуск
+    # переносим только последний прогноз по каждой паре (geo, forecast_date).
+    # created_at у этих строк одинаковый (заполнен при добавлении колонки),
+    # поэтому разделить их на отдельные запуски нельзя
+    op.execute(
+        """
+        DELETE FROM building_forecast b
+        USING building_forecast newer
+        WHERE b.run_id IS NULL
+          AND newer.run_id IS NULL
+          AND newer.geo = b.geo
+          AND newer.forecast_date = b.forecast_date
+          AND newer.id > b.id
+        """
+    )
+    # прогнозы без запуска переносим в один "исторический" запуск
+    op.execute(
+        """
+        WITH legacy AS (
+            INSERT INTO forecast_run (id, status, created_at, started_at, finished_at)
+            SELECT gen_random_uuid(), 'COMPLETED', min(created_at), min(created_at), max(created_at)
+            FROM building_forecast
+            WHERE run_id IS NULL
+            HAVING count(*) > 0
+            RETURNING id
+        )
+        UPDATE building_forecast SET run_id = legacy.id
+        FROM legacy
+        WHERE building_forecast.run_id IS NULL
+        """
+    )
+
+    op.alter_column('building_forecast', 'run_id', existing_type=sa.UUID(), nullable=False)
+    op.drop_constraint('uq_building_forecast_geo_forecast_date_run_id', 'building_forecast', type_='unique')
+    op.create_unique_constraint(
+        'uq_building_forecast_geo_run_id_forecast_date',
+        'building_forecast',
+        ['geo', 'run_id', 'forecast_date'],
+    )
+    op.create_index('ix_building_forecast_run_id', 'building_forecast', ['run_id'], unique=False)
+    op.create_foreign_key(
+        'building_forecast_run_id_fkey',
+        'building_forecast',
+        'forecast_run',
+        ['run_id'],
+        ['id'],
+        ondelete='CASCADE',
+    )
+
+    op.add_column('forecast_fingerprint', sa.Column('run_id', sa.UUID(), nullable=True))
+    op.execute(
+        """
+        UPDATE forecast_fingerprint f
+        SET run_id = (SELECT b.run_id FROM building_forecast b WHERE b.geo = f.geo LIMIT 1)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('forecast_fingerprint', 'run_id')
+    op.drop_constraint('building_forecast_run_id_fkey', 'building_forecast', type_='foreignkey')
+    op.drop_index('ix_building_forecast_run_id', table_name='building_forecast')
+    op.drop_constraint('uq_building_forecast_geo_run_id_forecast_date', 'building_forecast', type_='unique')
+    op.create_unique_constraint(
+        'uq_building_forecast_geo_forecast_date_run_id',
+        'building_forecast',
+        ['geo', 'forecast_date', 'run_id'],
+    )
+    op.alter_column('building_forecast', 'run_id', existing_type=sa.UUID(), nullable=True)
+    # запусков больше нет — прогнозы снова без запуска, как до upgrade
+    op.execute("UPDATE building_forecast SET run_id = NULL")
+    op.drop_table('forecast_run')
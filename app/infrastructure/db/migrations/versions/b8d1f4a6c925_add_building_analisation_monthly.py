@@ -0,0 +1,51 @@
+"""[ADD] added materialized view building_analisation_monthly
+
+Revision ID: b8d1f4a6c925
+Revises: a2c6e9f1d384
+Create Date: 2026-10-18 19:12:48.503671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d1f4a6c925'
+down_revision: Union[str, Sequence[str], None] = 'a2c6e9f1d384'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW building_analisation_monthly AS
+        SELECT
+            geo,
+            date_trunc('month', last_updated)::date AS month,
+            (array_agg(geo_title ORDER BY last_updated DESC))[1] AS geo_title,
+            avg(average)::double precision AS average,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY average) AS median_average,
+            avg(average_kzt)::double precision AS average_kzt,
+            avg(total)::double precision AS total,
+            count(*)::integer AS snapshots,
+            max(last_updated) AS last_updated
+        FROM building_analisation
+        WHERE geo IS NOT NULL AND rooms IS NULL AND building IS NULL
+        GROUP BY geo, date_trunc('month', last_updated)
+        """
+    )
+    # уникальный индекс обязателен для REFRESH ... CONCURRENTLY
+    op.create_index(
+        'uq_building_analisation_monthly_geo_month',
+        'building_analisation_monthly',
+        ['geo', 'month'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW building_analisation_monthly")
@@ -0,0 +1,35 @@
+"""[UPD] added index building_analisation (geo, last_updated, id)
+
+Revision ID: c3e8a4f1b765
+Revises: a91c5d7e3f08
+Create Date: 2026-10-18 14:02:41.385120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a4f1b765'
+down_revision: Union[str, Sequence[str], None] = 'a91c5d7e3f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_building_analisation_geo_last_updated_id',
+        'building_analisation',
+        ['geo', 'last_updated', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_building_analisation_geo_last_updated_id',
+        table_name='building_analisation',
+    )
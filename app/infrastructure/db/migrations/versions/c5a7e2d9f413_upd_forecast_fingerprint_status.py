@@ -0,0 +1,30 @@
+"""[UPD] forecast_fingerprint status and error
+
+Revision ID: c5a7e2d9f413
+Revises: b8d1f4a6c925
+Create Date: 2026-10-18 21:04:36.187250
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a7e2d9f413'
+down_revision: Union[str, Sequence[str], None] = 'b8d1f4a6c925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('forecast_fingerprint', sa.Column('status', sa.String(length=16), server_default='FITTED', nullable=False))
+    op.add_column('forecast_fingerprint', sa.Column('error', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('forecast_fingerprint', 'error')
+    op.drop_column('forecast_fingerprint', 'status')
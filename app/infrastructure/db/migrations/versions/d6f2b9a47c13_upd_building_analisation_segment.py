@@ -0,0 +1,57 @@
+"""[UPD] building_analisation unique per segment (rooms, building)
+
+Revision ID: d6f2b9a47c13
+Revises: c3e8a4f1b765
+Create Date: 2026-10-18 15:11:07.902314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6f2b9a47c13'
+down_revision: Union[str, Sequence[str], None] = 'c3e8a4f1b765'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # срез без разбивки хранится как NULL, а не пустая строка
+    op.execute(
+        """
+        UPDATE building_analisation
+        SET rooms = NULLIF(rooms, ''), building = NULLIF(building, '')
+        WHERE rooms = '' OR building = ''
+        """
+    )
+    op.drop_constraint(
+        'uq_geo_title_last_updated_created_at', 'building_analisation', type_='unique'
+    )
+    op.execute(
+        """
+        ALTER TABLE building_analisation
+        ADD CONSTRAINT uq_building_analisation_segment
+        UNIQUE NULLS NOT DISTINCT (geo_title, last_updated, created_at, rooms, building)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        DELETE FROM building_analisation
+        WHERE rooms IS NOT NULL OR building IS NOT NULL
+        """
+    )
+    op.drop_constraint(
+        'uq_building_analisation_segment', 'building_analisation', type_='unique'
+    )
+    op.create_unique_constraint(
+        'uq_geo_title_last_updated_created_at',
+        'building_analisation',
+        ['geo_title', 'last_updated', 'created_at'],
+    )
@@ -8,10 +8,15 @@ __all__: list[str] = [
     "SimpleIDModelWithCreatedAt",
     "SimpleIDModelWithUpdatedAt",
     "BuildingAnalisationModel",
+    "building_analisation_monthly",
     "CurrencyRateModel",
     "BuildingForecastModel",
     "InflationModel",
     "NDSModel",
+    "ForecastFingerprintModel",
+    "ForecastRunModel",
+    "KrishaFetchStateModel",
+    "KrishaQuarantineModel",
 ]
 
 from .base import (
@@ -24,8 +29,12 @@ from .base import (
     SimpleIDModelWithCreatedAt,
     SimpleIDModelWithUpdatedAt,
 )
-from .building_analis import BuildingAnalisationModel
+from .building_analis import BuildingAnalisationModel, building_analisation_monthly
 from .currency_rate import CurrencyRateModel
+from .forecast_run import ForecastRunModel
 from .building_forecast import BuildingForecastModel
 from .inflation import InflationModel
-from .nds import NDSModel
\ No newline at end of file
+from .nds import NDSModel
+from .forecast_fingerprint import ForecastFingerprintModel
+from .krisha_fetch_state import KrishaFetchStateModel
+from .krisha_quarantine import KrishaQuarantineModel
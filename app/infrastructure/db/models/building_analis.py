@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import Integer, String, Float, Date, UniqueConstraint
+from sqlalchemy import Integer, String, Float, Date, UniqueConstraint, Index, Table, Column, MetaData
 from sqlalchemy.orm import mapped_column, Mapped
 
 from app.infrastructure.db.models import SimpleIDMixin
@@ -9,12 +9,23 @@ from app.infrastructure.db.models import SimpleIDMixin
 class BuildingAnalisationModel(SimpleIDMixin):
     __tablename__ = 'building_analisation'
     __table_args__ = (
+        # один срез (регион × комнаты × тип дома) на дату; NULL — срез без разбивки
         UniqueConstraint(
             "geo_title",
             "last_updated",
             "created_at",
-            name="uq_geo_title_last_updated_created_at"
+            "rooms",
+            "building",
+            name="uq_building_analisation_segment",
+            postgresql_nulls_not_distinct=True,
         ),
+        # история города и последний срез — range scan по (geo, last_updated, id)
+        Index("ix_building_analisation_geo_last_updated_id", "geo", "last_updated", "id"),
+        # строки приходят почти по порядку дат, BRIN занимает единицы страниц
+        Index("ix_building_analisation_last_updated_brin", "last_updated", postgresql_using="brin"),
+        Index("ix_building_analisation_created_at_brin", "created_at", postgresql_using="brin"),
+        # помесячные секции, создаются репозиторием (ensure_partitions)
+        {"postgresql_partition_by": "RANGE (last_updated)"},
     )
 
     geo: Mapped[int] = mapped_column(Integer, nullable=True, doc="Идентификатор географического региона")
@@ -26,8 +37,26 @@ class BuildingAnalisationModel(SimpleIDMixin):
     total: Mapped[int] = mapped_column(Integer, nullable=True, doc="Общее количество объектов.")
     rooms: Mapped[str] = mapped_column(String, nullable=True, doc="Количество комнат")
     building: Mapped[str] = mapped_column(String, nullable=True)
-    last_updated: Mapped[date] = mapped_column(Date, nullable=True)
+    last_updated: Mapped[date] = mapped_column(Date, primary_key=True, doc="Ключ секционирования")
     created_at: Mapped[date] = mapped_column(Date, nullable=True)
     min_average: Mapped[float] = mapped_column(Float, nullable=True)
     max_rate: Mapped[float] = mapped_column(Float, nullable=True)
-    value_on_axis: Mapped[float] = mapped_column(Float, nullable=True)
\ No newline at end of file
+    value_on_axis: Mapped[float] = mapped_column(Float, nullable=True)
+
+
+# Материализованное представление: помесячные агрегаты общего среза по региону.
+# Отдельный MetaData — autogenerate не должен создавать его как таблицу,
+# представление создаётся и обновляется миграцией и репозиторием.
+building_analisation_monthly = Table(
+    "building_analisation_monthly",
+    MetaData(),
+    Column("geo", Integer, primary_key=True),
+    Column("month", Date, primary_key=True, doc="Первый день месяца"),
+    Column("geo_title", String),
+    Column("average", Float, doc="Средняя цена за м² в USD"),
+    Column("median_average", Float, doc="Медиана цены за м² в USD"),
+    Column("average_kzt", Float, doc="Средняя цена за м² в тенге"),
+    Column("total", Float, doc="Среднее количество объектов в срезе"),
+    Column("snapshots", Integer, doc="Количество срезов за месяц"),
+    Column("last_updated", Date, doc="Дата последнего среза месяца"),
+)
@@ -1,6 +1,8 @@
+from datetime import datetime
 from decimal import Decimal
+from uuid import UUID as PyUUID
 
-from sqlalchemy import Integer, String, Date, DECIMAL
+from sqlalchemy import Integer, String, Date, DECIMAL, DateTime, UUID, UniqueConstraint, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.db.models import SimpleIDMixin
@@ -8,10 +10,30 @@ from app.infrastructure.db.models import SimpleIDMixin
 
 class BuildingForecastModel(SimpleIDMixin):
     __tablename__ = 'building_forecast'
+    __table_args__ = (
+        # "последний прогноз по городу" — один range scan по (geo, run_id)
+        UniqueConstraint(
+            "geo",
+            "run_id",
+            "forecast_date",
+            name="uq_building_forecast_geo_run_id_forecast_date"
+        ),
+        Index("ix_building_forecast_run_id", "run_id"),
+    )
 
+    run_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("forecast_run.id", ondelete="CASCADE"),
+        nullable=False,
+        doc="Идентификатор запуска прогноза",
+    )
     geo: Mapped[int] = mapped_column(Integer, nullable=False)
     geo_title: Mapped[str] = mapped_column(String, nullable=False)
     forecast_date: Mapped[Date] = mapped_column(Date, nullable=False)
     forecast_kzt: Mapped[Decimal] = mapped_column(DECIMAL(12, 2), nullable=False)
     lower_bound_kzt: Mapped[Decimal] = mapped_column(DECIMAL(12, 2), nullable=True)
-    upper_bound_kzt: Mapped[Decimal] = mapped_column(DECIMAL(12, 2), nullable=True)
\ No newline at end of file
+    upper_bound_kzt: Mapped[Decimal] = mapped_column(DECIMAL(12, 2), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
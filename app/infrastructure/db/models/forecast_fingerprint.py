@@ -0,0 +1,33 @@
+from datetime import date, datetime
+from uuid import UUID as PyUUID
+
+from sqlalchemy import Integer, String, Date, DateTime, UUID, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.enums import FingerprintStatusEnum
+from app.infrastructure.db.models import SimpleIDMixin
+
+
+class ForecastFingerprintModel(SimpleIDMixin):
+    __tablename__ = 'forecast_fingerprint'
+
+    geo: Mapped[int] = mapped_column(Integer, nullable=False, unique=True, doc="Идентификатор региона")
+    geo_title: Mapped[str] = mapped_column(String, nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, doc="Количество исторических точек")
+    max_last_updated: Mapped[date] = mapped_column(Date, nullable=True, doc="Последняя историческая дата")
+    values_hash: Mapped[str] = mapped_column(String(64), nullable=False, doc="Хэш исторических значений")
+    regressor_version: Mapped[str] = mapped_column(String(64), nullable=False, doc="Версия таблиц регрессоров")
+    run_id: Mapped[PyUUID] = mapped_column(UUID(as_uuid=True), nullable=True, doc="Запуск с актуальным прогнозом")
+    status: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default=FingerprintStatusEnum.FITTED.value,
+        server_default=FingerprintStatusEnum.FITTED.value,
+        doc="Результат последней обработки (FingerprintStatusEnum)",
+    )
+    error: Mapped[str] = mapped_column(String, nullable=True, doc="Причина пропуска или ошибки")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
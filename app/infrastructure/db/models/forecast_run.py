@@ -0,0 +1,25 @@
+from datetime import datetime
+from uuid import UUID as PyUUID
+
+from sqlalchemy import String, Integer, DateTime, UUID, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.enums import StatusSearchEnum
+from app.infrastructure.db.config import Base
+
+
+class ForecastRunModel(Base):
+    __tablename__ = 'forecast_run'
+
+    id: Mapped[PyUUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    status: Mapped[str] = mapped_column(
+        String(16), nullable=False, default=StatusSearchEnum.PENDING.value, doc="Статус запуска (StatusSearchEnum)"
+    )
+    params: Mapped[dict] = mapped_column(JSONB, nullable=True, doc="Параметры модели и запуска")
+    data_fingerprint: Mapped[str] = mapped_column(String(64), nullable=True, doc="Отпечаток данных запуска")
+    cities: Mapped[int] = mapped_column(Integer, nullable=True, doc="Количество спрогнозированных городов")
+    error: Mapped[str] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
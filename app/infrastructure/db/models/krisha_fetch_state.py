@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.db.models import SimpleIDMixin
+
+
+class KrishaFetchStateModel(SimpleIDMixin):
+    __tablename__ = 'krisha_fetch_state'
+
+    segment_key: Mapped[str] = mapped_column(String, nullable=False, unique=True, doc="Срез вида geo:rooms:building")
+    etag: Mapped[str] = mapped_column(String, nullable=True, doc="ETag последнего ответа")
+    last_modified: Mapped[str] = mapped_column(String, nullable=True, doc="Last-Modified последнего ответа")
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=True, doc="sha256 тела последнего ответа")
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True, doc="Последний запрос")
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True, doc="Последнее изменение данных")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.db.models import SimpleIDMixin
+
+
+class KrishaQuarantineModel(SimpleIDMixin):
+    __tablename__ = 'krisha_quarantine'
+
+    segment_key: Mapped[str] = mapped_column(String, nullable=True, doc="Срез вида geo:rooms:building")
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False, doc="Исходная строка ответа krisha")
+    reasons: Mapped[list] = mapped_column(JSONB, nullable=False, doc="Ошибки валидации")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from uuid import uuid4
+
+from sqlalchemy import event, make_url, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import logger
+from app.core.metrics import (
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CONNECT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CONNECTIONS,
+    DB_POOL_SIZE,
+)
+from app.core.settings import settings
+from app.infrastructure.db.instrumentation import instrument_queries
+
+# время открытия соединения, которое `_do_get` вычитает из ожидания
+CONNECT_SECONDS = "pool_connect_seconds"
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that exports checkout wait and connect times to Prometheus.
+
+    `_do_get` is the point where a checkout blocks on an exhausted pool, but it
+    also opens a new connection when the pool is empty and below its limit.
+    Connecting is timed separately in `_create_connection` and subtracted, so the
+    wait histogram measures only the wait for a free connection.
+    """
+
+    engine_name: str = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(self.engine_name).inc()
+            DB_POOL_CHECKOUT_WAIT.labels(self.engine_name).observe(
+                time.perf_counter() - start
+            )
+            raise
+        DB_POOL_CHECKOUT_WAIT.labels(self.engine_name).observe(
+            time.perf_counter() - start - record.info.pop(CONNECT_SECONDS, 0.0)
+        )
+        return record
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            record = super()._create_connection()
+        finally:
+            seconds = time.perf_counter() - start
+            DB_POOL_CONNECT.labels(self.engine_name).observe(seconds)
+        record.info[CONNECT_SECONDS] = seconds
+        return record
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.engine_name = self.engine_name
+        return pool
+
+
+def instrument_pool(engine: AsyncEngine, name: str) -> None:
+    """Label the engine's pool and keep its utilization gauges up to date."""
+    pool = engine.sync_engine.pool
+    pool.engine_name = name
+    DB_POOL_SIZE.labels(name).set(settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+
+    def on_change(*args) -> None:
+        current = engine.sync_engine.pool
+        DB_POOL_CONNECTIONS.labels(name, "checked_out").set(current.checkedout())
+        DB_POOL_CONNECTIONS.labels(name, "idle").set(current.checkedin())
+        DB_POOL_CONNECTIONS.labels(name, "overflow").set(max(current.overflow(), 0))
+
+    event.listen(pool, "checkout", on_change)
+    event.listen(pool, "checkin", on_change)
+
+
+def create_pooled_engine(url: str, name: str = "primary") -> AsyncEngine:
+    """
+    Async engine with the pool and statement cache configured from the DB_* settings.
+
+    In PgBouncer (transaction pooling) mode prepared statements cannot outlive
+    a transaction, so both asyncpg's and SQLAlchemy's statement caches are
+    disabled and statements get unique names.
+    """
+    connect_args: dict = {"timeout": 60}
+    if settings.DB_PGBOUNCER:
+        cache_size = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    else:
+        cache_size = settings.DB_STATEMENT_CACHE_SIZE
+    connect_args["statement_cache_size"] = cache_size
+
+    engine = create_async_engine(
+        url=make_url(url).update_query_dict(
+            {"prepared_statement_cache_size": str(cache_size)}
+        ),
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        # LIFO: лишние соединения простаивают и закрываются по pool_recycle
+        pool_use_lifo=True,
+        isolation_level="READ COMMITTED",
+        connect_args=connect_args,
+        echo=False,
+    )
+    instrument_pool(engine, name)
+    if settings.DB_QUERY_METRICS:
+        instrument_queries(engine, name)
+    return engine
+
+
+async def warmup_pool(engine: AsyncEngine, size: int) -> None:
+    """Open `size` connections at once so the first requests do not pay for connecting."""
+    if size <= 0:
+        return
+
+    async def connect():
+        connection = await engine.connect()
+        await connection.execute(text("SELECT 1"))
+        return connection
+
+    results = await asyncio.gather(*(connect() for _ in range(size)), return_exceptions=True)
+    opened = [r for r in results if not isinstance(r, BaseException)]
+    for connection in opened:
+        await connection.close()
+    if len(opened) < size:
+        logger.warning(f"DB pool warmup: {len(opened)} of {size} connections opened")
+    else:
+        logger.info(f"DB pool warmup: {size} connections opened")
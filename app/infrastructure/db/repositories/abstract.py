@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import Generic, Any
 from uuid import UUID
 
@@ -39,3 +40,34 @@ class AbstractRepository(ABC, Generic[MODEL]):
     async def delete(self, obj_id: int | str | UUID) -> None:
         """Delete an object by its unique identifier."""
         raise NotImplementedError()
+
+    @abstractmethod
+    async def get_by_ids(self, obj_ids: Sequence[int | str | UUID]) -> list[MODEL]:
+        """Retrieve the objects with the given identifiers (missing ones are skipped)."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def bulk_update(self, values: Sequence[dict[str, Any]]) -> list[MODEL]:
+        """
+        Update several objects with per-object values in one statement.
+
+        Every item holds the object's `id` and the attributes to set.
+        Returns the updated objects.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def bulk_delete(self, obj_ids: Sequence[int | str | UUID]) -> list[int | str | UUID]:
+        """Delete the objects with the given identifiers and return the deleted ids."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def bulk_soft_delete(
+        self, obj_ids: Sequence[int | str | UUID]
+    ) -> list[int | str | UUID]:
+        """
+        Soft delete the objects with the given identifiers and return the affected ids.
+
+        Models without an `is_deleted` column raise `SoftDeleteNotSupportedException`.
+        """
+        raise NotImplementedError()
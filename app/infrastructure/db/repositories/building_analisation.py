@@ -1,69 +1,450 @@
-from datetime import date, datetime
+from collections.abc import Iterable
+from datetime import date
 from typing import Annotated, Any
 
+import pandas as pd
 from fastapi import Depends
-from sqlalchemy import select, Select, Result
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select, func, text, tuple_, Select, Result, ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.type_vars import MODEL
-from app.infrastructure.db.models import BuildingAnalisationModel
+from app.infrastructure.db.models import (
+    BuildingAnalisationModel,
+    building_analisation_monthly,
+)
 from app.infrastructure.db.repositories.sqlalchemy_base import SqlAlchemyBaseRepository
 from app.infrastructure.db.sessions import get_async_session
 
+TABLE = "building_analisation"
+MONTHLY_VIEW = "building_analisation_monthly"
+STAGING_TABLE = "building_analisation_staging"
+CONFLICT_COLUMNS = ["geo_title", "last_updated", "created_at", "rooms", "building"]
+REQUIRED_KEYS = {"geo_title", "last_updated"}
+UPSERT_COLUMNS = [
+    "geo",
+    "geo_title",
+    "average",
+    "average_kzt",
+    "rate_kzt",
+    "calculated",
+    "total",
+    "rooms",
+    "building",
+    "last_updated",
+    "created_at",
+    "min_average",
+    "max_rate",
+    "value_on_axis",
+]
+STAGING_COLUMNS = ["seq", *UPSERT_COLUMNS]
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Monthly partition name, e.g. `building_analisation_y2026m10`."""
+    return f"{TABLE}_y{month.year}m{month.month:02d}"
+
+
+def staging_record(seq: int, record: dict) -> tuple:
+    """
+    Row for COPY into the staging table, in `STAGING_COLUMNS` order.
+
+    Expects rows already validated and typed (`KrishaRow`), COPY does no coercion.
+    """
+    return (seq, *(record.get(c) for c in UPSERT_COLUMNS))
 
 
 class BuildingAnalisationModelRepository(SqlAlchemyBaseRepository):
     def __init__(self, session: Annotated[AsyncSession, Depends(get_async_session)]):
         super().__init__(model=BuildingAnalisationModel, session=session)
+        self._partitions: set[date] | None = None
+
+    async def get_partitions(self) -> dict[date, str]:
+        """Attached monthly partitions keyed by the first day of their month."""
+        result: "Result" = await self.session.execute(
+            text(
+                """
+                SELECT c.relname
+                FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = CAST(:table AS regclass)
+                """
+            ),
+            {"table": TABLE},
+        )
+        partitions = {}
+        for (name,) in result:
+            if not name.startswith(f"{TABLE}_y"):
+                continue
+            suffix = name.removeprefix(f"{TABLE}_y")
+            year, month = suffix.split("m")
+            partitions[date(int(year), int(month), 1)] = name
+        return partitions
+
+    async def ensure_partitions(self, months: Iterable[date]) -> list[str]:
+        """
+        Create missing monthly partitions.
+
+        Creating a partition locks the parent table until the caller commits,
+        so callers commit right after the batch that needed it.
+
+        :return: names of the created partitions.
+        """
+        months = {month_start(m) for m in months}
+        if self._partitions is None or not months <= self._partitions:
+            self._partitions = set(await self.get_partitions())
+
+        created = []
+        for month in sorted(months - self._partitions):
+            name = partition_name(month)
+            await self.session.execute(
+                text(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE}
+                    FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')
+                    """
+                )
+            )
+            created.append(name)
+        if created:
+            self._partitions |= months
+        return created
+
+    def forget_partitions(self) -> None:
+        """Drop the cached partition list (after a rollback it may name uncommitted partitions)."""
+        self._partitions = None
+
+    async def ensure_future_partitions(self, months_ahead: int) -> list[str]:
+        """Partitions from the current month up to `months_ahead` months forward."""
+        current = month_start(date.today())
+        return await self.ensure_partitions(
+            add_months(current, i) for i in range(months_ahead + 1)
+        )
+
+    async def detach_partitions(self, before: date) -> list[str]:
+        """
+        Detach partitions of months entirely before `before`.
+
+        Detached partitions stay as standalone tables for archival (pg_dump, then drop).
+
+        :return: names of the detached partitions.
+        """
+        detached = []
+        for month, name in sorted((await self.get_partitions()).items()):
+            if add_months(month, 1) > before:
+                continue
+            await self.session.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+            detached.append(name)
+        if detached:
+            self._partitions = None
+        return detached
 
     async def get_all(self, **kwargs: dict[str, Any]) -> list[MODEL]:
         """Retrieve a list of objects based on filter criteria."""
         filters = {**kwargs}
         stmt: "Select" = select(self._MODEL).filter_by(**filters)
         result: "Result" = await self.session.execute(stmt)
-        await self.session.close()
         return result.scalars().all()
 
-    async def upsert_many(self, records: list[dict], chunk_size: int = 1000):
-        if not records:
-            return
-
-        def normalize_date(v):
-            if isinstance(v, date):
-                return v
-            if isinstance(v, str):
-                return datetime.strptime(v, "%Y-%m-%d").date()
-            return None
-
-        for i in range(0, len(records), chunk_size):
-            chunk = records[i:i + chunk_size]
-
-            # нормализация
-            for r in chunk:
-                r["last_updated"] = normalize_date(r.get("last_updated"))
-                r["created_at"] = normalize_date(r.get("created_at"))
-
-            stmt = insert(self.model).values(chunk)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=['geo_title', 'last_updated', 'created_at'],
-                set_={
-                    'geo': stmt.excluded.geo,
-                    'geo_title': stmt.excluded.geo_title,
-                    'average': stmt.excluded.average,
-                    'average_kzt': stmt.excluded.average_kzt,
-                    'rate_kzt': stmt.excluded.rate_kzt,
-                    'calculated': stmt.excluded.calculated,
-                    'total': stmt.excluded.total,
-                    'rooms': stmt.excluded.rooms,
-                    'building': stmt.excluded.building,
-                    'last_updated': stmt.excluded.last_updated,
-                    'min_average': stmt.excluded.min_average,
-                    'max_rate': stmt.excluded.max_rate,
-                    'value_on_axis': stmt.excluded.value_on_axis,
-                }
+    async def get_history_frame(self) -> pd.DataFrame:
+        """Price history as a DataFrame: `geo`, `geo_title`, `last_updated`, `average`."""
+        stmt: "Select" = select(
+            self._MODEL.geo,
+            self._MODEL.geo_title,
+            self._MODEL.last_updated,
+            self._MODEL.average,
+        ).where(self._MODEL.geo.is_not(None), *self._segment_filters())
+        return await self.fetch_frame(
+            stmt,
+            dtypes={
+                "geo": "int32",
+                "geo_title": "category",
+                "last_updated": "datetime64[ns]",
+                "average": "float64",
+            },
+        )
+
+    async def refresh_monthly(self) -> None:
+        """
+        Refresh the monthly aggregates view.
+
+        CONCURRENTLY keeps the view readable during the refresh and rewrites only
+        the months that changed.
+        """
+        await self.session.execute(
+            text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {MONTHLY_VIEW}")
+        )
+
+    async def get_monthly_frame(self) -> pd.DataFrame:
+        """
+        Monthly price series as a DataFrame: `geo`, `geo_title`, `last_updated`, `average`.
+
+        Same columns as `get_history_frame`, one row per geo and month
+        (`last_updated` is the first day of the month, `average` the monthly mean).
+        """
+        view = building_analisation_monthly.c
+        stmt: "Select" = select(
+            view.geo,
+            view.geo_title,
+            view.month.label("last_updated"),
+            view.average,
+        ).where(view.average.is_not(None))
+        return await self.fetch_frame(
+            stmt,
+            dtypes={
+                "geo": "int32",
+                "geo_title": "category",
+                "last_updated": "datetime64[ns]",
+                "average": "float64",
+            },
+        )
+
+    def _monthly_filters(
+        self, geo: int, date_from: date | None, date_to: date | None
+    ) -> list[ColumnElement[bool]]:
+        view = building_analisation_monthly.c
+        filters = [view.geo == geo]
+        if date_from is not None:
+            filters.append(view.month >= month_start(date_from))
+        if date_to is not None:
+            filters.append(view.month <= date_to)
+        return filters
+
+    async def get_monthly_page(
+        self,
+        geo: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        after: date | None = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """
+        Page of a city's monthly aggregates ordered by month.
+
+        :param after: month of the last row of the previous page (keyset pagination).
+        """
+        view = building_analisation_monthly.c
+        stmt: "Select" = select(building_analisation_monthly).where(
+            *self._monthly_filters(geo, date_from, date_to)
+        )
+        if after is not None:
+            stmt = stmt.where(view.month > after)
+        stmt = stmt.order_by(view.month).limit(limit)
+        result: "Result" = await self.session.execute(stmt)
+        return result.mappings().all()
+
+    async def count_monthly(
+        self, geo: int, date_from: date | None = None, date_to: date | None = None
+    ) -> int:
+        stmt: "Select" = select(func.count()).select_from(building_analisation_monthly).where(
+            *self._monthly_filters(geo, date_from, date_to)
+        )
+        return await self.session.scalar(stmt)
+
+    async def get_geos(self) -> list[int]:
+        stmt: "Select" = select(self._MODEL.geo.distinct()).where(
+            self._MODEL.geo.is_not(None)
+        )
+        return list(await self.session.scalars(stmt))
+
+    def _segment_filters(
+        self, rooms: str | None = None, building: str | None = None
+    ) -> list[ColumnElement[bool]]:
+        """Rows of one segment; by default the region-wide one (no rooms/building split)."""
+        return [
+            self._MODEL.rooms.is_not_distinct_from(rooms),
+            self._MODEL.building.is_not_distinct_from(building),
+        ]
+
+    def _history_filters(
+        self,
+        geo: int,
+        date_from: date | None,
+        date_to: date | None,
+        rooms: str | None = None,
+        building: str | None = None,
+    ) -> list[ColumnElement[bool]]:
+        filters = [
+            self._MODEL.geo == geo,
+            self._MODEL.last_updated.is_not(None),
+            *self._segment_filters(rooms, building),
+        ]
+        if date_from is not None:
+            filters.append(self._MODEL.last_updated >= date_from)
+        if date_to is not None:
+            filters.append(self._MODEL.last_updated <= date_to)
+        return filters
+
+    async def get_history_page(
+        self,
+        geo: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        after: tuple[date, int] | None = None,
+        limit: int = 100,
+        rooms: str | None = None,
+        building: str | None = None,
+    ) -> list[MODEL]:
+        """
+        Page of a city's history ordered by (last_updated, id).
+
+        :param after: key of the last row of the previous page (keyset pagination).
+        :param rooms: segment by room count (None — all rooms).
+        :param building: segment by building type (None — all types).
+        """
+        stmt: "Select" = select(self._MODEL).where(
+            *self._history_filters(geo, date_from, date_to, rooms, building)
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(self._MODEL.last_updated, self._MODEL.id) > tuple_(*after)
             )
+        stmt = stmt.order_by(self._MODEL.last_updated, self._MODEL.id).limit(limit)
+        result: "Result" = await self.session.execute(stmt)
+        return result.scalars().all()
 
-            await self.session.execute(stmt)
+    async def count_history(
+        self,
+        geo: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        rooms: str | None = None,
+        building: str | None = None,
+    ) -> int:
+        stmt: "Select" = select(func.count()).where(
+            *self._history_filters(geo, date_from, date_to, rooms, building)
+        )
+        return await self.session.scalar(stmt)
 
-        await self.session.commit()
\ No newline at end of file
+    async def get_latest_snapshot_page(
+        self, after_geo: int | None = None, limit: int = 100
+    ) -> list[MODEL]:
+        """Latest history row of every city, ordered by geo (keyset pagination on geo)."""
+        stmt: "Select" = (
+            select(self._MODEL)
+            .distinct(self._MODEL.geo)
+            .where(
+                self._MODEL.geo.is_not(None),
+                self._MODEL.last_updated.is_not(None),
+                *self._segment_filters(),
+            )
+        )
+        if after_geo is not None:
+            stmt = stmt.where(self._MODEL.geo > after_geo)
+        stmt = stmt.order_by(
+            self._MODEL.geo, self._MODEL.last_updated.desc(), self._MODEL.id.desc()
+        ).limit(limit)
+        result: "Result" = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def count_geos(self) -> int:
+        stmt: "Select" = select(func.count(self._MODEL.geo.distinct())).where(
+            self._MODEL.last_updated.is_not(None), *self._segment_filters()
+        )
+        return await self.session.scalar(stmt)
+
+    async def upsert_many(self, records: list[dict]) -> dict[str, int]:
+        """
+        Bulk upsert through a COPY-filled temp table.
+
+        Rows are COPYed into `building_analisation_staging` (temp, no WAL) and merged
+        with one `INSERT ... ON CONFLICT DO UPDATE ... WHERE ... IS DISTINCT FROM`,
+        so conflicting rows whose values did not change are not rewritten.
+        Duplicate keys within `records` are collapsed, the last one wins.
+        Inserted and updated rows are told apart by looking the returned keys up in
+        the table: the outer query sees it as of before the INSERT (partitioned
+        tables cannot return `xmax`).
+
+        :param records: validated rows (`app.domain.parser.schemas.KrishaRow`).
+
+        :return: counts of `inserted`, `updated` and `unchanged` rows.
+        """
+        if not records:
+            return {"inserted": 0, "updated": 0, "unchanged": 0}
+
+        await self.ensure_partitions(r["last_updated"] for r in records)
+        await self.session.execute(
+            text(
+                f"""
+                CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+                    seq integer NOT NULL,
+                    geo integer,
+                    geo_title text,
+                    average integer,
+                    average_kzt integer,
+                    rate_kzt double precision,
+                    calculated integer,
+                    total integer,
+                    rooms text,
+                    building text,
+                    last_updated date,
+                    created_at date,
+                    min_average double precision,
+                    max_rate double precision,
+                    value_on_axis double precision
+                ) ON COMMIT DROP
+                """
+            )
+        )
+        connection = await self._driver_connection()
+        await connection.copy_records_to_table(
+            STAGING_TABLE,
+            records=(staging_record(seq, r) for seq, r in enumerate(records)),
+            columns=STAGING_COLUMNS,
+        )
+
+        columns = ", ".join(UPSERT_COLUMNS)
+        keys = ", ".join(CONFLICT_COLUMNS)
+        values = [c for c in UPSERT_COLUMNS if c not in CONFLICT_COLUMNS]
+        # `=` on the leading non-null keys lets the lookup use the unique index
+        key_match = " AND ".join(
+            f"t.{c} = u.{c}" if c in REQUIRED_KEYS else f"t.{c} IS NOT DISTINCT FROM u.{c}"
+            for c in CONFLICT_COLUMNS
+        )
+        result = await self.session.execute(
+            text(
+                f"""
+                WITH src AS (
+                    SELECT DISTINCT ON ({keys}) {columns}
+                    FROM {STAGING_TABLE}
+                    ORDER BY {keys}, seq DESC
+                ),
+                upserted AS (
+                    INSERT INTO {TABLE} ({columns})
+                    SELECT {columns} FROM src
+                    ON CONFLICT ON CONSTRAINT uq_building_analisation_segment DO UPDATE SET
+                        {", ".join(f"{c} = excluded.{c}" for c in values)}
+                    WHERE ({", ".join(f"{TABLE}.{c}" for c in values)})
+                        IS DISTINCT FROM ({", ".join(f"excluded.{c}" for c in values)})
+                    RETURNING {keys}
+                )
+                SELECT
+                    (SELECT count(*) FROM src) AS total,
+                    count(*) FILTER (WHERE NOT existed) AS inserted,
+                    count(*) FILTER (WHERE existed) AS updated
+                FROM (
+                    SELECT EXISTS (
+                        SELECT 1 FROM {TABLE} t
+                        WHERE {key_match}
+                    ) AS existed
+                    FROM upserted u
+                ) AS written
+                """
+            )
+        )
+        total, inserted, updated = result.one()
+        # ON COMMIT DROP only fires on commit: the next call in this transaction
+        # must not merge these rows again
+        await self.session.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+        return {
+            "inserted": inserted,
+            "updated": updated,
+            "unchanged": total - inserted - updated,
+        }
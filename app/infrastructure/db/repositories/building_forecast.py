@@ -1,28 +1,183 @@
-from datetime import date, datetime
-from typing import Annotated, Any
+from datetime import date
+from itertools import repeat
+from typing import Annotated
+from uuid import UUID
 
+import pandas as pd
 from fastapi import Depends
-from sqlalchemy import select, Select, Result
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select, func, text, Select, Result, ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.type_vars import MODEL
-from app.infrastructure.db.models import BuildingForecastModel
+from app.infrastructure.db.models import BuildingForecastModel, ForecastFingerprintModel
 from app.infrastructure.db.repositories.sqlalchemy_base import SqlAlchemyBaseRepository
 from app.infrastructure.db.sessions import get_async_session
 
+STAGING_TABLE = "building_forecast_staging"
+STAGING_COLUMNS = [
+    "run_id",
+    "geo",
+    "geo_title",
+    "forecast_date",
+    "forecast_kzt",
+    "lower_bound_kzt",
+    "upper_bound_kzt",
+]
 
 
 class BuildingForecastModelRepository(SqlAlchemyBaseRepository):
     def __init__(self, session: Annotated[AsyncSession, Depends(get_async_session)]):
         super().__init__(model=BuildingForecastModel, session=session)
 
-    async def bulk_save_forecasts(self, forecasts: list[BuildingForecastModel]):
+    async def create_staging(self) -> None:
         """
-        Сохраняет список прогнозов в базе данных асинхронно.
+        Создаёт временную таблицу для прогнозов текущего запуска.
+
+        Таблица живёт до конца транзакции, поэтому все `copy_to_staging` и
+        `merge_staging` одного запуска должны выполняться без промежуточных commit.
+        """
+        await self.session.execute(
+            text(
+                f"""
+                CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+                    run_id uuid NOT NULL,
+                    geo integer NOT NULL,
+                    geo_title text NOT NULL,
+                    forecast_date date NOT NULL,
+                    forecast_kzt double precision NOT NULL,
+                    lower_bound_kzt double precision,
+                    upper_bound_kzt double precision
+                ) ON COMMIT DROP
+                """
+            )
+        )
+
+    async def copy_to_staging(
+        self, run_id: UUID, geo: int, geo_title: str, forecast: pd.DataFrame
+    ) -> int:
+        """
+        Передаёт прогноз одного города во временную таблицу через COPY.
+
+        :param forecast: DataFrame с колонками `ds`, `yhat`, `yhat_lower`, `yhat_upper`.
+        :return: количество переданных строк.
+        """
+        if forecast.empty:
+            return 0
+
+        records = zip(
+            repeat(run_id),
+            repeat(geo),
+            repeat(geo_title),
+            forecast["ds"].dt.date.tolist(),
+            forecast["yhat"].astype("float64").tolist(),
+            forecast["yhat_lower"].astype("float64").tolist(),
+            forecast["yhat_upper"].astype("float64").tolist(),
+        )
+        connection = await self._driver_connection()
+        await connection.copy_records_to_table(
+            STAGING_TABLE, records=records, columns=STAGING_COLUMNS
+        )
+        return forecast.shape[0]
+
+    async def merge_staging(self, run_id: UUID) -> int:
+        """
+        Переносит прогнозы запуска из временной таблицы в `building_forecast`.
+
+        Транзакцию фиксирует вызывающий код (UnitOfWork). Прогнозы предыдущих запусков
+        удаляются политикой хранения `ForecastRunModelRepository.prune`.
+
+        :return: количество записанных строк.
+        """
+        result = await self.session.execute(
+            text(
+                f"""
+                INSERT INTO building_forecast (
+                    run_id, geo, geo_title, forecast_date,
+                    forecast_kzt, lower_bound_kzt, upper_bound_kzt
+                )
+                SELECT
+                    run_id, geo, geo_title, forecast_date,
+                    round(forecast_kzt::numeric, 2),
+                    round(lower_bound_kzt::numeric, 2),
+                    round(upper_bound_kzt::numeric, 2)
+                FROM {STAGING_TABLE}
+                WHERE run_id = :run_id
+                ON CONFLICT (geo, forecast_date, run_id) DO UPDATE SET
+                    geo_title = excluded.geo_title,
+                    forecast_kzt = excluded.forecast_kzt,
+                    lower_bound_kzt = excluded.lower_bound_kzt,
+                    upper_bound_kzt = excluded.upper_bound_kzt
+                """
+            ),
+            {"run_id": run_id},
+        )
+        return result.rowcount
+
+    async def get_by_run(self, run_id: UUID) -> list[BuildingForecastModel]:
+        """Прогнозы одного запуска, упорядоченные по городу и дате."""
+        stmt: "Select" = (
+            select(self._MODEL)
+            .where(self._MODEL.run_id == run_id)
+            .order_by(self._MODEL.geo, self._MODEL.forecast_date)
+        )
+        result: "Result" = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    def _latest_filters(
+        self, geo: int, date_from: date | None = None, date_to: date | None = None
+    ) -> list[ColumnElement[bool]]:
+        latest_run = (
+            select(ForecastFingerprintModel.run_id)
+            .where(ForecastFingerprintModel.geo == geo)
+            .scalar_subquery()
+        )
+        filters = [self._MODEL.geo == geo, self._MODEL.run_id == latest_run]
+        if date_from is not None:
+            filters.append(self._MODEL.forecast_date >= date_from)
+        if date_to is not None:
+            filters.append(self._MODEL.forecast_date <= date_to)
+        return filters
+
+    async def get_latest(self, geo: int) -> list[BuildingForecastModel]:
+        """
+        Актуальный прогноз города.
+
+        Запуск берётся из `forecast_fingerprint`, сами строки читаются одним
+        range scan по индексу (geo, run_id, forecast_date).
+        """
+        stmt: "Select" = (
+            select(self._MODEL)
+            .where(*self._latest_filters(geo))
+            .order_by(self._MODEL.forecast_date)
+        )
+        result: "Result" = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_latest_page(
+        self,
+        geo: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        after: date | None = None,
+        limit: int = 100,
+    ) -> list[BuildingForecastModel]:
+        """
+        Страница актуального прогноза города в диапазоне дат.
+
+        :param after: дата последней строки предыдущей страницы (keyset pagination).
         """
-        if not forecasts:
-            return
+        stmt: "Select" = select(self._MODEL).where(
+            *self._latest_filters(geo, date_from, date_to)
+        )
+        if after is not None:
+            stmt = stmt.where(self._MODEL.forecast_date > after)
+        stmt = stmt.order_by(self._MODEL.forecast_date).limit(limit)
+        result: "Result" = await self.session.execute(stmt)
+        return result.scalars().all()
 
-        self.session.add_all(forecasts)
-        await self.session.commit()
\ No newline at end of file
+    async def count_latest(
+        self, geo: int, date_from: date | None = None, date_to: date | None = None
+    ) -> int:
+        stmt: "Select" = select(func.count()).where(
+            *self._latest_filters(geo, date_from, date_to)
+        )
+        return await self.session.scalar(stmt)
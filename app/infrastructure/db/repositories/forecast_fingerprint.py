@@ -0,0 +1,43 @@
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy import select, func, Select, Result
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models import ForecastFingerprintModel
+from app.infrastructure.db.repositories.sqlalchemy_base import SqlAlchemyBaseRepository
+from app.infrastructure.db.sessions import get_async_session
+
+
+class ForecastFingerprintModelRepository(SqlAlchemyBaseRepository):
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_async_session)]):
+        super().__init__(model=ForecastFingerprintModel, session=session)
+
+    async def get_map(self) -> dict[int, ForecastFingerprintModel]:
+        """Return stored fingerprints keyed by geo."""
+        stmt: "Select" = select(self._MODEL)
+        result: "Result" = await self.session.execute(stmt)
+        return {f.geo: f for f in result.scalars().all()}
+
+    async def upsert(self, fingerprint: dict) -> None:
+        """
+        Insert or replace the fingerprint of a single geo (committed by the caller).
+
+        Without `run_id` (skipped or failed geo) the previous run stays the current forecast.
+        """
+        stmt = insert(self.model).values(**fingerprint)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["geo"],
+            set_={
+                "geo_title": stmt.excluded.geo_title,
+                "row_count": stmt.excluded.row_count,
+                "max_last_updated": stmt.excluded.max_last_updated,
+                "values_hash": stmt.excluded.values_hash,
+                "regressor_version": stmt.excluded.regressor_version,
+                "run_id": func.coalesce(stmt.excluded.run_id, self.model.run_id),
+                "status": stmt.excluded.status,
+                "error": stmt.excluded.error,
+            },
+        )
+        await self.session.execute(stmt)
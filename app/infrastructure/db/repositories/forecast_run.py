@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+from typing import Annotated, Any
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import select, update, delete, Select, Result
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import StatusSearchEnum
+from app.core.exceptions.exceptions import ObjectDoesNotExistException
+from app.infrastructure.db.models import (
+    BuildingForecastModel,
+    ForecastFingerprintModel,
+    ForecastRunModel,
+)
+from app.infrastructure.db.repositories.sqlalchemy_base import SqlAlchemyBaseRepository
+from app.infrastructure.db.sessions import get_async_session
+
+ACTIVE_STATUSES = (StatusSearchEnum.PENDING.value, StatusSearchEnum.STARTED.value)
+
+
+class ForecastRunModelRepository(SqlAlchemyBaseRepository):
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_async_session)]):
+        super().__init__(model=ForecastRunModel, session=session)
+
+    async def get_by_id(self, obj_id: UUID) -> ForecastRunModel:
+        """Retrieve a run by its id (runs have no soft delete), always from the primary."""
+        # статус пишет другой воркер: реплика может ещё не знать о запуске
+        run = await self.session.scalar(
+            select(self._MODEL)
+            .where(self._MODEL.id == obj_id)
+            .execution_options(use_primary=True)
+        )
+        if run is None:
+            raise ObjectDoesNotExistException(
+                model_name=self._MODEL.__name__, object_id=obj_id
+            )
+        return run
+
+    async def create_pending(
+        self, run_id: UUID, params: dict[str, Any] | None = None
+    ) -> ForecastRunModel:
+        """Register a queued run (committed by the caller so that other workers can see it)."""
+        run = ForecastRunModel(
+            id=run_id,
+            status=StatusSearchEnum.PENDING.value,
+            params=params,
+            created_at=datetime.now(timezone.utc),
+        )
+        self.session.add(run)
+        await self.session.flush()
+        return run
+
+    async def start(self, run_id: UUID, params: dict[str, Any] | None = None) -> None:
+        """Mark a run as STARTED, creating it if it was not queued (committed by the caller)."""
+        now = datetime.now(timezone.utc)
+        stmt = insert(self.model).values(
+            id=run_id,
+            status=StatusSearchEnum.STARTED.value,
+            params=params,
+            started_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={
+                "status": stmt.excluded.status,
+                "params": stmt.excluded.params,
+                "started_at": stmt.excluded.started_at,
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def finish(
+        self,
+        run_id: UUID,
+        status: StatusSearchEnum,
+        cities: int | None = None,
+        data_fingerprint: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Set the final status of a run (committed by the caller)."""
+        stmt = (
+            update(self.model)
+            .where(self.model.id == run_id)
+            .values(
+                status=status.value,
+                cities=cities,
+                data_fingerprint=data_fingerprint,
+                error=error,
+                finished_at=datetime.now(timezone.utc),
+            )
+        )
+        await self.session.execute(stmt)
+
+    async def fail(self, run_id: UUID, error: str) -> None:
+        """Mark the run as ERROR (the caller rolls back its work first and commits after)."""
+        await self.finish(run_id, StatusSearchEnum.ERROR, error=error)
+
+    async def fail_active(self, error: str) -> int:
+        """
+        Mark every PENDING or STARTED run as ERROR (committed by the caller).
+
+        For runs left behind by a stopped worker; the caller makes sure that no run
+        is actually executing. Returns the number of affected runs.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.status.in_(ACTIVE_STATUSES))
+            .values(
+                status=StatusSearchEnum.ERROR.value,
+                error=error,
+                finished_at=datetime.now(timezone.utc),
+            )
+            .returning(self.model.id)
+        )
+        result: "Result" = await self.session.execute(stmt)
+        return len(result.scalars().all())
+
+    async def prune(self, keep: int) -> int:
+        """
+        Delete finished runs beyond the `keep` most recent ones, together with their forecasts.
+
+        Runs that still hold the current forecast of some geo (referenced from
+        `forecast_fingerprint`) are kept regardless of age.
+        """
+        recent: "Select" = (
+            select(self.model.id)
+            .where(self.model.status.not_in(ACTIVE_STATUSES))
+            .order_by(self.model.created_at.desc())
+            .limit(keep)
+        )
+        referenced: "Select" = select(ForecastFingerprintModel.run_id).where(
+            ForecastFingerprintModel.run_id.is_not(None)
+        )
+        stale: "Select" = select(self.model.id).where(
+            self.model.status.not_in(ACTIVE_STATUSES),
+            self.model.id.not_in(recent),
+            self.model.id.not_in(referenced),
+        )
+        result: "Result" = await self.session.execute(stale)
+        run_ids = result.scalars().all()
+        if not run_ids:
+            return 0
+
+        await self.session.execute(
+            delete(BuildingForecastModel).where(BuildingForecastModel.run_id.in_(run_ids))
+        )
+        await self.session.execute(delete(self.model).where(self.model.id.in_(run_ids)))
+        return len(run_ids)
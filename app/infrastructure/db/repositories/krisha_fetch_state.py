@@ -0,0 +1,39 @@
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy import select, Select, Result
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models import KrishaFetchStateModel
+from app.infrastructure.db.repositories.sqlalchemy_base import SqlAlchemyBaseRepository
+from app.infrastructure.db.sessions import get_async_session
+
+
+class KrishaFetchStateModelRepository(SqlAlchemyBaseRepository):
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_async_session)]):
+        super().__init__(model=KrishaFetchStateModel, session=session)
+
+    async def get_map(self) -> dict[str, KrishaFetchStateModel]:
+        """Return stored fetch states keyed by segment."""
+        stmt: "Select" = select(self._MODEL)
+        result: "Result" = await self.session.execute(stmt)
+        return {s.segment_key: s for s in result.scalars().all()}
+
+    async def upsert_many(self, states: list[dict]) -> None:
+        """Insert or replace fetch states."""
+        if not states:
+            return
+
+        stmt = insert(self.model).values(states)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["segment_key"],
+            set_={
+                "etag": stmt.excluded.etag,
+                "last_modified": stmt.excluded.last_modified,
+                "content_hash": stmt.excluded.content_hash,
+                "fetched_at": stmt.excluded.fetched_at,
+                "changed_at": stmt.excluded.changed_at,
+            },
+        )
+        await self.session.execute(stmt)
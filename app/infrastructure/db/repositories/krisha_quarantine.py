@@ -0,0 +1,25 @@
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models import KrishaQuarantineModel
+from app.infrastructure.db.repositories.sqlalchemy_base import SqlAlchemyBaseRepository
+from app.infrastructure.db.sessions import get_async_session
+
+
+class KrishaQuarantineModelRepository(SqlAlchemyBaseRepository):
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_async_session)]):
+        super().__init__(model=KrishaQuarantineModel, session=session)
+
+    async def add_many(self, segment_key: str | None, rejected: list[dict]) -> None:
+        """Store rejected rows (`{"payload", "reasons"}`) of one segment."""
+        if not rejected:
+            return
+
+        await self.session.execute(
+            insert(self.model).values(
+                [{"segment_key": segment_key, **row} for row in rejected]
+            )
+        )
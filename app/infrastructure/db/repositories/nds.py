@@ -1,6 +1,7 @@
 from datetime import date, datetime
 from typing import Annotated, Any
 
+import pandas as pd
 from fastapi import Depends
 from sqlalchemy import select, Select, Result
 from sqlalchemy.dialects.postgresql import insert
@@ -22,5 +23,14 @@ class NDSModelRepository(SqlAlchemyBaseRepository):
         filters = {**kwargs}
         stmt: "Select" = select(self._MODEL).filter_by(**filters)
         result: "Result" = await self.session.execute(stmt)
-        await self.session.close()
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+
+    async def get_frame(self) -> pd.DataFrame:
+        """All rows as a DataFrame with the columns used by the forecast."""
+        stmt: "Select" = select(
+            self._MODEL.year,
+            self._MODEL.percent.label("nds_rate"),
+        )
+        return await self.fetch_frame(
+            stmt, dtypes={"year": "int64", "nds_rate": "float64"}
+        )
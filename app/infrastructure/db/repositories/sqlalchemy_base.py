@@ -1,34 +1,196 @@
-from sqlalchemy import select
+from collections.abc import AsyncIterator, Sequence
+
+import pandas as pd
+from sqlalchemy import select, func, text, tuple_, update, delete, column, cast, literal_column
+from sqlalchemy import BigInteger, Text
+from sqlalchemy import values as values_clause
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions.exceptions import (
     ObjectDoesNotExistException,
     ObjectAlreadyExistException,
+    SoftDeleteNotSupportedException,
 )
+from app.core.settings import settings
 from app.core.type_vars import MODEL
 from .abstract import AbstractRepository
 from typing import Generic, Any, TYPE_CHECKING
 from sqlalchemy import UUID
 
 if TYPE_CHECKING:
-    from sqlalchemy import Select, Result
+    from sqlalchemy import ColumnElement, Select, Result, Row
 
 
 class SqlAlchemyBaseRepository(AbstractRepository[MODEL], Generic[MODEL]):
-    """Base repository implementation using SQLAlchemy for asynchronous database operations."""
+    """
+    Base repository implementation using SQLAlchemy for asynchronous database operations.
+
+    Writes are flushed, not committed: the session and its transaction belong to the
+    caller's `UnitOfWork`, and repositories never commit or close it.
+    """
 
     def __init__(self, model: type[MODEL], session: AsyncSession):
         super().__init__(model)
         self._MODEL = model
         self.session = session
 
+    async def _driver_connection(self):
+        """Return the asyncpg connection bound to the session's current transaction (e.g. for COPY)."""
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+
+    async def fetch_frame(
+        self, stmt: "Select", dtypes: dict[str, str], chunk_size: int = 10_000
+    ) -> pd.DataFrame:
+        """
+        Stream a Core select into a DataFrame column by column.
+
+        Rows are read through a server-side cursor in chunks and appended to per-column
+        lists, so no ORM entities or per-row dicts are created.
+
+        :param stmt: select of plain columns; labels become DataFrame column names.
+        :param dtypes: dtype for every selected column.
+        """
+        names = list(stmt.selected_columns.keys())
+        columns: list[list] = [[] for _ in names]
+        result = await self.session.stream(
+            stmt.execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.partitions():
+            for column, values in zip(columns, zip(*partition)):
+                column.extend(values)
+
+        return pd.DataFrame(dict(zip(names, columns)), columns=names).astype(dtypes)
+
+    def _select(self, columns: Sequence[str] = (), **filters: Any) -> "Select":
+        """Select of the whole entity, or only `columns` (rows instead of ORM objects)."""
+        if hasattr(self._MODEL, "is_deleted"):
+            filters.setdefault("is_deleted", False)
+        if columns:
+            stmt = select(*(getattr(self._MODEL, c) for c in columns))
+        else:
+            stmt = select(self._MODEL)
+        return stmt.filter_by(**filters)
+
+    def _not_deleted(self) -> list["ColumnElement[bool]"]:
+        """`is_deleted` guard for models with soft delete, nothing for the others."""
+        if hasattr(self._MODEL, "is_deleted"):
+            return [self._MODEL.is_deleted.is_(False)]
+        return []
+
+    async def stream(
+        self,
+        *columns: str,
+        batch_size: int | None = None,
+        **filters: Any,
+    ) -> AsyncIterator["MODEL | Row"]:
+        """
+        Iterate over matching objects through a server-side cursor in constant memory.
+
+        :param columns: project only these attributes; rows are yielded instead of objects.
+        :param batch_size: rows fetched per round trip (default `DB_YIELD_PER`).
+        """
+        stmt = self._select(columns, **filters).execution_options(
+            yield_per=batch_size or settings.DB_YIELD_PER
+        )
+        if columns:
+            result = await self.session.stream(stmt)
+        else:
+            result = await self.session.stream_scalars(stmt)
+        async for item in result:
+            yield item
+
+    async def paginate(
+        self,
+        *columns: str,
+        after: Any = None,
+        limit: int = 100,
+        order_by: str = "id",
+        **filters: Any,
+    ) -> list["MODEL | Row"]:
+        """
+        Page of matching objects ordered by `order_by` (keyset pagination).
+
+        Pages are ordered by `(order_by, id)` so that a non-unique sort key is stable.
+
+        :param after: key of the last row of the previous page: its `id` when ordering
+            by id, otherwise the `(order_by value, id)` pair (see `page_key`).
+        :param columns: project only these attributes; rows are returned instead of objects.
+        """
+        sort_key = getattr(self._MODEL, order_by)
+        stmt = self._select(columns, **filters)
+        if order_by == "id":
+            if after is not None:
+                stmt = stmt.where(self._MODEL.id > after)
+            stmt = stmt.order_by(self._MODEL.id)
+        else:
+            if after is not None:
+                stmt = stmt.where(tuple_(sort_key, self._MODEL.id) > tuple_(*after))
+            stmt = stmt.order_by(sort_key, self._MODEL.id)
+        result: "Result" = await self.session.execute(stmt.limit(limit))
+        return result.all() if columns else result.scalars().all()
+
+    @staticmethod
+    def page_key(item: "MODEL | Row", order_by: str = "id") -> Any:
+        """Keyset of an item for the `after` argument of `paginate` (projections must include `id`)."""
+        if order_by == "id":
+            return item.id
+        return getattr(item, order_by), item.id
+
+    async def count(self, **filters: Any) -> int:
+        """Exact number of matching rows."""
+        stmt: "Select" = select(func.count()).select_from(
+            self._select(**filters).subquery()
+        )
+        return await self.session.scalar(stmt)
+
+    async def estimate_count(self) -> int:
+        """
+        Approximate number of rows from planner statistics (`pg_class.reltuples`).
+
+        Costs one catalog lookup regardless of table size; partitions are summed.
+        The estimate is as fresh as the last VACUUM/ANALYZE.
+        """
+        result: "Result" = await self.session.execute(
+            text(
+                """
+                SELECT coalesce(sum(greatest(c.reltuples, 0)), 0)::bigint
+                FROM pg_class c
+                WHERE c.relkind <> 'p'
+                  AND (
+                    c.oid = CAST(:table AS regclass)
+                    OR c.oid IN (
+                        SELECT inhrelid FROM pg_inherits
+                        WHERE inhparent = CAST(:table AS regclass)
+                    )
+                  )
+                """
+            ),
+            {"table": self._MODEL.__tablename__},
+        )
+        return result.scalar_one()
+
+    async def version_stamp(self) -> tuple[int, Any, int | None]:
+        """
+        Cheap change stamp of the whole table: row count, max id and max `xmin`.
+
+        `xmin` changes on every insert and update, the count on deletes, so the stamp
+        differs whenever the table content may have changed. Meant for small tables.
+        """
+        xmin = cast(cast(literal_column("xmin"), Text), BigInteger)
+        stmt: "Select" = select(
+            func.count(), func.max(self._MODEL.id), func.max(xmin)
+        ).select_from(self._MODEL)
+        result: "Result" = await self.session.execute(stmt)
+        return tuple(result.one())
+
     async def get_by_id(self, obj_id: int | str | UUID) -> MODEL | None:
         """Retrieve an object by its unique identifier."""
         stmt: "Select" = select(self._MODEL).filter_by(id=obj_id, is_deleted=False)
         resp: "Result" = await self.session.execute(stmt)
         result = resp.scalar()
-        await self.session.close()
         if result:
             return result
         else:
@@ -41,21 +203,19 @@ class SqlAlchemyBaseRepository(AbstractRepository[MODEL], Generic[MODEL]):
         filters = {**kwargs, "is_deleted": False}
         stmt: "Select" = select(self._MODEL).filter_by(**filters)
         result: "Result" = await self.session.execute(stmt)
-        await self.session.close()
         return result.scalars().all()
 
     async def create(self, **kwargs: dict[str, Any]) -> MODEL | None:
         """Create a new object with the given attributes and return it."""
         obj: MODEL = self._MODEL(**kwargs)
-        self.session.add(obj)
         try:
-            await self.session.commit()
-            await self.session.refresh(obj)
-            return obj
+            # savepoint: a duplicate must not abort the caller's transaction
+            async with self.session.begin_nested():
+                self.session.add(obj)
         except IntegrityError:
-            await self.session.rollback()
-        finally:
-            await self.session.close()
+            return None
+        await self.session.refresh(obj)
+        return obj
 
     async def update(
         self, obj_id: int | str | UUID, **kwargs: dict[str, Any]
@@ -71,9 +231,8 @@ class SqlAlchemyBaseRepository(AbstractRepository[MODEL], Generic[MODEL]):
                     setattr(obj, key, value)
 
             self.session.add(obj)
-            await self.session.commit()
+            await self.session.flush()
             await self.session.refresh(obj)
-            await self.session.close()
             return obj
         else:
             raise ObjectDoesNotExistException(
@@ -88,8 +247,7 @@ class SqlAlchemyBaseRepository(AbstractRepository[MODEL], Generic[MODEL]):
         obj: MODEL = result.scalars().first()
         if obj:
             await self.session.delete(obj)
-            await self.session.commit()
-            await self.session.close()
+            await self.session.flush()
         else:
             raise ObjectDoesNotExistException(
                 model_name=self._MODEL.__name__, object_id=obj_id
@@ -104,9 +262,88 @@ class SqlAlchemyBaseRepository(AbstractRepository[MODEL], Generic[MODEL]):
         if obj:
             obj.is_deleted = True
             self.session.add(obj)
-            await self.session.commit()
-            await self.session.close()
+            await self.session.flush()
         else:
             raise ObjectDoesNotExistException(
                 model_name=self._MODEL.__name__, object_id=obj_id
             )
+
+    async def get_by_ids(self, obj_ids: Sequence[int | str | UUID]) -> list[MODEL]:
+        """Retrieve the objects with the given identifiers in one query (missing ones are skipped)."""
+        if not obj_ids:
+            return []
+        stmt: "Select" = self._select().where(self._MODEL.id.in_(obj_ids))
+        result: "Result" = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def bulk_update(self, values: Sequence[dict[str, Any]]) -> list[MODEL]:
+        """
+        Update several objects with per-object values.
+
+        Items with the same set of keys are written by one
+        `UPDATE ... FROM (VALUES ...) WHERE id = v.id RETURNING` statement.
+        Soft-deleted objects are skipped, as in `update`.
+
+        :param values: items with the object's `id` and the attributes to set.
+        :return: the updated objects.
+        """
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for item in values:
+            keys = tuple(sorted(k for k in item if k != "id"))
+            if keys:
+                groups.setdefault(keys, []).append(item)
+
+        table = self._MODEL.__table__
+        updated = []
+        for keys, items in groups.items():
+            source = values_clause(
+                *(column(name, table.c[name].type) for name in ("id", *keys)),
+                name="v",
+            ).data([tuple(item[name] for name in ("id", *keys)) for item in items])
+            stmt = (
+                update(self._MODEL)
+                .where(self._MODEL.id == source.c.id, *self._not_deleted())
+                .values({name: source.c[name] for name in keys})
+                .returning(self._MODEL)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            result: "Result" = await self.session.execute(stmt)
+            updated.extend(result.scalars().all())
+        return updated
+
+    async def bulk_delete(
+        self, obj_ids: Sequence[int | str | UUID]
+    ) -> list[int | str | UUID]:
+        """Delete the objects with the given identifiers in one statement."""
+        if not obj_ids:
+            return []
+        stmt = (
+            delete(self._MODEL)
+            .where(self._MODEL.id.in_(obj_ids))
+            .returning(self._MODEL.id)
+            .execution_options(synchronize_session=False)
+        )
+        result: "Result" = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def bulk_soft_delete(
+        self, obj_ids: Sequence[int | str | UUID]
+    ) -> list[int | str | UUID]:
+        """
+        Soft delete the not yet deleted objects with the given identifiers.
+
+        :raises SoftDeleteNotSupportedException: the model has no `is_deleted` column.
+        """
+        if not hasattr(self._MODEL, "is_deleted"):
+            raise SoftDeleteNotSupportedException(model_name=self._MODEL.__name__)
+        if not obj_ids:
+            return []
+        stmt = (
+            update(self._MODEL)
+            .where(self._MODEL.id.in_(obj_ids), self._MODEL.is_deleted.is_not(True))
+            .values(is_deleted=True)
+            .returning(self._MODEL.id)
+            .execution_options(synchronize_session=False)
+        )
+        result: "Result" = await self.session.execute(stmt)
+        return result.scalars().all()
@@ -1,30 +1,224 @@
-from collections.abc import AsyncGenerator
+import re
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Annotated
 
+from fastapi import Depends
+
+from sqlalchemy import Engine, event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     AsyncEngine,
-    create_async_engine,
     async_sessionmaker,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
 
 from app.core.settings import settings
+from app.infrastructure.db.pool import create_pooled_engine, warmup_pool
+
+engine: AsyncEngine = create_pooled_engine(settings.DB_URL)
+replica_engine: AsyncEngine | None = (
+    create_pooled_engine(settings.DB_REPLICA_URL, name="replica")
+    if settings.DB_REPLICA_URL
+    else None
+)
+
+# время последнего commit с записью в этом процессе (read-your-writes)
+_last_write_at = float("-inf")
+# все чтения текущей задачи идут в primary (см. `primary_reads`)
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+# текстовый SQL, который считается чтением, и блокировки строк в нём
+_READ_SQL = re.compile(r"^\s*(SELECT|SHOW)\b", re.IGNORECASE)
+_LOCKING_SQL = re.compile(r"\bFOR\s+(NO\s+KEY\s+)?(UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE)
+
+
+def _is_read(clause) -> bool:
+    if isinstance(clause, TextClause):
+        return bool(_READ_SQL.match(clause.text))
+    return getattr(clause, "is_select", False)
+
+
+def _locks_rows(clause) -> bool:
+    if isinstance(clause, TextClause):
+        return bool(_LOCKING_SQL.search(clause.text))
+    return getattr(clause, "_for_update_arg", None) is not None
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """
+    Направляет все чтения текущей задачи в primary.
+
+    Для чтений, результат которых живёт дольше запроса (кэши): отстающая реплика
+    может ещё не видеть последний commit другого процесса.
+    """
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+class RoutingSession(Session):
+    """
+    Отправляет чтения на реплику, всё остальное — в primary.
+
+    Чтения — это SELECT, `text("SELECT ...")` / `text("SHOW ...")` и любые запросы
+    с опцией выполнения `read_only=True`. Чтение всё же идёт в primary, если оно
+    блокирует строки (`FOR UPDATE` / `FOR SHARE`), если текущая транзакция уже
+    писала, в течение DB_REPLICA_PIN_SECONDS после любого commit с записью в этом
+    процессе (отставание репликации) и внутри `primary_reads()`. Опция выполнения
+    `use_primary` или `bind_arguments={"use_primary": True}` отправляет чтение
+    в primary, не считая его записью. Read-only снимок (`UnitOfWork.snapshot`)
+    остаётся на движке, выбранном при открытии, и никогда не считается записью.
+    Без настроенной реплики всё идёт в primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, use_primary: bool = False, **kw) -> Engine:
+        if replica_engine is None:
+            return engine.sync_engine
+
+        if self.info.get("read_only"):
+            # снимок целиком на движке, выбранном при его открытии, и ничего не пишет
+            return self.info.get("snapshot_bind") or self._snapshot_bind()
+
+        if clause is None:
+            # flush или session.connection()
+            self.info["wrote"] = True
+            return engine.sync_engine
+
+        options = getattr(clause, "get_execution_options", dict)()
+        use_primary = use_primary or options.get("use_primary", False)
+        if not (use_primary or options.get("read_only") or _is_read(clause)):
+            self.info["wrote"] = True
+            return engine.sync_engine
+        if use_primary or _locks_rows(clause) or self._pinned():
+            return engine.sync_engine
+        return replica_engine.sync_engine
+
+    def _snapshot_bind(self) -> Engine:
+        return engine.sync_engine if self._pinned() else replica_engine.sync_engine
+
+    def _pinned(self) -> bool:
+        return (
+            self.info.get("wrote", False)
+            or _primary_reads.get()
+            or time.monotonic() - _last_write_at < settings.DB_REPLICA_PIN_SECONDS
+        )
 
-engine: AsyncEngine = create_async_engine(
-    url=settings.DB_URL,
-    pool_pre_ping=True,
-    isolation_level="READ COMMITTED",
-    future=True,
-    connect_args={"timeout": 60},
-    echo=False,
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session: Session) -> None:
+    global _last_write_at
+    if session.info.pop("wrote", False):
+        _last_write_at = time.monotonic()
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_write(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+async_session_maker = async_sessionmaker(
+    sync_session_class=RoutingSession, expire_on_commit=False
 )
 
-async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+async def warmup_engine() -> None:
+    """Fill the pools at startup (DB_POOL_WARMUP connections, by default DB_POOL_SIZE)."""
+    size = settings.DB_POOL_WARMUP
+    for pooled in (engine, replica_engine):
+        if pooled is not None:
+            await warmup_pool(pooled, settings.DB_POOL_SIZE if size is None else size)
+
+
+async def dispose_engines() -> None:
+    for pooled in (engine, replica_engine):
+        if pooled is not None:
+            await pooled.dispose()
+
+
+class UnitOfWork:
+    """
+    Owns one session and its transaction for a request or a job.
+
+    Repositories share `session` and never commit or close it. The transaction is
+    committed on a clean exit and rolled back on an exception; jobs may `commit()`
+    in between to make progress visible (e.g. after every ingested segment).
+    With `read_only=True` the whole unit runs in one REPEATABLE READ, READ ONLY
+    snapshot and is never committed.
+    """
+
+    def __init__(self, session: AsyncSession | None = None, read_only: bool = False):
+        self.session = session or async_session_maker()
+        self.read_only = read_only
+
+    async def __aenter__(self) -> "UnitOfWork":
+        if self.read_only:
+            await self._begin_snapshot()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None and not self.read_only:
+                await self.session.commit()
+            else:
+                await self.session.rollback()
+        finally:
+            await self.session.close()
+
+    async def _begin_snapshot(self) -> None:
+        # движок выбирается один раз: весь снимок идёт на реплику или весь на primary
+        self.session.info["read_only"] = True
+        self.session.info["snapshot_bind"] = self.session.get_bind()
+        await self.session.connection(
+            execution_options={
+                "isolation_level": "REPEATABLE READ",
+                "postgresql_readonly": True,
+            }
+        )
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    @asynccontextmanager
+    async def snapshot(self) -> AsyncIterator[None]:
+        """
+        Run a group of reads in one REPEATABLE READ, READ ONLY transaction.
+
+        Inside an already open transaction the reads simply join it.
+        """
+        if self.session.in_transaction():
+            yield
+            return
+
+        await self._begin_snapshot()
+        try:
+            yield
+        finally:
+            # commit, not rollback: rollback would expire the loaded objects
+            await self.session.commit()
+            self.session.info.pop("read_only", None)
+            self.session.info.pop("snapshot_bind", None)
+
+
+async def get_unit_of_work() -> AsyncGenerator[UnitOfWork, None]:
+    """Dependency providing the request's unit of work (committed after the handler)."""
+    async with UnitOfWork() as uow:
+        yield uow
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_async_session(
+    uow: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+) -> AsyncSession:
     """
     Dependency function to provide an asynchronous SQLAlchemy session.
-    Ensures proper management of session lifecycle.
+    The session belongs to the request's unit of work, which manages its lifecycle.
     """
-    async with async_session_maker() as session:
-        yield session
+    return uow.session
@@ -1,11 +1,150 @@
+import asyncio
+import random
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
 import httpx
 
+from app.core import logger, settings
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.exceptions.exceptions import HttpConnectionException
+
 URL = "https://krisha.kz/spa-api/content/analytics/sale?id=0&rooms&buildingType&mode=short"
 
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
-async def fetch_krisha_data():
-    async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
-        response = await client.get(URL)
+
+class RateLimiter:
+    """Ограничивает частоту запросов: не чаще `rate` стартов в секунду."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class KrishaClient:
+    """
+    Long-lived HTTP client for krisha.kz.
+
+    One pooled `httpx.AsyncClient` (HTTP/2, keep-alive) is shared by all requests,
+    request starts are rate limited per host.
+    Transport errors, timeouts, 429 and 5xx are retried with jittered exponential
+    backoff; the whole retry loop runs inside a circuit breaker, so a krisha outage
+    fails fast instead of hanging every scheduled ingest. Other 4xx responses are
+    returned as is: they concern a single request and are neither retried nor counted
+    by the breaker.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._limiters: dict[str, RateLimiter] = defaultdict(
+            lambda: RateLimiter(settings.KRISHA_RATE_LIMIT)
+        )
+        self.breaker = CircuitBreaker(
+            service="krisha",
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.CIRCUIT_RECOVERY_TIMEOUT,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url or "",
+                http2=True,
+                timeout=httpx.Timeout(
+                    connect=settings.KRISHA_CONNECT_TIMEOUT,
+                    read=settings.KRISHA_READ_TIMEOUT,
+                    write=settings.KRISHA_CONNECT_TIMEOUT,
+                    pool=settings.KRISHA_CONNECT_TIMEOUT,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.KRISHA_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.KRISHA_MAX_CONNECTIONS,
+                ),
+                headers={"Accept": "application/json"},
+                transport=self.transport,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def _backoff(attempt: int, response: httpx.Response | None = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), settings.KRISHA_BACKOFF_MAX)
+        # full jitter
+        return random.uniform(
+            0,
+            min(settings.KRISHA_BACKOFF_MAX, settings.KRISHA_BACKOFF_BASE * 2**attempt),
+        )
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = None
+            await self._limiters[urlsplit(url).hostname or ""].wait()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUSES:
+                    # 2xx, 304 и прочие 4xx: сервис ответил, решение за вызывающим
+                    return response
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {e}"
+
+            if attempt >= settings.KRISHA_MAX_RETRIES:
+                logger.error(
+                    f"Krisha {method} {url} failed after {attempt + 1} attempts: {error}"
+                )
+                raise HttpConnectionException(url)
+
+            delay = self._backoff(attempt, response)
+            logger.warning(
+                f"Krisha {method} {url} attempt {attempt + 1} failed ({error}), "
+                f"retry in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET with retries.
+
+        `304 Not Modified` and non-retryable 4xx are returned as is, check `status_code`.
+        """
+        return await self.breaker.call(lambda: self._request("GET", url, **kwargs))
+
+    async def get_json(self, url: str, **kwargs):
+        response = await self.get(url, **kwargs)
         response.raise_for_status()
-        data = response.json()
-        return data
+        return response.json()
+
+
+krisha_client = KrishaClient()
+
+
+async def fetch_krisha_data():
+    return await krisha_client.get_json(URL)
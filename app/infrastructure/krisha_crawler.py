@@ -0,0 +1,275 @@
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from app.core import logger, settings
+from app.core.metrics import KRISHA_SEGMENTS_SKIPPED
+from app.infrastructure.krisha_analitic import KrishaClient, krisha_client
+from app.infrastructure.payload_archive import PayloadArchive
+
+ANALYTICS_URL = "https://krisha.kz/spa-api/content/analytics/sale"
+
+# приоритет сегментов: сначала общие срезы по регионам, затем разбивки
+PRIORITY_REGION = 0
+PRIORITY_ROOMS = 1
+PRIORITY_BUILDING = 2
+PRIORITY_ROOMS_BUILDING = 3
+
+
+@dataclass(frozen=True, order=True)
+class KrishaSegment:
+    """Срез аналитики krisha: регион × количество комнат × тип дома."""
+
+    priority: int
+    geo: int
+    rooms: str | None = None
+    building: str | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.geo}:{self.rooms or ''}:{self.building or ''}"
+
+    def params(self) -> dict[str, str | int]:
+        return {
+            "id": self.geo,
+            "rooms": self.rooms or "",
+            "buildingType": self.building or "",
+            "mode": "short",
+        }
+
+    @classmethod
+    def from_params(cls, params: dict, priority: int = 0) -> "KrishaSegment":
+        return cls(
+            priority,
+            int(params["id"]),
+            rooms=params.get("rooms") or None,
+            building=params.get("buildingType") or None,
+        )
+
+
+@dataclass
+class CrawlStats:
+    segments: int = 0
+    fetched: int = 0
+    changed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    rows: int = 0
+    # строки, реально вставленные или изменённые в БД (считает sink)
+    written: int = 0
+    errors: list[str] = field(default_factory=list)
+    # новое состояние запросов по срезам (`krisha_fetch_state`)
+    states: list[dict] = field(default_factory=list)
+
+
+def build_segments(
+    geos: Iterable[int],
+    rooms: Iterable[str] | None = None,
+    building_types: Iterable[str] | None = None,
+) -> list[KrishaSegment]:
+    """Перечисляет пространство срезов, упорядоченное по приоритету."""
+    rooms = list(settings.KRISHA_SEGMENT_ROOMS if rooms is None else rooms)
+    building_types = list(
+        settings.KRISHA_SEGMENT_BUILDING_TYPES
+        if building_types is None
+        else building_types
+    )
+
+    segments = []
+    for geo in dict.fromkeys(geos):
+        segments.append(KrishaSegment(PRIORITY_REGION, geo))
+        segments.extend(KrishaSegment(PRIORITY_ROOMS, geo, rooms=r) for r in rooms)
+        segments.extend(
+            KrishaSegment(PRIORITY_BUILDING, geo, building=b) for b in building_types
+        )
+        segments.extend(
+            KrishaSegment(PRIORITY_ROOMS_BUILDING, geo, rooms=r, building=b)
+            for r in rooms
+            for b in building_types
+        )
+    return sorted(segments)
+
+
+def segment_rows(segment: KrishaSegment, payload) -> list[dict]:
+    """Строки ответа krisha с проставленными из среза `rooms`/`building`."""
+    rows = payload if isinstance(payload, list) else [payload]
+    for row in rows:
+        if not isinstance(row, dict):
+            continue  # отклонится при валидации
+        if not row.get("rooms"):
+            row["rooms"] = segment.rooms
+        if not row.get("building"):
+            row["building"] = segment.building
+    return rows
+
+
+class KrishaCrawler:
+    """
+    Обходит срезы аналитики krisha с ограниченной параллельностью.
+
+    Срезы берутся из очереди с приоритетами; частота запросов к хосту ограничивается
+    в `KrishaClient`. Строки каждого среза сразу передаются в `sink`, не дожидаясь
+    окончания обхода; вызовы `sink` выполняются по одному (общая сессия БД).
+
+    Запросы условные (If-None-Match / If-Modified-Since по сохранённому состоянию).
+    Если сервер ответил 304 или хэш тела совпал с прошлым, срез пропускается
+    без разбора JSON и обращения к БД. Каждое полученное тело сохраняется
+    в `archive` (если задан) для последующего replay.
+    """
+
+    def __init__(
+        self,
+        client: KrishaClient = krisha_client,
+        concurrency: int | None = None,
+        archive: PayloadArchive | None = None,
+    ):
+        self.client = client
+        self.concurrency = concurrency or settings.KRISHA_CONCURRENCY
+        self.archive = archive
+
+    async def crawl(
+        self,
+        segments: list[KrishaSegment],
+        sink: Callable[[KrishaSegment, list[dict]], Awaitable[None]],
+        states: Mapping[str, Any] | None = None,
+    ) -> CrawlStats:
+        """
+        :param states: прошлое состояние по `KrishaSegment.key`
+            (объекты с атрибутами `etag`, `last_modified`, `content_hash`, `changed_at`).
+        """
+        states = states or {}
+        stats = CrawlStats(segments=len(segments))
+        queue: asyncio.PriorityQueue[KrishaSegment] = asyncio.PriorityQueue()
+        for segment in segments:
+            queue.put_nowait(segment)
+        sink_lock = asyncio.Lock()
+
+        async def worker() -> None:
+            while True:
+                try:
+                    segment = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                previous = states.get(segment.key)
+                try:
+                    response = await self.client.get(
+                        ANALYTICS_URL,
+                        params=segment.params(),
+                        headers=self._conditional_headers(previous),
+                    )
+                    stats.fetched += 1
+                    fetched_at = datetime.now(timezone.utc)
+
+                    if response.status_code == HTTP_304_NOT_MODIFIED:
+                        self._skip(
+                            stats, segment, previous, response, fetched_at, "not_modified"
+                        )
+                        continue
+                    if response.is_client_error or not response.content.strip():
+                        # нет такого среза или он пуст: пропускаем, прошлое состояние не трогаем
+                        reason = "client_error" if response.is_client_error else "empty"
+                        KRISHA_SEGMENTS_SKIPPED.labels(reason=reason).inc()
+                        stats.skipped += 1
+                        logger.info(
+                            f"Krisha segment {segment} skipped: HTTP {response.status_code} ({reason})"
+                        )
+                        continue
+                    content_hash = hashlib.sha256(response.content).hexdigest()
+                    await self._archive(
+                        segment, response.content, fetched_at, content_hash
+                    )
+                    if previous is not None and previous.content_hash == content_hash:
+                        self._skip(
+                            stats, segment, previous, response, fetched_at, "same_hash"
+                        )
+                        continue
+
+                    rows = segment_rows(segment, response.json())
+                    async with sink_lock:
+                        await sink(segment, rows)
+                    stats.changed += 1
+                    stats.rows += len(rows)
+                    stats.states.append(
+                        {
+                            "segment_key": segment.key,
+                            "etag": response.headers.get("ETag"),
+                            "last_modified": response.headers.get("Last-Modified"),
+                            "content_hash": content_hash,
+                            "fetched_at": fetched_at,
+                            "changed_at": fetched_at,
+                        }
+                    )
+                except Exception as e:
+                    stats.failed += 1
+                    stats.errors.append(f"{segment}: {type(e).__name__}: {e}")
+                    logger.warning(f"Krisha segment {segment} failed: {e}")
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(self.concurrency, len(segments))))
+        )
+        logger.info(
+            f"Krisha crawl: {stats.fetched}/{stats.segments} segments, "
+            f"{stats.changed} changed, {stats.skipped} unchanged, "
+            f"{stats.rows} rows, {stats.failed} failed"
+        )
+        return stats
+
+    async def _archive(
+        self,
+        segment: KrishaSegment,
+        body: bytes,
+        fetched_at: datetime,
+        content_hash: str,
+    ) -> None:
+        if self.archive is None:
+            return
+        try:
+            await asyncio.to_thread(
+                self.archive.store,
+                segment.key,
+                segment.params(),
+                body,
+                fetched_at,
+                content_hash,
+            )
+        except OSError as e:
+            # архив вспомогательный: его ошибка не должна срывать загрузку
+            logger.warning(f"Krisha payload for {segment.key} not archived: {e}")
+
+    @staticmethod
+    def _conditional_headers(previous) -> dict[str, str]:
+        headers = {}
+        if previous is not None and previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous is not None and previous.last_modified:
+            headers["If-Modified-Since"] = previous.last_modified
+        return headers
+
+    @staticmethod
+    def _skip(
+        stats: CrawlStats,
+        segment: KrishaSegment,
+        previous,
+        response,
+        fetched_at: datetime,
+        reason: str,
+    ) -> None:
+        KRISHA_SEGMENTS_SKIPPED.labels(reason=reason).inc()
+        stats.skipped += 1
+        stats.states.append(
+            {
+                "segment_key": segment.key,
+                "etag": response.headers.get("ETag") or previous.etag,
+                "last_modified": (
+                    response.headers.get("Last-Modified") or previous.last_modified
+                ),
+                "content_hash": previous.content_hash,
+                "fetched_at": fetched_at,
+                "changed_at": previous.changed_at,
+            }
+        )
@@ -0,0 +1,65 @@
+import os
+from pathlib import Path
+
+from app.core import logger, settings
+
+
+class ProphetModelStore:
+    """
+    Локальное хранилище обученных моделей Prophet в JSON (prophet.serialize).
+
+    Одна модель на geo. Время модификации файла используется как метка последнего
+    обращения: при превышении лимитов по количеству или размеру удаляются самые
+    давно использованные модели. Объект хранит только пути и лимиты, поэтому
+    его можно передавать в дочерние процессы.
+    """
+
+    def __init__(self, root: str, max_entries: int, max_bytes: int):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def path(self, geo: int) -> Path:
+        return self.root / f"{geo}.json"
+
+    def load(self, geo: int) -> str | None:
+        path = self.path(geo)
+        try:
+            model_json = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        path.touch()
+        return model_json
+
+    def save(self, geo: int, model_json: str) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path(geo)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(model_json, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def evict(self) -> None:
+        """Удаляет самые давно использованные модели сверх лимитов."""
+        if not self.root.exists():
+            return
+
+        entries = sorted(
+            (path.stat().st_mtime, path.stat().st_size, path)
+            for path in self.root.glob("*.json")
+        )
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (
+            len(entries) > self.max_entries or total_bytes > self.max_bytes
+        ):
+            _, size, path = entries.pop(0)
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            logger.info(f"Evicted cached Prophet model {path.name}")
+
+
+def get_model_store() -> ProphetModelStore:
+    return ProphetModelStore(
+        root=settings.FORECAST_MODEL_DIR,
+        max_entries=settings.FORECAST_MODEL_STORE_MAX_ENTRIES,
+        max_bytes=settings.FORECAST_MODEL_STORE_MAX_BYTES,
+    )
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import zstandard
+
+from app.core import settings
+
+MANIFEST = "manifest.jsonl"
+
+
+class PayloadArchive:
+    """
+    Архив сырых ответов krisha на локальном диске.
+
+    Тело ответа сжимается zstd и хранится по sha256 (`objects/ab/<hash>.zst`),
+    поэтому одинаковые ответы занимают место один раз. Каждый ответ дописывается
+    строкой в `manifest.jsonl`: хэш, срез, параметры запроса и время получения.
+    Операции синхронные — вызываются через `asyncio.to_thread`. Строки манифеста
+    дописываются одним `write()` под блокировкой, поэтому потоки одного процесса
+    их не перемешивают; писать в один архив из нескольких процессов не следует.
+    """
+
+    def __init__(self, root: str, level: int = 10):
+        self.root = Path(root)
+        self.level = level
+        self._manifest_lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST
+
+    def object_path(self, content_hash: str) -> Path:
+        return self.root / "objects" / content_hash[:2] / f"{content_hash}.zst"
+
+    def store(
+        self,
+        segment_key: str,
+        params: dict[str, Any],
+        body: bytes,
+        fetched_at: datetime,
+        content_hash: str | None = None,
+    ) -> str:
+        content_hash = content_hash or hashlib.sha256(body).hexdigest()
+        path = self.object_path(content_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            compressor = zstandard.ZstdCompressor(level=self.level)
+            tmp_path.write_bytes(compressor.compress(body))
+            os.replace(tmp_path, path)
+
+        entry = {
+            "hash": content_hash,
+            "segment": segment_key,
+            "params": params,
+            "fetched_at": fetched_at.isoformat(),
+            "size": len(body),
+        }
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode()
+        # потоки процесса пишут по очереди; O_APPEND ставит каждую запись в конец файла
+        with self._manifest_lock:
+            fd = os.open(self.manifest_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        return content_hash
+
+    def load(self, content_hash: str) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(
+            self.object_path(content_hash).read_bytes()
+        )
+
+    def entries(
+        self, date_from: date | None = None, date_to: date | None = None
+    ) -> list[dict]:
+        """Записи манифеста за период (по дате получения), от старых к новым."""
+        if not self.manifest_path.exists():
+            return []
+
+        entries = []
+        with self.manifest_path.open(encoding="utf-8") as manifest:
+            for line in manifest:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                fetched_on = datetime.fromisoformat(entry["fetched_at"]).date()
+                if date_from is not None and fetched_on < date_from:
+                    continue
+                if date_to is not None and fetched_on > date_to:
+                    continue
+                entries.append(entry)
+        return sorted(entries, key=lambda e: e["fetched_at"])
+
+
+def get_payload_archive() -> PayloadArchive | None:
+    if not settings.KRISHA_ARCHIVE_DIR:
+        return None
+    return PayloadArchive(
+        settings.KRISHA_ARCHIVE_DIR, level=settings.KRISHA_ARCHIVE_LEVEL
+    )
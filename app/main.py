@@ -9,20 +9,38 @@ from app.core.middleware.metrics import RequestMetricsMiddleware
 from app.core.routers import bind_routers
 from app.core.scheduler import scheduler
 
+from app.core.tasks.forecast_jobs import forecast_jobs
 from app.core.tasks.startup import start_scheduler
+from app.infrastructure.adapters.redis import redis_adapter
+from app.infrastructure.db.sessions import dispose_engines, warmup_engine
+from app.infrastructure.krisha_analitic import krisha_client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await redis_adapter.connect()
     try:
-        await start_scheduler()
+        await warmup_engine()
     except Exception as e:
-        logger.exception(f"Ошибка start_scheduler: {e}")
-    yield
+        logger.warning(f"Ошибка прогрева пула БД: {e}")
     try:
-        scheduler.shutdown(wait=False)
+        await forecast_jobs.fail_orphaned()
     except Exception as e:
-        logger.warning(f"Ошибка при завершении scheduler: {e}")
+        logger.warning(f"Ошибка проверки прерванных прогнозов: {e}")
+    if settings.SCHEDULER_ENABLED:
+        try:
+            await start_scheduler()
+        except Exception as e:
+            logger.exception(f"Ошибка start_scheduler: {e}")
+    yield
+    if scheduler.running:
+        try:
+            scheduler.shutdown(wait=False)
+        except Exception as e:
+            logger.warning(f"Ошибка при завершении scheduler: {e}")
+    await krisha_client.close()
+    await redis_adapter.close()
+    await dispose_engines()
 
 
 def setup_application():
@@ -30,7 +48,7 @@ def setup_application():
         title="Real Estate Analisis",
         version=settings.version,
         docs_url="/swagger",
-        # lifespan=lifespan,
+        lifespan=lifespan,
     )
     app_.add_middleware(I18nMiddleware)
     bind_routers(app=app_)
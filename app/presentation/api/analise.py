@@ -0,0 +1,81 @@
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request
+from starlette.status import HTTP_200_OK
+
+from app.core.schemas import BaseResponseSchema
+from app.domain.analise.service import AnaliseService
+
+analise_router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@analise_router.get(
+    "/history/{geo}",
+    response_model=BaseResponseSchema,
+    status_code=HTTP_200_OK,
+    summary="История цен города",
+    description="Без `rooms`/`building` отдаётся общий срез по региону. "
+    "Страницы по курсору: ссылка `next` из `pagination.links` "
+    "содержит курсор следующей страницы.",
+)
+async def get_history(
+    request: Request,
+    geo: int,
+    service: Annotated[AnaliseService, Depends()],
+    date_from: date | None = None,
+    date_to: date | None = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: str | None = None,
+    rooms: str | None = None,
+    building: str | None = None,
+):
+    return await service.get_history(
+        str(request.url),
+        geo,
+        date_from,
+        date_to,
+        limit=limit,
+        cursor=cursor,
+        rooms=rooms,
+        building=building,
+    )
+
+
+@analise_router.get(
+    "/monthly/{geo}",
+    response_model=BaseResponseSchema,
+    status_code=HTTP_200_OK,
+    summary="Помесячные агрегаты цен города",
+    description="Средняя и медианная цена, цена в тенге и количество объектов "
+    "по месяцам (общий срез по региону).",
+)
+async def get_monthly(
+    request: Request,
+    geo: int,
+    service: Annotated[AnaliseService, Depends()],
+    date_from: date | None = None,
+    date_to: date | None = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: str | None = None,
+):
+    return await service.get_monthly(
+        str(request.url), geo, date_from, date_to, limit=limit, cursor=cursor
+    )
+
+
+@analise_router.get(
+    "/latest",
+    response_model=BaseResponseSchema,
+    status_code=HTTP_200_OK,
+    summary="Последний срез по всем городам",
+)
+async def get_latest_snapshot(
+    request: Request,
+    service: Annotated[AnaliseService, Depends()],
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: str | None = None,
+):
+    return await service.get_latest_snapshot(
+        str(request.url), limit=limit, cursor=cursor
+    )
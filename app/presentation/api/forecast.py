@@ -0,0 +1,106 @@
+from datetime import date
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from starlette.status import HTTP_200_OK, HTTP_202_ACCEPTED, HTTP_409_CONFLICT
+
+from app.core.enums import StatusSearchEnum
+from app.core.schemas import BaseResponseSchema
+from app.core.tasks.forecast_jobs import forecast_jobs
+from app.domain.analise.service import AnaliseService
+from app.domain.forecast.schemas import CityForecastSchema, ForecastScenarioSchema
+from app.domain.forecast.service import ForecastService
+
+forecast_router = APIRouter(prefix="/forecasts", tags=["Forecast"])
+
+
+@forecast_router.post(
+    "/jobs",
+    response_model=BaseResponseSchema,
+    status_code=HTTP_202_ACCEPTED,
+    summary="Запуск прогноза в фоне",
+    description="Ставит прогноз цен в очередь и сразу возвращает идентификатор задачи. "
+    "По умолчанию переобучаются только города с изменившейся историей, "
+    "`force=true` переобучает все.",
+)
+async def submit_forecast_job(force: bool = False):
+    return BaseResponseSchema(data=[await forecast_jobs.submit(force=force)])
+
+
+@forecast_router.get(
+    "/jobs/{job_id}",
+    response_model=BaseResponseSchema,
+    status_code=HTTP_200_OK,
+    summary="Статус задачи прогноза",
+)
+async def get_forecast_job(
+    job_id: UUID,
+    service: Annotated[ForecastService, Depends()],
+):
+    return BaseResponseSchema(data=[await service.get_run(job_id)])
+
+
+@forecast_router.get(
+    "/jobs/{job_id}/result",
+    response_model=BaseResponseSchema,
+    status_code=HTTP_200_OK,
+    summary="Результат задачи прогноза",
+)
+async def get_forecast_job_result(
+    job_id: UUID,
+    service: Annotated[ForecastService, Depends()],
+):
+    job = await service.get_run(job_id)
+    if job.status not in (StatusSearchEnum.COMPLETED, StatusSearchEnum.NO_DATA):
+        raise HTTPException(
+            status_code=HTTP_409_CONFLICT,
+            detail=f"Forecast job {job_id} is {job.status.value}",
+        )
+
+    return BaseResponseSchema(data=await service.get_run_result(job_id))
+
+
+@forecast_router.post(
+    "/predict",
+    response_model=BaseResponseSchema,
+    status_code=HTTP_200_OK,
+    summary="Прогноз по сохранённым моделям",
+    description="Строит прогноз на другой горизонт или по сценарию регрессоров "
+    "без переобучения моделей.",
+)
+async def predict_cached(
+    scenario: ForecastScenarioSchema,
+    service: Annotated[ForecastService, Depends()],
+):
+    result = await service.predict_cached(
+        periods=scenario.periods, overrides=scenario.overrides()
+    )
+    return BaseResponseSchema(
+        data=[
+            CityForecastSchema(geo_title=geo_title, forecast=points)
+            for geo_title, points in result.items()
+        ]
+    )
+
+
+@forecast_router.get(
+    "/geo/{geo}",
+    response_model=BaseResponseSchema,
+    status_code=HTTP_200_OK,
+    summary="Актуальный прогноз города",
+    description="Прогноз последнего запуска по городу в диапазоне дат. "
+    "Страницы по курсору: ссылка `next` из `pagination.links`.",
+)
+async def get_city_forecast(
+    request: Request,
+    geo: int,
+    service: Annotated[AnaliseService, Depends()],
+    date_from: date | None = None,
+    date_to: date | None = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: str | None = None,
+):
+    return await service.get_forecast(
+        str(request.url), geo, date_from, date_to, limit=limit, cursor=cursor
+    )
@@ -1,22 +1,21 @@
-from typing import Annotated
-
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
 from starlette.status import (
-    HTTP_204_NO_CONTENT, HTTP_200_OK,
+    HTTP_202_ACCEPTED,
 )
-from app.domain.parser.service import ParserService
+
+from app.core.schemas import BaseResponseSchema
+from app.core.tasks.forecast_jobs import forecast_jobs
 
 parser_router = APIRouter(prefix="/parsing", tags=["Parser"])
 
 
-@parser_router.get(
+@parser_router.post(
     "/test",
+    response_model=BaseResponseSchema,
     response_description="Successful.",
-    status_code=HTTP_200_OK,
+    status_code=HTTP_202_ACCEPTED,
     summary="Старт Парсера в ручную",
-    description="""""",
+    description="""Ставит прогноз в очередь и возвращает идентификатор задачи, статус доступен в /forecasts/jobs/{job_id}""",
 )
-async def parse(
-    service: Annotated[ParserService, Depends()],
-):
-    return await service.predict_data()
+async def parse():
+    return BaseResponseSchema(data=[await forecast_jobs.submit()])
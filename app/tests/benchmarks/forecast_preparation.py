@@ -0,0 +1,66 @@
+"""
+Время подготовки истории и регрессоров прогноза: построчный вариант против `RegressorBuilder`.
+
+    python -m app.tests.benchmarks.forecast_preparation --geos 200 --months 120
+"""
+import argparse
+import time
+from collections.abc import Callable
+
+import pandas as pd
+
+from app.domain.forecast.preparation import build_forecast_tasks, build_regressor_builder
+from app.tests.forecast_baseline import baseline_future, baseline_history, synthetic_frames
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--geos", type=int, default=200)
+    parser.add_argument("--months", type=int, default=120)
+    parser.add_argument("--periods", type=int, default=60, help="горизонт прогноза")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = synthetic_frames(geos=args.geos, months=args.months)
+    dates = frames.building_df["last_updated"]
+    # будущий кадр Prophet одного города: история + горизонт
+    future = pd.DataFrame(
+        {
+            "ds": pd.date_range(
+                dates.min(), periods=args.months + args.periods, freq="ME"
+            )
+        }
+    )
+    builder = build_regressor_builder(frames)
+
+    cases = {
+        "history": (
+            lambda: baseline_history(frames),
+            lambda: build_forecast_tasks(frames),
+        ),
+        # в запуске выполняется для каждого города
+        "future x geos": (
+            lambda: [baseline_future(future, frames) for _ in range(args.geos)],
+            lambda: [builder.future(future["ds"]) for _ in range(args.geos)],
+        ),
+    }
+
+    print(f"{args.geos} geos x {args.months} months, best of {args.repeat}")
+    print(f"{'case':<16}{'row-wise, s':>14}{'vectorized, s':>16}{'speedup':>10}")
+    for name, (before, after) in cases.items():
+        before_s = best_of(before, args.repeat)
+        after_s = best_of(after, args.repeat)
+        print(f"{name:<16}{before_s:>14.3f}{after_s:>16.3f}{before_s / after_s:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
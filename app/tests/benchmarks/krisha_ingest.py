@@ -0,0 +1,91 @@
+"""
+Время загрузки строк krisha: прежний путь (построчные даты, ORM INSERT) против
+`validate_rows` и COPY в `upsert_many`.
+
+    python -m app.tests.benchmarks.krisha_ingest --rows 20000
+
+Запись замеряется, если база доступна; всё пишется в транзакции, которая откатывается.
+"""
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.parser.validation import validate_rows
+from app.infrastructure.db.repositories.building_analisation import (
+    BuildingAnalisationModelRepository,
+)
+from app.infrastructure.db.sessions import engine
+from app.tests.benchmarks.forecast_preparation import best_of
+from app.tests.krisha_baseline import baseline_normalize, baseline_upsert, synthetic_payload
+
+
+async def best_of_async(
+    session: AsyncSession, func: Callable[[], Awaitable[object]], repeat: int
+) -> float:
+    """Каждый прогон на пустых строках бенчмарка: сначала вставка, затем откат к точке сохранения."""
+    timings = []
+    for _ in range(repeat):
+        savepoint = await session.begin_nested()
+        started = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - started)
+        await savepoint.rollback()
+    return min(timings)
+
+
+async def write_timings(payload: list[dict], repeat: int) -> tuple[float, float] | None:
+    try:
+        connection = await engine.connect()
+    except OSError as e:
+        print(f"write: skipped, database is not available ({e})")
+        return None
+
+    try:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, expire_on_commit=False)
+        repo = BuildingAnalisationModelRepository(session)
+        rows = validate_rows(payload)[0]
+        await repo.ensure_partitions(r["last_updated"] for r in rows)
+        await session.execute(
+            text("DELETE FROM building_analisation WHERE geo_title LIKE 'bench-%'")
+        )
+
+        before = await best_of_async(session, lambda: baseline_upsert(session, payload), repeat)
+        after = await best_of_async(session, lambda: repo.upsert_many(rows), repeat)
+        await transaction.rollback()
+        await session.close()
+        return before, after
+    finally:
+        await connection.close()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    payload = synthetic_payload(rows=args.rows)
+    cases = {
+        "validate": (
+            best_of(lambda: baseline_normalize(payload), args.repeat),
+            best_of(lambda: validate_rows(payload), args.repeat),
+        ),
+    }
+    write = asyncio.run(write_timings(payload, args.repeat))
+    if write is not None:
+        cases["write"] = write
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"{'case':<12}{'before, s':>12}{'after, s':>12}{'speedup':>10}")
+    for name, (before_s, after_s) in cases.items():
+        print(f"{name:<12}{before_s:>12.3f}{after_s:>12.3f}{before_s / after_s:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
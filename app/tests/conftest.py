@@ -1,13 +1,14 @@
 import asyncio
+import pytest
 import pytest_asyncio
 from typing import AsyncGenerator, Generator
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.orm import sessionmaker
 
-from app.infrastructure.db.sessions import engine, get_async_session
+from app.infrastructure.db.sessions import engine, UnitOfWork, get_unit_of_work
 from app.main import app
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -22,23 +23,36 @@ async def event_loop(request) -> Generator:
 
 
 @pytest_asyncio.fixture(scope="function")
-async def test_session() -> AsyncGenerator[AsyncSession, None]:
-    async with engine.connect() as conn:
-        trans = await conn.begin()
-        session = async_session(bind=conn)
-        try:
-            yield session
-        finally:
-            await trans.rollback()
-            await session.close()
+async def database() -> AsyncEngine:
+    """Engine of the test database; skips the test when it is unreachable."""
+    try:
+        async with engine.connect():
+            pass
+    except OSError as e:
+        pytest.skip(f"Database is not available: {e}")
+    return engine
+
+
+@pytest_asyncio.fixture(scope="function")
+async def test_session(database: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
+    conn = await database.connect()
+    trans = await conn.begin()
+    session = async_session(bind=conn)
+    try:
+        yield session
+    finally:
+        await trans.rollback()
+        await session.close()
+        await conn.close()
 
 
 @pytest_asyncio.fixture(scope="function")
 async def async_client(test_session: AsyncSession) -> AsyncClient:
-    async def override_async_session() -> AsyncGenerator[AsyncSession, None]:
-        yield test_session
+    async def override_unit_of_work() -> AsyncGenerator[UnitOfWork, None]:
+        # транзакцией управляет test_session (откат после теста)
+        yield UnitOfWork(session=test_session)
 
-    app.dependency_overrides[get_async_session] = override_async_session
+    app.dependency_overrides[get_unit_of_work] = override_unit_of_work
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://testserver"
@@ -0,0 +1,90 @@
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.parser.validation import validate_rows
+from app.infrastructure.db.repositories.building_analisation import (
+    UPSERT_COLUMNS,
+    BuildingAnalisationModelRepository,
+)
+from app.tests.krisha_baseline import baseline_upsert, synthetic_payload
+
+
+def row(month: int, average: int, rooms: str | None = None) -> dict:
+    return {
+        "geo": 9001,
+        "geo_title": "e2e-city",
+        "last_updated": date(2024, month, 28),
+        "average": average,
+        "rooms": rooms,
+    }
+
+
+class TestUpsertMany:
+    async def test_counts(self, test_session: AsyncSession):
+        repo = BuildingAnalisationModelRepository(test_session)
+        await repo.upsert_many([row(1, 100), row(2, 200)])
+
+        counts = await repo.upsert_many([row(1, 100), row(2, 250), row(3, 300)])
+
+        assert counts == {"inserted": 1, "updated": 1, "unchanged": 1}
+
+    async def test_duplicate_keys_last_wins(self, test_session: AsyncSession):
+        repo = BuildingAnalisationModelRepository(test_session)
+
+        counts = await repo.upsert_many([row(1, 100), row(1, 150)])
+
+        assert counts == {"inserted": 1, "updated": 0, "unchanged": 0}
+        [saved] = await repo.get_all(geo_title="e2e-city")
+        assert saved.average == 150
+
+    async def test_second_call_in_transaction_merges_only_its_rows(
+        self, test_session: AsyncSession
+    ):
+        repo = BuildingAnalisationModelRepository(test_session)
+        await repo.upsert_many([row(1, 100), row(2, 200)])
+
+        counts = await repo.upsert_many([row(1, 100, rooms="1")])
+
+        assert counts == {"inserted": 1, "updated": 0, "unchanged": 0}
+        assert len(await repo.get_all(geo_title="e2e-city")) == 3
+
+
+class TestCopyMatchesOrm:
+    """`upsert_many` пишет те же строки, что и прежний ORM-путь (`app.tests.krisha_baseline`)."""
+
+    async def saved_rows(self, session: AsyncSession) -> list[tuple]:
+        result = await session.execute(
+            text(
+                f"""
+                SELECT {", ".join(UPSERT_COLUMNS)} FROM building_analisation
+                WHERE geo_title LIKE 'bench-%'
+                ORDER BY geo_title, last_updated, rooms NULLS FIRST, building NULLS FIRST
+                """
+            )
+        )
+        return result.all()
+
+    async def test_same_rows(self, test_session: AsyncSession):
+        repo = BuildingAnalisationModelRepository(test_session)
+        first = synthetic_payload(rows=600)
+        # половина строк повторяется с новыми ценами, половина новые
+        second = synthetic_payload(rows=1200, average_shift=10)[300:]
+        await repo.ensure_partitions(
+            r["last_updated"] for r in validate_rows(first + second)[0]
+        )
+
+        await baseline_upsert(test_session, first)
+        await baseline_upsert(test_session, second)
+        expected = await self.saved_rows(test_session)
+        await test_session.execute(
+            text("DELETE FROM building_analisation WHERE geo_title LIKE 'bench-%'")
+        )
+
+        await repo.upsert_many(validate_rows(first)[0])
+        counts = await repo.upsert_many(validate_rows(second)[0])
+
+        assert counts == {"inserted": 600, "updated": 300, "unchanged": 0}
+        assert len(expected) == 1200
+        assert await self.saved_rows(test_session) == expected
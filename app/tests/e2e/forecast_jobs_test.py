@@ -0,0 +1,81 @@
+import asyncio
+from uuid import uuid4
+
+import pytest_asyncio
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.enums import StatusSearchEnum
+from app.core.tasks import forecast_jobs
+from app.core.tasks.forecast_jobs import FORECAST_LOCK_KEY, ForecastJobManager
+from app.infrastructure.db.locks import advisory_lock
+from app.infrastructure.db.models import ForecastRunModel
+from app.infrastructure.db.repositories.forecast_run import ForecastRunModelRepository
+from app.infrastructure.db.sessions import UnitOfWork
+
+
+@pytest_asyncio.fixture
+async def runs(database: AsyncEngine):
+    run_ids = {status: uuid4() for status in StatusSearchEnum}
+    async with UnitOfWork() as uow:
+        for status, run_id in run_ids.items():
+            uow.session.add(ForecastRunModel(id=run_id, status=status.value))
+    yield run_ids
+    async with database.begin() as conn:
+        await conn.execute(delete(ForecastRunModel).where(ForecastRunModel.id.in_(run_ids.values())))
+
+
+async def statuses(run_ids: dict) -> dict:
+    async with UnitOfWork() as uow:
+        repo = ForecastRunModelRepository(uow.session)
+        return {status: (await repo.get_by_id(run_id)).status for status, run_id in run_ids.items()}
+
+
+class TestAdvisoryLock:
+    async def test_excludes_other_holders(self, database):
+        async with advisory_lock(FORECAST_LOCK_KEY):
+            async with advisory_lock(FORECAST_LOCK_KEY, wait=False) as acquired:
+                assert not acquired
+
+        async with advisory_lock(FORECAST_LOCK_KEY, wait=False) as acquired:
+            assert acquired
+
+
+class TestForecastJobManager:
+    async def test_runs_do_not_overlap_across_workers(self, database, monkeypatch):
+        running = []
+        overlaps = []
+
+        async def predict_price(force, run_id):
+            overlaps.append(len(running))
+            running.append(run_id)
+            await asyncio.sleep(0.05)
+            running.remove(run_id)
+
+        monkeypatch.setattr(forecast_jobs, "predict_price", predict_price)
+        # у каждого воркера свой менеджер и своя локальная блокировка
+        workers = [ForecastJobManager() for _ in range(3)]
+
+        await asyncio.gather(*(worker._run(uuid4(), force=False) for worker in workers))
+
+        assert overlaps == [0, 0, 0]
+
+
+class TestFailOrphaned:
+    async def test_marks_active_runs_as_error(self, runs):
+        assert await ForecastJobManager().fail_orphaned() >= 2
+
+        assert await statuses(runs) == {
+            StatusSearchEnum.PENDING: StatusSearchEnum.ERROR.value,
+            StatusSearchEnum.STARTED: StatusSearchEnum.ERROR.value,
+            StatusSearchEnum.COMPLETED: StatusSearchEnum.COMPLETED.value,
+            StatusSearchEnum.ERROR: StatusSearchEnum.ERROR.value,
+            StatusSearchEnum.NO_DATA: StatusSearchEnum.NO_DATA.value,
+        }
+
+    async def test_keeps_runs_while_a_forecast_is_running(self, runs):
+        # прогноз выполняется на другом воркере
+        async with advisory_lock(FORECAST_LOCK_KEY):
+            assert await ForecastJobManager().fail_orphaned() == 0
+
+        assert (await statuses(runs))[StatusSearchEnum.STARTED] == StatusSearchEnum.STARTED.value
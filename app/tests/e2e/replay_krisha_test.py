@@ -0,0 +1,102 @@
+import json
+from datetime import datetime, timezone
+
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.tasks import replay_krisha as replay
+from app.infrastructure.db.models import KrishaQuarantineModel
+from app.infrastructure.db.repositories.building_analisation import (
+    BuildingAnalisationModelRepository,
+)
+from app.infrastructure.db.sessions import UnitOfWork
+from app.infrastructure.payload_archive import PayloadArchive
+
+GEOS = (9101, 9102, 9103)
+
+
+def store_payloads(archive: PayloadArchive) -> dict[int, str]:
+    hashes = {}
+    for geo in GEOS:
+        row = {
+            "geo": geo,
+            "geo_title": f"e2e-replay-{geo}",
+            "last_updated": "2024-03-28",
+            "average": 500,
+        }
+        body = json.dumps([row]).encode()
+        hashes[geo] = archive.store(
+            f"{geo}::", {"id": geo, "mode": "short"}, body, datetime.now(timezone.utc)
+        )
+    return hashes
+
+
+async def replayed_geos() -> set[int]:
+    async with UnitOfWork() as uow:
+        result = await uow.session.execute(
+            text(
+                "SELECT DISTINCT geo FROM building_analisation "
+                "WHERE geo_title LIKE 'e2e-replay-%'"
+            )
+        )
+        return set(result.scalars())
+
+
+async def quarantined(segment: str) -> list[dict]:
+    async with UnitOfWork() as uow:
+        result = await uow.session.scalars(
+            select(KrishaQuarantineModel.reasons).where(
+                KrishaQuarantineModel.segment_key == segment
+            )
+        )
+        return [reason for reasons in result for reason in reasons]
+
+
+@pytest_asyncio.fixture
+async def archive(database: AsyncEngine, tmp_path, monkeypatch):
+    async def invalidate():
+        pass
+
+    monkeypatch.setattr(replay, "invalidate_analytics_cache", invalidate)
+    yield PayloadArchive(str(tmp_path))
+    async with database.begin() as conn:
+        await conn.execute(
+            text("DELETE FROM building_analisation WHERE geo_title LIKE 'e2e-replay-%'")
+        )
+        await conn.execute(
+            KrishaQuarantineModel.__table__.delete().where(
+                KrishaQuarantineModel.segment_key.in_([f"{geo}::" for geo in GEOS])
+            )
+        )
+
+
+class TestReplayKrisha:
+    async def test_unreadable_payload_is_quarantined(self, archive):
+        hashes = store_payloads(archive)
+        archive.object_path(hashes[9102]).write_bytes(b"not zstd")
+
+        written = await replay.replay_krisha(archive=archive, max_workers=1)
+
+        assert written == 2
+        assert await replayed_geos() == {9101, 9103}
+        [reason] = await quarantined("9102::")
+        assert reason["type"] == "replay_error"
+
+    async def test_failed_save_is_quarantined(self, archive, monkeypatch):
+        store_payloads(archive)
+        upsert_many = BuildingAnalisationModelRepository.upsert_many
+
+        async def failing_upsert(self, records):
+            if any(r["geo"] == 9101 for r in records):
+                await self.session.execute(text("SELECT 1 / 0"))
+            return await upsert_many(self, records)
+
+        monkeypatch.setattr(BuildingAnalisationModelRepository, "upsert_many", failing_upsert)
+
+        written = await replay.replay_krisha(archive=archive, max_workers=1)
+
+        assert written == 2
+        assert await replayed_geos() == {9102, 9103}
+        [reason] = await quarantined("9101::")
+        assert "DivisionByZero" in reason["message"]
@@ -0,0 +1,115 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.infrastructure.db.models import KrishaQuarantineModel
+from app.infrastructure.db.repositories.krisha_quarantine import (
+    KrishaQuarantineModelRepository,
+)
+from app.infrastructure.db.sessions import UnitOfWork
+
+SEGMENT = "e2e:uow:"
+REJECTED = [{"payload": {"geo": "x"}, "reasons": []}]
+
+
+@pytest_asyncio.fixture
+async def clean(database: AsyncEngine):
+    yield
+    async with database.begin() as conn:
+        await conn.execute(
+            text("DELETE FROM krisha_quarantine WHERE segment_key = :key"), {"key": SEGMENT}
+        )
+
+
+async def saved_rows() -> int:
+    async with UnitOfWork() as uow:
+        return await uow.session.scalar(
+            select(func.count()).where(KrishaQuarantineModel.segment_key == SEGMENT)
+        )
+
+
+async def add(uow: UnitOfWork) -> None:
+    await KrishaQuarantineModelRepository(uow.session).add_many(SEGMENT, REJECTED)
+
+
+async def setting(uow: UnitOfWork, name: str) -> str:
+    return await uow.session.scalar(text(f"SHOW {name}"))
+
+
+class TestUnitOfWork:
+    async def test_commits_on_clean_exit(self, clean):
+        async with UnitOfWork() as uow:
+            await add(uow)
+
+        assert await saved_rows() == 1
+
+    async def test_rolls_back_on_exception(self, clean):
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork() as uow:
+                await add(uow)
+                raise RuntimeError
+
+        assert await saved_rows() == 0
+
+    async def test_intermediate_commit_survives_failure(self, clean):
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork() as uow:
+                await add(uow)
+                await uow.commit()
+                await add(uow)
+                raise RuntimeError
+
+        assert await saved_rows() == 1
+
+    async def test_explicit_rollback(self, clean):
+        async with UnitOfWork() as uow:
+            await add(uow)
+            await uow.rollback()
+
+        assert await saved_rows() == 0
+
+    async def test_read_only_unit(self, clean):
+        async with UnitOfWork(read_only=True) as uow:
+            assert await setting(uow, "transaction_isolation") == "repeatable read"
+            assert await setting(uow, "transaction_read_only") == "on"
+            with pytest.raises(DBAPIError, match="read-only transaction"):
+                await add(uow)
+
+
+class TestSnapshot:
+    async def test_snapshot_is_repeatable_read_only(self, clean):
+        async with UnitOfWork() as uow:
+            async with uow.snapshot():
+                assert await setting(uow, "transaction_isolation") == "repeatable read"
+                assert await setting(uow, "transaction_read_only") == "on"
+
+            # после снимка сессия снова пишет
+            await add(uow)
+            assert "read_only" not in uow.session.info
+
+        assert await saved_rows() == 1
+
+    async def test_snapshot_does_not_see_concurrent_commits(self, clean):
+        async with UnitOfWork() as uow:
+            async with uow.snapshot():
+                before = await uow.session.scalar(
+                    select(func.count()).where(KrishaQuarantineModel.segment_key == SEGMENT)
+                )
+                async with UnitOfWork() as writer:
+                    await add(writer)
+                after = await uow.session.scalar(
+                    select(func.count()).where(KrishaQuarantineModel.segment_key == SEGMENT)
+                )
+
+        assert before == after == 0
+        assert await saved_rows() == 1
+
+    async def test_snapshot_joins_open_transaction(self, clean):
+        async with UnitOfWork() as uow:
+            await add(uow)
+            async with uow.snapshot():
+                assert await setting(uow, "transaction_read_only") == "off"
+
+        assert await saved_rows() == 1
@@ -0,0 +1,188 @@
+"""
+Построчная подготовка регрессоров в том виде, в каком она была до `RegressorBuilder`.
+
+Используется как эталон: тест сверяет с ней векторизованный результат,
+бенчмарк сравнивает время.
+"""
+import numpy as np
+import pandas as pd
+
+from app.domain.forecast.preparation import MIN_HISTORY_POINTS, ForecastFrames
+from app.domain.forecast.regressors import FUTURE_CURRENCY, FUTURE_INFLATION
+
+
+def synthetic_frames(
+    geos: int = 20, months: int = 60, seed: int = 0
+) -> ForecastFrames:
+    """
+    Случайная история и справочники с пропусками.
+
+    В курсе нет части месяцев и целого года, в инфляции и НДС нет части лет,
+    поэтому срабатывают все запасные значения (год, месяц, медиана, 1.0).
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2019-01-31", periods=months, freq="ME")
+    building_df = pd.DataFrame(
+        {
+            "geo": np.repeat(np.arange(1, geos + 1, dtype="int32"), months),
+            "geo_title": pd.Categorical(
+                np.repeat([f"city-{geo:03d}" for geo in range(1, geos + 1)], months)
+            ),
+            "last_updated": np.tile(dates.values, geos),
+            "average": rng.uniform(300, 1500, geos * months).round(1),
+        }
+    )
+    # у последнего города слишком короткая история
+    building_df = building_df[
+        (building_df["geo"] != geos)
+        | (building_df["last_updated"] < dates[MIN_HISTORY_POINTS - 1])
+    ].reset_index(drop=True)
+
+    currency_dates = pd.date_range("2019-01-01", "2025-12-01", freq="MS")
+    currency_dates = currency_dates[
+        (currency_dates.month % 3 != 0) & (currency_dates.year != 2021)
+    ]
+    currency_df = pd.DataFrame(
+        {
+            "date": currency_dates,
+            "usd": rng.uniform(380, 520, len(currency_dates)).round(2),
+        }
+    )
+    inflation_df = pd.DataFrame(
+        {"year": [2019, 2020, 2022, 2023, 2025], "inflation_rate": [0.05, 0.07, 0.2, 0.1, 0.12]}
+    )
+    nds_df = pd.DataFrame({"year": [2019, 2020, 2021, 2022, 2024], "nds_rate": [12.0] * 5})
+    return ForecastFrames(
+        building_df=building_df,
+        currency_df=currency_df,
+        inflation_df=inflation_df,
+        nds_df=nds_df,
+    )
+
+
+def baseline_context(frames: ForecastFrames) -> dict:
+    currency_df = frames.currency_df.copy()
+    currency_df["year"] = currency_df["date"].dt.year
+    currency_df["month"] = currency_df["date"].dt.month
+
+    future_currency = pd.DataFrame(FUTURE_CURRENCY)
+    future_currency["year"] = future_currency["date"].dt.year
+    future_currency["month"] = future_currency["date"].dt.month
+
+    inflation_df = (
+        pd.concat([frames.inflation_df, pd.DataFrame(FUTURE_INFLATION)])
+        .drop_duplicates("year")
+        .reset_index(drop=True)
+    )
+    currency_df = (
+        pd.concat([currency_df, future_currency])
+        .drop_duplicates(["year", "month"])
+        .reset_index(drop=True)
+    )
+    nds_df = frames.nds_df
+
+    return {
+        "inflation_year_map": inflation_df.set_index("year")["inflation_rate"].to_dict(),
+        "currency_month_df": currency_df[["year", "month", "usd"]].rename(
+            columns={"usd": "usd_rate"}
+        ),
+        "currency_year_map": currency_df.groupby("year")["usd"].first().to_dict(),
+        "nds_year_map": (
+            nds_df.set_index("year")["nds_rate"].to_dict() if not nds_df.empty else {}
+        ),
+        "median_inflation": (
+            inflation_df["inflation_rate"].median()
+            if not inflation_df["inflation_rate"].isna().all()
+            else 0.0
+        ),
+        "median_usd": (
+            currency_df["usd"].median() if not currency_df["usd"].isna().all() else 1.0
+        ),
+    }
+
+
+def baseline_history(frames: ForecastFrames) -> dict[str, pd.DataFrame]:
+    """История для Prophet по городам: `ds`, `y`, регрессоры."""
+    ctx = baseline_context(frames)
+    median_infl = ctx["median_inflation"]
+    median_usd = ctx["median_usd"]
+
+    building_df = frames.building_df.copy()
+    building_df["year"] = building_df["last_updated"].dt.year
+    building_df["month"] = building_df["last_updated"].dt.month
+
+    building_df = building_df.merge(
+        ctx["currency_month_df"].rename(columns={"usd_rate": "usd"}),
+        on=["year", "month"],
+        how="left",
+    )
+    building_df["usd"] = building_df.apply(
+        lambda r: ctx["currency_year_map"].get(r["year"], r.get("usd")), axis=1
+    )
+    if building_df["usd"].isna().any():
+        building_df["usd"] = building_df["usd"].fillna(median_usd)
+
+    building_df["average_kzt"] = building_df["average"] * building_df["usd"]
+    building_df["inflation_rate"] = (
+        building_df["year"].map(ctx["inflation_year_map"]).fillna(median_infl)
+    )
+    building_df["nds_factor"] = building_df["year"].map(
+        lambda y: (
+            (1.0 + ctx["nds_year_map"][y] / 100.0) if y in ctx["nds_year_map"] else 1.0
+        )
+    )
+    building_df.loc[building_df["year"] >= 2026, "nds_factor"] = building_df.loc[
+        building_df["year"] >= 2026, "nds_factor"
+    ].apply(lambda x: max(x, 1.16))
+
+    result = {}
+    for geo, geo_title in building_df[["geo", "geo_title"]].drop_duplicates().values:
+        df = building_df[building_df["geo_title"] == geo_title][
+            ["last_updated", "average_kzt", "inflation_rate", "nds_factor", "usd"]
+        ]
+        if df.shape[0] < MIN_HISTORY_POINTS:
+            continue
+
+        prophet_df = df.rename(
+            columns={"last_updated": "ds", "average_kzt": "y", "usd": "usd_rate"}
+        ).reset_index(drop=True)
+        prophet_df["inflation_rate"] = (
+            prophet_df["inflation_rate"].ffill().bfill().fillna(median_infl)
+        )
+        prophet_df["usd_rate"] = prophet_df["usd_rate"].ffill().bfill().fillna(median_usd)
+        prophet_df["nds_factor"] = prophet_df["nds_factor"].ffill().bfill()
+        prophet_df["nds_factor"] = prophet_df["nds_factor"].apply(lambda x: max(x, 1.0))
+        result[geo_title] = prophet_df
+    return result
+
+
+def baseline_future(future: pd.DataFrame, frames: ForecastFrames) -> pd.DataFrame:
+    """Регрессоры для дат прогноза (колонка `ds`)."""
+    ctx = baseline_context(frames)
+    future = future.copy()
+    future["year"] = future["ds"].dt.year
+    future["month"] = future["ds"].dt.month
+
+    future["inflation_rate"] = (
+        future["year"].map(ctx["inflation_year_map"]).fillna(ctx["median_inflation"])
+    )
+
+    future = future.merge(ctx["currency_month_df"], on=["year", "month"], how="left")
+    future["usd_rate"] = future.apply(
+        lambda r: (
+            r["usd_rate"]
+            if not pd.isna(r["usd_rate"])
+            else ctx["currency_year_map"].get(r["year"])
+        ),
+        axis=1,
+    )
+    future["usd_rate"] = future["usd_rate"].fillna(ctx["median_usd"])
+
+    future["nds_factor"] = future["year"].map(
+        lambda y: (1.0 + ctx["nds_year_map"][y] / 100.0) if y in ctx["nds_year_map"] else 1.0
+    )
+    future.loc[future["year"] >= 2026, "nds_factor"] = future.loc[
+        future["year"] >= 2026, "nds_factor"
+    ].apply(lambda x: max(x, 1.16))
+    future["nds_factor"] = future["nds_factor"].fillna(1.0)
+    return future
@@ -0,0 +1,87 @@
+"""
+Запись строк krisha в том виде, в каком она была до COPY и `KrishaRow`.
+
+Построчная нормализация дат и многострочный `INSERT ... ON CONFLICT` через ORM.
+Используется как эталон: тесты сверяют с ней результат, бенчмарк сравнивает время.
+"""
+import itertools
+from datetime import date, datetime
+
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models import BuildingAnalisationModel
+
+CONFLICT_COLUMNS = ["geo_title", "last_updated", "created_at", "rooms", "building"]
+
+
+def synthetic_payload(rows: int = 1000, seed: int = 0, average_shift: int = 0) -> list[dict]:
+    """
+    Строки ответа krisha как из `response.json()`: даты строками, пустые срезы — "".
+
+    Ключи строк уникальны; `average_shift` меняет цены, чтобы получить обновления.
+    """
+    rng = np.random.default_rng(seed)
+    keys = itertools.islice(
+        itertools.product(range(1, 1001), range(120), ["", "1", "2"], ["", "1"]), rows
+    )
+    payload = []
+    for geo, month, rooms, building in keys:
+        last_updated = date(2016 + month // 12, month % 12 + 1, 28)
+        average = int(rng.integers(300, 1500))
+        payload.append(
+            {
+                "geo": geo,
+                "geo_title": f"bench-{geo:04d}",
+                "average": average + average_shift,
+                "average_kzt": average * 470,
+                "rate_kzt": 470.5,
+                "calculated": int(rng.integers(1, 500)),
+                "total": int(rng.integers(1, 5000)),
+                "rooms": rooms,
+                "building": building,
+                "last_updated": last_updated.isoformat(),
+                "created_at": last_updated.isoformat() if month % 2 else None,
+                "min_average": float(average) * 0.8,
+                "max_rate": float(average) * 1.2,
+                "value_on_axis": float(average),
+            }
+        )
+    return payload
+
+
+def baseline_normalize(records: list[dict]) -> list[dict]:
+    def normalize_date(v):
+        if isinstance(v, date):
+            return v
+        if isinstance(v, str):
+            return datetime.strptime(v, "%Y-%m-%d").date()
+        return None
+
+    records = [dict(r) for r in records]
+    for r in records:
+        r["last_updated"] = normalize_date(r.get("last_updated"))
+        r["created_at"] = normalize_date(r.get("created_at"))
+        r["rooms"] = r.get("rooms") or None
+        r["building"] = r.get("building") or None
+    return records
+
+
+async def baseline_upsert(
+    session: AsyncSession, records: list[dict], chunk_size: int = 1000
+) -> None:
+    """Нормализует и пишет строки пачками, без commit (партиции должны существовать)."""
+    records = baseline_normalize(records)
+    for i in range(0, len(records), chunk_size):
+        chunk = records[i:i + chunk_size]
+        stmt = insert(BuildingAnalisationModel).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=CONFLICT_COLUMNS,
+            set_={
+                c: stmt.excluded[c]
+                for c in chunk[0]
+                if c not in ("geo_title", "last_updated", "created_at")
+            },
+        )
+        await session.execute(stmt)
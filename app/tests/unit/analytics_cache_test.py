@@ -0,0 +1,51 @@
+import pytest
+
+from app.core import settings
+from app.domain.analise import cache
+from app.infrastructure.adapters.redis import redis_adapter
+from app.infrastructure.db import sessions
+
+
+@pytest.fixture
+def version(monkeypatch):
+    current = {"version": 1}
+
+    async def get_int(key):
+        return current["version"]
+
+    monkeypatch.setattr(redis_adapter, "get_int", get_int)
+    monkeypatch.setattr(cache, "_seen_version", None)
+    return current
+
+
+def reads_primary() -> bool:
+    with cache.fresh_reads():
+        return sessions._primary_reads.get()
+
+
+class TestFreshReads:
+    async def test_new_version_is_loaded_from_primary(self, version, monkeypatch):
+        monkeypatch.setattr(settings, "DB_REPLICA_PIN_SECONDS", 60)
+
+        await cache.versioned_key("/history")
+
+        assert reads_primary()
+
+    async def test_settled_version_is_loaded_from_replica(self, version, monkeypatch):
+        monkeypatch.setattr(settings, "DB_REPLICA_PIN_SECONDS", 0)
+
+        await cache.versioned_key("/history")
+
+        assert not reads_primary()
+
+    async def test_version_change_restarts_window(self, version, monkeypatch):
+        monkeypatch.setattr(settings, "DB_REPLICA_PIN_SECONDS", 60)
+        await cache.versioned_key("/history")
+        monkeypatch.setattr(cache, "_seen_version", (1, float("-inf")))
+        assert not reads_primary()
+
+        version["version"] = 2
+        first = await cache.versioned_key("/history")
+
+        assert reads_primary()
+        assert first.startswith("analytics:v2:")
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from app.domain.forecast.engine import fit_city_forecast
+from app.domain.forecast.preparation import build_forecast_tasks
+from app.tests.forecast_baseline import synthetic_frames
+
+
+class TestForecastDates:
+    def test_forecast_starts_month_after_history(self):
+        frames = synthetic_frames(geos=2, months=36)
+        # история из помесячного представления: первое число месяца
+        frames.building_df["last_updated"] = (
+            frames.building_df["last_updated"].dt.to_period("M").dt.to_timestamp()
+        )
+        [task] = build_forecast_tasks(frames, periods=3, geos={1})
+
+        result = fit_city_forecast(task)
+
+        assert result.error is None
+        last_month = task.history["ds"].max()
+        assert result.forecast["ds"].tolist() == list(
+            pd.date_range(last_month + pd.offsets.MonthBegin(), periods=3, freq="MS")
+        )
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from app.domain.forecast.preparation import build_forecast_tasks, build_regressor_builder
+from app.tests.forecast_baseline import (
+    baseline_future,
+    baseline_history,
+    synthetic_frames,
+)
+
+COLUMNS = ["ds", "y", "inflation_rate", "nds_factor", "usd_rate"]
+REGRESSOR_COLUMNS = ["usd_rate", "inflation_rate", "nds_factor"]
+
+
+class TestForecastPreparation:
+    frames = synthetic_frames(geos=8, months=96)
+
+    def test_history_matches_baseline(self):
+        tasks = build_forecast_tasks(self.frames)
+        expected = baseline_history(self.frames)
+
+        assert {task.geo_title for task in tasks} == set(expected)
+        for task in tasks:
+            pd.testing.assert_frame_equal(
+                task.history[COLUMNS].sort_values("ds").reset_index(drop=True),
+                expected[task.geo_title][COLUMNS].sort_values("ds").reset_index(drop=True),
+                check_dtype=False,
+            )
+
+    def test_short_history_is_skipped(self):
+        tasks = build_forecast_tasks(self.frames)
+
+        assert "city-008" not in {task.geo_title for task in tasks}
+
+    def test_geos_filter(self):
+        tasks = build_forecast_tasks(self.frames, geos={1, 2})
+
+        assert {task.geo for task in tasks} == {1, 2}
+
+    def test_future_matches_baseline(self):
+        future = pd.DataFrame({"ds": pd.date_range("2018-01-31", "2030-12-31", freq="ME")})
+        builder = build_regressor_builder(self.frames)
+
+        pd.testing.assert_frame_equal(
+            builder.future(future["ds"])[REGRESSOR_COLUMNS].reset_index(drop=True),
+            baseline_future(future, self.frames)[REGRESSOR_COLUMNS],
+            check_dtype=False,
+        )
@@ -0,0 +1,126 @@
+import functools
+
+import httpx
+import pytest
+
+from app.core import settings
+from app.domain.parser import ingest
+from app.infrastructure.krisha_analitic import KrishaClient
+from app.infrastructure.krisha_crawler import KrishaCrawler
+
+BROKEN_GEO = 2
+
+
+class FakeUnitOfWork:
+    """Как asyncpg: после ошибки запроса всё, кроме ROLLBACK, падает до отката."""
+
+    def __init__(self):
+        self.session = self
+        self.aborted = False
+        self.commits = 0
+        self.rollbacks = 0
+
+    def check(self) -> None:
+        if self.aborted:
+            raise RuntimeError("current transaction is aborted")
+
+    async def commit(self) -> None:
+        self.check()
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        self.aborted = False
+        self.rollbacks += 1
+
+
+class FakeBuildingRepository:
+    forgotten = 0
+
+    def __init__(self, session: FakeUnitOfWork):
+        self.uow = session
+
+    async def get_geos(self) -> list[int]:
+        return []
+
+    async def upsert_many(self, rows: list[dict]) -> dict[str, int]:
+        self.uow.check()
+        if rows[0]["geo"] == BROKEN_GEO:
+            self.uow.aborted = True
+            raise RuntimeError("duplicate key value violates unique constraint")
+        return {"inserted": len(rows), "updated": 0, "unchanged": 0}
+
+    def forget_partitions(self) -> None:
+        FakeBuildingRepository.forgotten += 1
+
+    async def refresh_monthly(self) -> None:
+        self.uow.check()
+
+
+class FakeFetchStateRepository:
+    saved: list[dict] = []
+
+    def __init__(self, session: FakeUnitOfWork):
+        self.uow = session
+
+    async def get_map(self) -> dict:
+        return {}
+
+    async def upsert_many(self, states: list[dict]) -> None:
+        self.uow.check()
+        FakeFetchStateRepository.saved = states
+
+
+class FakeQuarantineRepository:
+    def __init__(self, session: FakeUnitOfWork):
+        self.uow = session
+
+
+def krisha(request: httpx.Request) -> httpx.Response:
+    geo = int(request.url.params["id"])
+    return httpx.Response(
+        200, json=[{"geo": geo, "geo_title": f"city-{geo}", "last_updated": "2024-01-31"}]
+    )
+
+
+@pytest.fixture
+def fake_ingest(monkeypatch):
+    monkeypatch.setattr(settings, "KRISHA_REGION_IDS", [1, BROKEN_GEO, 3])
+    monkeypatch.setattr(settings, "KRISHA_SEGMENT_ROOMS", [])
+    monkeypatch.setattr(settings, "KRISHA_SEGMENT_BUILDING_TYPES", [])
+    monkeypatch.setattr(settings, "KRISHA_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "KRISHA_RATE_LIMIT", 0)
+    monkeypatch.setattr(ingest, "BuildingAnalisationModelRepository", FakeBuildingRepository)
+    monkeypatch.setattr(ingest, "KrishaFetchStateModelRepository", FakeFetchStateRepository)
+    monkeypatch.setattr(ingest, "KrishaQuarantineModelRepository", FakeQuarantineRepository)
+    monkeypatch.setattr(ingest, "get_payload_archive", lambda: None)
+    monkeypatch.setattr(
+        ingest,
+        "KrishaCrawler",
+        functools.partial(KrishaCrawler, KrishaClient(transport=httpx.MockTransport(krisha))),
+    )
+
+    async def invalidate() -> None:
+        pass
+
+    monkeypatch.setattr(ingest, "invalidate_analytics_cache", invalidate)
+    FakeBuildingRepository.forgotten = 0
+    FakeFetchStateRepository.saved = []
+
+
+class TestIngestKrisha:
+    async def test_failed_segment_does_not_break_the_others(self, fake_ingest):
+        uow = FakeUnitOfWork()
+
+        stats = await ingest.ingest_krisha(uow)
+
+        assert stats.failed == 1
+        assert stats.changed == 2
+        assert stats.written == 2
+        assert uow.rollbacks == 1
+        assert FakeBuildingRepository.forgotten == 1
+        # срезы после сбойного и состояние запросов записаны
+        assert [state["segment_key"] for state in FakeFetchStateRepository.saved] == [
+            "1::",
+            "3::",
+        ]
+        assert uow.commits == 4
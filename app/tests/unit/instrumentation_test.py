@@ -0,0 +1,31 @@
+from app.infrastructure.db.instrumentation import normalize_statement, statement_label
+
+
+class TestStatementLabel:
+    def test_literals_and_parameters(self):
+        assert normalize_statement(
+            "SELECT * FROM t WHERE a = 'x' AND b = 10 AND c IN ($1, $2, $3)"
+        ) == "SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...)"
+
+    def test_values_lists_collapse(self):
+        assert statement_label("INSERT INTO t (a) VALUES (1), (2)") == statement_label(
+            "INSERT INTO t (a) VALUES (1), (2), (3)"
+        )
+
+    def test_partition_names_are_normalized(self):
+        create = (
+            "CREATE TABLE IF NOT EXISTS building_analisation_y{year}m{month} "
+            "PARTITION OF building_analisation "
+            "FOR VALUES FROM ('{year}-{month}-01') TO ('{year}-{month}-28')"
+        )
+        labels = {
+            statement_label(create.format(year=year, month=month))
+            for year in (2025, 2026)
+            for month in range(1, 13)
+        }
+
+        assert len(labels) == 1
+        assert labels.pop().startswith("CREATE building_analisation_y?m? #")
+        assert normalize_statement(
+            "ALTER TABLE building_analisation DETACH PARTITION building_analisation_y2026m10"
+        ) == "ALTER TABLE building_analisation DETACH PARTITION building_analisation_y?m?"
@@ -0,0 +1,240 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core import settings
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.enums import CircuitStateEnum
+from app.core.exceptions.exceptions import (
+    CircuitBreakerOpenException,
+    HttpConnectionException,
+)
+from app.infrastructure.krisha_analitic import KrishaClient, RateLimiter
+from app.infrastructure.krisha_crawler import KrishaCrawler, KrishaSegment
+
+URL = "https://krisha.test/analytics"
+
+
+class FakeServer:
+    """Отвечает заранее заданными ответами по очереди, последний повторяется."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(autouse=True)
+def fast_settings(monkeypatch):
+    monkeypatch.setattr(settings, "KRISHA_MAX_RETRIES", 3)
+    monkeypatch.setattr(settings, "KRISHA_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(settings, "KRISHA_BACKOFF_MAX", 0.01)
+    monkeypatch.setattr(settings, "KRISHA_RATE_LIMIT", 0)
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "CIRCUIT_RECOVERY_TIMEOUT", 0.05)
+
+
+def make_client(server: FakeServer) -> KrishaClient:
+    return KrishaClient(transport=httpx.MockTransport(server))
+
+
+class TestKrishaClientRetry:
+    async def test_retries_5xx_and_429_until_success(self):
+        server = FakeServer(
+            httpx.Response(503),
+            httpx.Response(429),
+            httpx.Response(200, json={"ok": True}),
+        )
+
+        assert await make_client(server).get_json(URL) == {"ok": True}
+        assert len(server.requests) == 3
+
+    async def test_retries_transport_errors_and_timeouts(self):
+        server = FakeServer(
+            httpx.ConnectError("refused"),
+            httpx.ReadTimeout("slow"),
+            httpx.Response(200, json=[]),
+        )
+
+        assert await make_client(server).get_json(URL) == []
+        assert len(server.requests) == 3
+
+    async def test_gives_up_after_max_retries(self):
+        server = FakeServer(httpx.Response(502))
+
+        with pytest.raises(HttpConnectionException):
+            await make_client(server).get(URL)
+        assert len(server.requests) == settings.KRISHA_MAX_RETRIES + 1
+
+    async def test_client_error_is_returned_without_retry(self):
+        server = FakeServer(httpx.Response(404))
+        client = make_client(server)
+
+        response = await client.get(URL)
+
+        assert response.status_code == 404
+        assert len(server.requests) == 1
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_json(URL)
+
+    async def test_not_modified_is_returned(self):
+        server = FakeServer(httpx.Response(304))
+
+        assert (await make_client(server).get(URL)).status_code == 304
+
+
+class TestKrishaClientBackoff:
+    def test_retry_after_is_honoured_and_capped(self):
+        response = httpx.Response(429, headers={"Retry-After": "3"})
+        assert KrishaClient._backoff(0, response) == settings.KRISHA_BACKOFF_MAX
+
+    def test_jitter_grows_with_attempt_up_to_max(self, monkeypatch):
+        monkeypatch.setattr(settings, "KRISHA_BACKOFF_BASE", 1.0)
+        monkeypatch.setattr(settings, "KRISHA_BACKOFF_MAX", 10.0)
+
+        for attempt, cap in ((0, 1.0), (2, 4.0), (10, 10.0)):
+            delays = [KrishaClient._backoff(attempt) for _ in range(50)]
+            assert all(0 <= delay <= cap for delay in delays)
+
+
+class TestRateLimiter:
+    async def test_spaces_request_starts(self):
+        limiter = RateLimiter(rate=50)
+        started = time.monotonic()
+
+        await asyncio.gather(*(limiter.wait() for _ in range(5)))
+
+        # первый запрос сразу, остальные через 1/50 с
+        assert time.monotonic() - started >= 4 / 50 * 0.9
+
+    async def test_zero_rate_is_unlimited(self):
+        limiter = RateLimiter(rate=0)
+        started = time.monotonic()
+
+        await asyncio.gather(*(limiter.wait() for _ in range(100)))
+
+        assert time.monotonic() - started < 0.05
+
+
+class TestCircuitBreaker:
+    async def test_opens_and_fails_fast(self):
+        server = FakeServer(httpx.Response(500))
+        client = make_client(server)
+
+        for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises(HttpConnectionException):
+                await client.get(URL)
+        requests = len(server.requests)
+
+        with pytest.raises(CircuitBreakerOpenException):
+            await client.get(URL)
+        assert client.breaker.state == CircuitStateEnum.OPEN
+        assert len(server.requests) == requests
+
+    async def test_half_open_success_closes(self):
+        server = FakeServer(
+            *[httpx.Response(500)] * (2 * (settings.KRISHA_MAX_RETRIES + 1)),
+            httpx.Response(200, json={}),
+        )
+        client = make_client(server)
+        for _ in range(2):
+            with pytest.raises(HttpConnectionException):
+                await client.get(URL)
+        assert client.breaker.state == CircuitStateEnum.OPEN
+
+        await asyncio.sleep(settings.CIRCUIT_RECOVERY_TIMEOUT)
+
+        assert await client.get_json(URL) == {}
+        assert client.breaker.state == CircuitStateEnum.CLOSED
+
+    async def test_half_open_failure_reopens(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+
+        async def fail():
+            raise HttpConnectionException(URL)
+
+        with pytest.raises(HttpConnectionException):
+            await breaker.call(fail)
+        await asyncio.sleep(0.05)
+        with pytest.raises(HttpConnectionException):
+            await breaker.call(fail)
+
+        assert breaker.state == CircuitStateEnum.OPEN
+        with pytest.raises(CircuitBreakerOpenException):
+            await breaker.call(fail)
+
+    async def test_client_errors_do_not_open(self):
+        server = FakeServer(httpx.Response(404))
+        client = make_client(server)
+
+        for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD + 3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_json(URL)
+
+        assert client.breaker.state == CircuitStateEnum.CLOSED
+
+    async def test_cancellation_is_not_a_failure(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+        call = asyncio.create_task(breaker.call(lambda: asyncio.sleep(1)))
+        await asyncio.sleep(0)
+        call.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        assert breaker.state == CircuitStateEnum.CLOSED
+        assert breaker.failures == 0
+
+    async def test_cancelled_trial_keeps_circuit_open(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+
+        async def fail():
+            raise HttpConnectionException(URL)
+
+        with pytest.raises(HttpConnectionException):
+            await breaker.call(fail)
+        await asyncio.sleep(0.05)
+        trial = asyncio.create_task(breaker.call(lambda: asyncio.sleep(1)))
+        await asyncio.sleep(0)
+        assert breaker.state == CircuitStateEnum.HALF_OPEN
+        trial.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        assert breaker.state == CircuitStateEnum.OPEN
+        assert breaker.failures == 1
+        # следующий вызов сразу пробный
+        assert await breaker.call(lambda: asyncio.sleep(0, result="ok")) == "ok"
+        assert breaker.state == CircuitStateEnum.CLOSED
+
+
+class TestKrishaCrawler:
+    async def test_missing_and_empty_segments_are_skipped(self):
+        def server(request: httpx.Request) -> httpx.Response:
+            geo = request.url.params["id"]
+            if geo == "1":
+                return httpx.Response(200, json=[{"geo": 1, "average": 500}])
+            if geo == "2":
+                return httpx.Response(200, content=b"")
+            return httpx.Response(404)
+
+        crawled = []
+
+        async def sink(segment, rows):
+            crawled.append((segment.geo, rows))
+
+        client = KrishaClient(transport=httpx.MockTransport(server))
+        segments = [KrishaSegment(0, geo) for geo in (1, 2, 3, 4, 5)]
+
+        stats = await KrishaCrawler(client=client, concurrency=2).crawl(segments, sink)
+
+        assert [geo for geo, _ in crawled] == [1]
+        assert (stats.changed, stats.skipped, stats.failed) == (1, 4, 0)
+        assert client.breaker.state == CircuitStateEnum.CLOSED
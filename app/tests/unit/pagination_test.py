@@ -0,0 +1,70 @@
+import base64
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor, get_keyset_pagination
+
+
+def raw_cursor(payload: str) -> str:
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+class TestCursor:
+    def test_round_trip(self):
+        cursor = encode_cursor({"last_updated": date(2025, 3, 1), "id": 42}, page=3)
+
+        key, page = decode_cursor(cursor, last_updated=date.fromisoformat, id=int)
+
+        assert key == {"last_updated": date(2025, 3, 1), "id": 42}
+        assert page == 4
+
+    def test_empty_cursor_is_first_page(self):
+        assert decode_cursor(None, id=int) == (None, 1)
+        assert decode_cursor("", id=int) == (None, 1)
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not base64!",
+            "YQ",  # неверное выравнивание
+            raw_cursor("not json"),
+            raw_cursor("[1, 2]"),
+            raw_cursor('{"k": {"id": 1}}'),
+            raw_cursor('{"k": {"id": 1}, "p": "x"}'),
+            raw_cursor('{"k": {"id": 1}, "p": -5}'),
+            raw_cursor('{"k": [1], "p": 1}'),
+            raw_cursor('{"k": {"other": 1}, "p": 1}'),
+            raw_cursor('{"k": {"last_updated": "yesterday", "id": 1}, "p": 1}'),
+            raw_cursor('{"k": {"last_updated": {"a": 1}, "id": 1}, "p": 1}'),
+            raw_cursor('{"k": {"last_updated": "2025-03-01", "id": "abc"}, "p": 1}'),
+        ],
+    )
+    def test_tampered_cursor_is_bad_request(self, cursor):
+        with pytest.raises(HTTPException) as error:
+            decode_cursor(cursor, last_updated=date.fromisoformat, id=int)
+
+        assert error.value.status_code == 400
+
+
+class TestKeysetPagination:
+    async def test_next_link_carries_cursor(self):
+        pagination = await get_keyset_pagination(
+            "http://testserver/analytics/latest?limit=2&cursor=old",
+            total=5,
+            page=1,
+            per_page=2,
+            next_key={"geo": 7},
+        )
+
+        assert "cursor=old" not in pagination.links.first
+        cursor = pagination.links.next.split("cursor=")[1]
+        assert decode_cursor(cursor, geo=int) == ({"geo": 7}, 2)
+
+    async def test_last_page_has_no_next_link(self):
+        pagination = await get_keyset_pagination(
+            "http://testserver/analytics/latest", total=1, page=1, per_page=2, next_key=None
+        )
+
+        assert pagination.links.next is None
@@ -0,0 +1,42 @@
+import time
+
+from prometheus_client import REGISTRY
+from sqlalchemy.util import greenlet_spawn
+
+from app.infrastructure.db.pool import InstrumentedQueuePool
+
+CONNECT_DELAY = 0.05
+
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def slow_connect() -> FakeConnection:
+    time.sleep(CONNECT_DELAY)
+    return FakeConnection()
+
+
+def sample(name: str, engine: str) -> float:
+    return REGISTRY.get_sample_value(name, {"engine": engine}) or 0.0
+
+
+class TestInstrumentedQueuePool:
+    async def test_wait_excludes_connect_time(self):
+        pool = InstrumentedQueuePool(slow_connect, pool_size=1, max_overflow=0)
+        pool.engine_name = "pool-test"
+
+        def checkout_twice() -> None:
+            pool.connect().close()
+            pool.connect().close()
+
+        await greenlet_spawn(checkout_twice)
+
+        assert sample("db_pool_connect_seconds_count", "pool-test") == 1
+        assert sample("db_pool_connect_seconds_sum", "pool-test") >= CONNECT_DELAY
+        assert sample("db_pool_checkout_wait_seconds_count", "pool-test") == 2
+        assert sample("db_pool_checkout_wait_seconds_sum", "pool-test") < CONNECT_DELAY / 5
@@ -0,0 +1,38 @@
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.infrastructure.adapters.redis import RedisAdapter
+
+
+class FailingClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        raise RedisConnectionError("connection refused")
+
+    async def incr(self, key):
+        self.calls += 1
+        return 1
+
+
+class TestRedisBackoff:
+    async def test_cache_is_skipped_after_connection_error(self):
+        adapter = RedisAdapter()
+        adapter._client = client = FailingClient()
+
+        assert await adapter.get("a") is None
+        assert await adapter.get("b") is None
+        assert await adapter.get_int("c") is None
+
+        assert client.calls == 1
+        assert not adapter.available
+
+    async def test_successful_incr_ends_backoff(self):
+        adapter = RedisAdapter()
+        adapter._client = client = FailingClient()
+        await adapter.get("a")
+
+        assert await adapter.incr("version") == 1
+        assert adapter.available
+        assert client.calls == 2
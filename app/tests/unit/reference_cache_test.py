@@ -0,0 +1,86 @@
+from app.domain.forecast.preparation import regressor_version
+from app.domain.forecast.reference import ReferenceCache, ReferenceTables
+from app.tests.forecast_baseline import synthetic_frames
+
+FRAMES = synthetic_frames(geos=2, months=12)
+
+
+class FakeRepository:
+    def __init__(self, frame):
+        self.frame = frame
+        self.stamp = (1, 1, 1)
+        self.stamp_reads = 0
+        self.frame_reads = 0
+
+    async def version_stamp(self) -> tuple:
+        self.stamp_reads += 1
+        return self.stamp
+
+    async def get_frame(self):
+        self.frame_reads += 1
+        return self.frame
+
+
+class TestReferenceCache:
+    def repositories(self) -> tuple[FakeRepository, FakeRepository, FakeRepository]:
+        return (
+            FakeRepository(FRAMES.currency_df),
+            FakeRepository(FRAMES.inflation_df),
+            FakeRepository(FRAMES.nds_df),
+        )
+
+    async def test_reuses_tables_within_interval(self):
+        cache = ReferenceCache(check_interval=60)
+        currency, inflation, nds = repos = self.repositories()
+
+        first = await cache.get(*repos)
+        second = await cache.get(*repos)
+
+        assert second is first
+        assert currency.stamp_reads == 1
+        assert currency.frame_reads == 1
+
+    async def test_invalidate_checks_stamp_without_reload(self):
+        cache = ReferenceCache(check_interval=60)
+        currency, inflation, nds = repos = self.repositories()
+        first = await cache.get(*repos)
+
+        cache.invalidate()
+        second = await cache.get(*repos)
+
+        assert second is first
+        assert currency.stamp_reads == 2
+        assert currency.frame_reads == 1
+
+    async def test_changed_stamp_reloads_tables(self):
+        cache = ReferenceCache(check_interval=60)
+        currency, inflation, nds = repos = self.repositories()
+        first = await cache.get(*repos)
+
+        inflation.stamp = (2, 2, 2)
+        assert await cache.get(*repos) is first  # до конца интервала не сверяется
+        cache.invalidate()
+        second = await cache.get(*repos)
+
+        assert second is not first
+        assert second.version == ((1, 1, 1), (2, 2, 2), (1, 1, 1))
+        assert inflation.frame_reads == 2
+
+    async def test_expired_interval_checks_stamp(self):
+        cache = ReferenceCache(check_interval=0)
+        currency, inflation, nds = repos = self.repositories()
+
+        await cache.get(*repos)
+        await cache.get(*repos)
+
+        assert currency.stamp_reads == 2
+        assert currency.frame_reads == 1
+
+
+class TestReferenceTables:
+    def test_regressor_version_matches_preparation(self):
+        tables = ReferenceTables.build(
+            (), FRAMES.currency_df, FRAMES.inflation_df, FRAMES.nds_df
+        )
+
+        assert tables.regressor_version == regressor_version(FRAMES)
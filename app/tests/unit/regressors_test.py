@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from app.domain.forecast.regressors import NDS_FLOOR_FACTOR, RegressorBuilder
+from app.tests.forecast_baseline import baseline_context, synthetic_frames
+
+
+class TestRegressorBuilder:
+    frames = synthetic_frames(geos=2, months=24)
+    builder = RegressorBuilder.from_frames(frames.currency_df, frames.inflation_df, frames.nds_df)
+    context = baseline_context(frames)
+
+    def test_usd_at_matches_future(self):
+        dates = pd.Series(pd.date_range("2018-01-31", "2029-12-31", freq="ME"))
+        future = self.builder.future(dates)
+
+        assert [self.builder.usd_at(d.year, d.month) for d in dates] == pytest.approx(
+            future["usd_rate"].tolist()
+        )
+
+    def test_usd_at_fallbacks(self):
+        currency = self.frames.currency_df.set_index("date")["usd"]
+
+        # есть месячный курс
+        assert self.builder.usd_at(2019, 1) == currency[pd.Timestamp("2019-01-01")]
+        # месяца нет — первый курс года
+        assert self.builder.usd_at(2019, 3) == self.context["currency_year_map"][2019]
+        # нет всего года — медиана
+        assert self.builder.usd_at(2021, 5) == pytest.approx(self.context["median_usd"])
+        # прогноз правительства
+        assert self.builder.usd_at(2027, 1) == 565.0
+
+    def test_inflation_at(self):
+        assert self.builder.inflation_at(2020) == 0.07
+        assert self.builder.inflation_at(2027) == 0.06
+        assert self.builder.inflation_at(2021) == pytest.approx(
+            self.context["median_inflation"]
+        )
+
+    def test_nds_at(self):
+        assert self.builder.nds_at(2019) == pytest.approx(1.12)
+        assert self.builder.nds_at(2023) == 1.0
+        # с 2026 не ниже минимального уровня, даже без данных за год
+        assert self.builder.nds_at(2026) == NDS_FLOOR_FACTOR
+
+    def test_reference_tables_win_over_government_forecast(self):
+        currency_df = pd.DataFrame({"date": [pd.Timestamp("2026-01-01")], "usd": [500.0]})
+        builder = RegressorBuilder.from_frames(
+            currency_df, self.frames.inflation_df, self.frames.nds_df
+        )
+
+        assert builder.usd_at(2026, 1) == 500.0
@@ -0,0 +1,99 @@
+import time
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infrastructure.db import sessions
+from app.infrastructure.db.models import KrishaQuarantineModel
+from app.infrastructure.db.sessions import RoutingSession, primary_reads
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    replica_engine = create_async_engine("postgresql+asyncpg://u:p@replica:5432/d")
+    monkeypatch.setattr(sessions, "replica_engine", replica_engine)
+    monkeypatch.setattr(sessions, "_last_write_at", float("-inf"))
+    return replica_engine.sync_engine
+
+
+@pytest.fixture
+def primary():
+    return sessions.engine.sync_engine
+
+
+class TestRoutingSession:
+    def test_reads_go_to_replica(self, replica):
+        session = RoutingSession()
+
+        assert session.get_bind(clause=select(1)) is replica
+
+    def test_write_pins_transaction(self, replica, primary):
+        session = RoutingSession()
+
+        assert session.get_bind(clause=insert(KrishaQuarantineModel)) is primary
+        assert session.get_bind(clause=select(1)) is primary
+        assert session.info["wrote"]
+
+    def test_snapshot_runs_on_replica(self, replica):
+        session = RoutingSession()
+        session.info["read_only"] = True
+
+        assert session.get_bind() is replica
+        assert "wrote" not in session.info
+
+    def test_pinned_snapshot_does_not_count_as_write(self, monkeypatch, replica, primary):
+        monkeypatch.setattr(sessions, "_last_write_at", time.monotonic())
+        session = RoutingSession()
+        session.info["read_only"] = True
+
+        assert session.get_bind() is primary
+        assert "wrote" not in session.info
+
+    def test_primary_reads(self, replica, primary):
+        session = RoutingSession()
+
+        with primary_reads():
+            assert session.get_bind(clause=select(1)) is primary
+        assert session.get_bind(clause=select(1)) is replica
+        assert "wrote" not in session.info
+
+    def test_text_select_is_read(self, replica, primary):
+        session = RoutingSession()
+
+        assert session.get_bind(clause=text("SELECT relname FROM pg_class")) is replica
+        assert session.get_bind(clause=text("SELECT 1 FOR UPDATE")) is primary
+        assert "wrote" not in session.info
+
+    def test_text_write_pins_transaction(self, replica, primary):
+        session = RoutingSession()
+
+        assert session.get_bind(clause=text("TRUNCATE krisha_quarantine")) is primary
+        assert session.info["wrote"]
+
+    def test_execution_options_mark_reads(self, replica, primary):
+        session = RoutingSession()
+        lookup = text("WITH t AS (SELECT 1) SELECT * FROM t")
+
+        assert session.get_bind(clause=lookup.execution_options(read_only=True)) is replica
+        assert session.get_bind(clause=lookup.execution_options(use_primary=True)) is primary
+        assert "wrote" not in session.info
+
+    def test_snapshot_keeps_its_engine(self, monkeypatch, replica, primary):
+        session = RoutingSession()
+        session.info["read_only"] = True
+        session.info["snapshot_bind"] = session.get_bind()
+
+        # запись в другом месте процесса не переводит открытый снимок на primary
+        monkeypatch.setattr(sessions, "_last_write_at", time.monotonic())
+        assert session.get_bind(clause=select(1)) is replica
+        assert session.get_bind(clause=text("SELECT 1")) is replica
+        assert session.get_bind(clause=insert(KrishaQuarantineModel)) is replica
+        assert "wrote" not in session.info
+
+    def test_use_primary_option_on_orm_select(self, replica, primary):
+        session = RoutingSession()
+        lookup = select(KrishaQuarantineModel).execution_options(use_primary=True)
+
+        assert session.get_bind(clause=lookup) is primary
+        assert "wrote" not in session.info
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.core.exceptions.exceptions import SoftDeleteNotSupportedException
+from app.infrastructure.db.models import KrishaQuarantineModel
+from app.infrastructure.db.repositories.sqlalchemy_base import SqlAlchemyBaseRepository
+
+
+class ArchiveBase(DeclarativeBase):
+    pass
+
+
+class ArchivedModel(ArchiveBase):
+    __tablename__ = "archived"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+    is_deleted: Mapped[bool | None] = mapped_column(default=False)
+
+
+class RecordingSession:
+    """Запоминает выполненные запросы и ничего не возвращает."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class TestBulkUpdate:
+    async def test_skips_soft_deleted(self):
+        session = RecordingSession()
+
+        await SqlAlchemyBaseRepository(ArchivedModel, session).bulk_update(
+            [{"id": 1, "name": "a"}]
+        )
+
+        [sql] = session.statements
+        assert "archived.is_deleted IS false" in sql
+
+    async def test_models_without_soft_delete(self):
+        session = RecordingSession()
+
+        await SqlAlchemyBaseRepository(KrishaQuarantineModel, session).bulk_update(
+            [{"id": 1, "segment_key": "a"}]
+        )
+
+        [sql] = session.statements
+        assert "is_deleted" not in sql
+
+
+class TestBulkSoftDelete:
+    async def test_marks_not_deleted_rows(self):
+        session = RecordingSession()
+
+        await SqlAlchemyBaseRepository(ArchivedModel, session).bulk_soft_delete([1, 2])
+
+        [sql] = session.statements
+        assert "SET is_deleted" in sql
+        assert "archived.is_deleted IS NOT true" in sql
+
+    async def test_model_without_column_is_rejected(self):
+        repo = SqlAlchemyBaseRepository(KrishaQuarantineModel, RecordingSession())
+
+        with pytest.raises(SoftDeleteNotSupportedException, match="KrishaQuarantineModel"):
+            await repo.bulk_soft_delete([1])
@@ -0,0 +1,26 @@
+from app.domain.parser.validation import validate_rows
+from app.infrastructure.db.repositories.building_analisation import UPSERT_COLUMNS
+from app.tests.krisha_baseline import baseline_normalize, synthetic_payload
+
+
+class TestValidateRows:
+    def test_matches_baseline_normalization(self):
+        payload = synthetic_payload(rows=500)
+
+        valid, rejected = validate_rows(payload)
+
+        assert rejected == []
+        assert [[r.get(c) for c in UPSERT_COLUMNS] for r in valid] == [
+            [r.get(c) for c in UPSERT_COLUMNS] for r in baseline_normalize(payload)
+        ]
+
+    def test_bad_rows_are_rejected_with_reasons(self):
+        payload = synthetic_payload(rows=3)
+        payload[1]["last_updated"] = "31.01.2024"
+        payload[2]["average"] = "n/a"
+
+        valid, rejected = validate_rows(payload)
+
+        assert len(valid) == 1
+        assert [r["payload"] for r in rejected] == payload[1:]
+        assert [r["reasons"][0]["field"] for r in rejected] == ["last_updated", "average"]
@@ -0,0 +1,4 @@
+#!/bin/sh
+# Разрешает потоковую репликацию для реплики из docker-compose.replica.yml
+set -e
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
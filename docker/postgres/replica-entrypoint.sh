@@ -0,0 +1,12 @@
+#!/bin/sh
+# Реплика в режиме hot standby: при пустом каталоге данных копирует primary через pg_basebackup
+set -e
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+  until pg_isready -h "$PRIMARY_HOST" -U "$POSTGRES_USER"; do
+    sleep 1
+  done
+  PGPASSWORD="$POSTGRES_PASSWORD" pg_basebackup \
+    -h "$PRIMARY_HOST" -U "$POSTGRES_USER" -D "$PGDATA" -X stream -R
+  chmod 0700 "$PGDATA"
+fi
+exec postgres -c hot_standby=on